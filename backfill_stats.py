@@ -0,0 +1,54 @@
+"""
+Пересчёт итогов дней (daily_stats) по истории отчётов
+
+Текущие дни бот ведёт сам: отчёт учитывается при сдаче, закончившийся день
+закрывается планировщиком, историю при появлении таблицы переносит миграция. Скрипт —
+для исправления истории; повторный запуск безопасен — дни пересчитываются заново.
+
+    python backfill_stats.py --since 2025-01-01
+"""
+import argparse
+import asyncio
+import sys
+from datetime import date, timedelta
+from typing import List, Optional
+
+from loguru import logger
+from sqlalchemy import select, func
+
+from bot.database import db_manager, DailyReport, DailyStatsRepository
+from bot.utils import utcnow
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Пересчёт daily_stats по таблице daily_reports")
+    parser.add_argument("--since", type=date.fromisoformat, help="первый день (по умолчанию — первый отчёт)")
+    parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        help="последний день (по умолчанию — позавчера по UTC: более поздние дни ещё идут)",
+    )
+    parser.add_argument("--log-level", default="INFO", help="уровень логов")
+    return parser.parse_args(argv)
+
+
+async def backfill(args: argparse.Namespace) -> int:
+    until = args.until or utcnow().date() - timedelta(days=2)
+    try:
+        async with db_manager.session() as session:
+            since = args.since or await session.scalar(select(func.min(DailyReport.report_day)))
+            if since is None:
+                logger.info("Отчётов нет — пересчитывать нечего")
+                return 0
+            days = await DailyStatsRepository.backfill(session, since, until)
+        logger.info(f"Итоги пересчитаны и закрыты: {days} дн. за {since} - {until}")
+        return days
+    finally:
+        await db_manager.dispose()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+    asyncio.run(backfill(args))
@@ -0,0 +1,305 @@
+"""
+Замер SQL-запросов на действие пользователя (для CI и ревью изменений в репозиториях)
+
+Апдейты Telegram проходят через тот же Dispatcher, middleware и роутеры, что и в main.py,
+на SQLite и с сессией бота без сети. По каждому хендлеру выводятся: число SQL-запросов,
+число commit, выдачи соединений из пулов и вызовы Bot API.
+
+    python bench_handlers.py --json handlers.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+from collections import Counter
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+# Настройки обязательны при импорте бота; для замера подойдут заглушки
+for _name, _value in {
+    "BOT_TOKEN": "1:benchmark",
+    "ADMIN_IDS": "1",
+    "DB_USER": "benchmark",
+    "DB_PASSWORD": "benchmark",
+    "DB_NAME": "benchmark",
+    "DEEPSEEK_API_KEY": "benchmark",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+from loguru import logger
+from sqlalchemy import event, insert
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.methods import TelegramMethod
+from aiogram.types import Chat, Message, Update
+
+from bot.database import db_manager, UserRepository, user_cache
+from bot.database.models import Base, User
+from bot.handlers import start, reports, profile, admin, common
+from bot.middlewares import (
+    DatabaseMiddleware,
+    DatabaseModeMiddleware,
+    UserCheckMiddleware,
+    AdminCheckMiddleware,
+)
+from bot.states import ReportStates, EditProfileStates, RegistrationStates
+from bot.utils import FakeClock, set_clock, end_bucket_utc
+
+
+# 15:00 UTC — в Баку 19:00, рабочий день 9:00-18:00 уже закончился
+NOW = datetime(2026, 1, 15, 15, 0)
+TIMEZONE = "Asia/Baku"
+FIRST_USER_ID = 20_000_000
+ADMIN_ID = 1  # из ADMIN_IDS
+
+
+class RecordingSession(BaseSession):
+    """Сессия бота без сети: считает вызовы Bot API и отвечает правдоподобными объектами"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls: Counter = Counter()
+
+    async def make_request(self, bot: Bot, method: TelegramMethod, timeout: Optional[int] = None) -> Any:
+        self.calls[type(method).__name__] += 1
+        if method.__returning__ is Message:
+            return Message(
+                message_id=1,
+                date=NOW,
+                chat=Chat(id=getattr(method, "chat_id", 0) or 0, type="private"),
+            )
+        return True
+
+    async def stream_content(self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True):
+        raise NotImplementedError
+        yield b""
+
+    async def close(self) -> None:
+        pass
+
+
+@dataclass
+class Scenario:
+    """Действие пользователя: апдейт, состояние FSM до него и ожидаемый хендлер"""
+    handler: str
+    telegram_id: int
+    text: Optional[str] = None
+    callback_data: Optional[str] = None
+    state: Optional[State] = None
+    data: Optional[Dict] = None
+
+
+@dataclass
+class HandlerStats:
+    handler: str
+    queries: int
+    commits: int
+    checkouts: int
+    api_calls: int
+
+
+def scenarios() -> List[Scenario]:
+    """У каждого сценария свой сотрудник — действия не влияют друг на друга"""
+    ids = iter(range(FIRST_USER_ID, FIRST_USER_ID + 100))
+    return [
+        Scenario("cmd_help", next(ids), text="/help"),
+        Scenario("cmd_profile", next(ids), text="/profile"),
+        Scenario("cmd_report", next(ids), text="/report"),
+        Scenario("report_has_tasks", next(ids), callback_data="report_has_tasks"),
+        Scenario("report_no_tasks", next(ids), callback_data="report_no_tasks"),
+        Scenario(
+            "receive_report_text",
+            next(ids),
+            text="Сделал задачи по проекту и провёл встречу",
+            state=ReportStates.waiting_for_report,
+            data={"has_tasks": True},
+        ),
+        Scenario("edit_first_name_process", next(ids), text="Иван", state=EditProfileStates.edit_first_name),
+        Scenario("edit_last_name_process", next(ids), text="Петров", state=EditProfileStates.edit_last_name),
+        Scenario(
+            "edit_work_time_process",
+            next(ids),
+            callback_data="work_time_10-19",
+            state=EditProfileStates.edit_work_time,
+        ),
+        Scenario("edit_language_process", next(ids), callback_data="lang_az", state=EditProfileStates.edit_language),
+        Scenario("cmd_worktime", next(ids), text="/worktime 8:30-17:30"),
+        Scenario("cmd_timezone", next(ids), text="/timezone Europe/Moscow"),
+        Scenario("admin_stats", ADMIN_ID, callback_data="admin_stats"),
+        Scenario("admin_daily_reports", ADMIN_ID, callback_data="admin_daily_reports"),
+        Scenario("admin_period_stats", ADMIN_ID, text="/stats quarter"),
+        Scenario(
+            "confirm_registration",
+            FIRST_USER_ID - 1,  # ещё не зарегистрирован
+            callback_data="confirm_yes",
+            state=RegistrationStates.confirmation,
+            data={
+                "language": "ru",
+                "first_name": "Новый",
+                "last_name": "Сотрудник",
+                "work_start_minute": 540,
+                "work_end_minute": 1080,
+            },
+        ),
+    ]
+
+
+class HandlerBenchmark:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.queries = 0
+        self.commits = 0
+        self.checkouts = 0
+        self.session = RecordingSession()
+        self.bot = Bot(token=os.environ["BOT_TOKEN"], session=self.session)
+        self.dp = Dispatcher(storage=MemoryStorage())
+        self.stats: List[HandlerStats] = []
+
+    async def setup(self, db_path: str):
+        set_clock(FakeClock(NOW))
+        db_manager.configure(f"sqlite+aiosqlite:///{db_path}")
+        for engine in (db_manager.engine, db_manager.read_engine):
+            event.listen(engine.sync_engine, "before_cursor_execute", self._count_query)
+            event.listen(engine.sync_engine, "commit", self._count_commit)
+            event.listen(engine.sync_engine, "checkout", self._count_checkout)
+        async with db_manager.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(
+                insert(User),
+                [
+                    {
+                        "telegram_id": telegram_id,
+                        "first_name": "Сотрудник",
+                        "last_name": str(telegram_id),
+                        "language": "ru",
+                        "work_start_minute": 540,
+                        "work_end_minute": 1080,
+                        "timezone": TIMEZONE,
+                        "end_bucket_utc": end_bucket_utc(1080, TIMEZONE),
+                        "is_admin": telegram_id == ADMIN_ID,
+                    }
+                    # Администратор участвует в нескольких сценариях
+                    for telegram_id in dict.fromkeys(
+                        scenario.telegram_id for scenario in scenarios() if scenario.handler != "confirm_registration"
+                    )
+                ],
+            )
+
+        # Как при запуске бота: кэш пользователей прогрет, прогрев в замер не входит
+        async with db_manager.session() as session:
+            await UserRepository.warm_cache(session)
+
+        # Та же цепочка, что в main.py
+        for observer in (self.dp.message, self.dp.callback_query):
+            observer.outer_middleware(DatabaseMiddleware())
+            observer.outer_middleware(UserCheckMiddleware())
+            observer.outer_middleware(AdminCheckMiddleware())
+            observer.middleware(DatabaseModeMiddleware())
+        for module in (start, admin, profile, reports, common):
+            self.dp.include_router(module.router)
+
+    def _count_query(self, *args):
+        self.queries += 1
+
+    def _count_commit(self, *args):
+        self.commits += 1
+
+    def _count_checkout(self, *args):
+        self.checkouts += 1
+
+    def _update(self, scenario: Scenario, update_id: int) -> Update:
+        user = {"id": scenario.telegram_id, "is_bot": False, "first_name": "Сотрудник"}
+        message = {
+            "message_id": update_id,
+            "date": int(NOW.timestamp()),
+            "chat": {"id": scenario.telegram_id, "type": "private"},
+            "from": user,
+            "text": scenario.text or "…",
+        }
+        if scenario.callback_data is None:
+            payload = {"message": message}
+        else:
+            payload = {
+                "callback_query": {
+                    "id": str(update_id),
+                    "from": user,
+                    "chat_instance": "benchmark",
+                    "data": scenario.callback_data,
+                    "message": {**message, "from": {"id": 1, "is_bot": True, "first_name": "bot"}},
+                }
+            }
+        return Update.model_validate({"update_id": update_id, **payload}, context={"bot": self.bot})
+
+    async def run(self):
+        for update_id, scenario in enumerate(scenarios(), start=1):
+            state = self.dp.fsm.get_context(self.bot, scenario.telegram_id, scenario.telegram_id)
+            await state.set_state(scenario.state)
+            await state.set_data(scenario.data or {})
+
+            self.queries = self.commits = self.checkouts = 0
+            self.session.calls.clear()
+            await self.dp.feed_update(self.bot, self._update(scenario, update_id))
+            self.stats.append(
+                HandlerStats(
+                    scenario.handler,
+                    self.queries,
+                    self.commits,
+                    self.checkouts,
+                    sum(self.session.calls.values()),
+                )
+            )
+
+    def summary(self) -> dict:
+        return {
+            "handlers": [asdict(stats) for stats in self.stats],
+            "total_queries": sum(stats.queries for stats in self.stats),
+            "user_cache": {"hits": user_cache.hits, "misses": user_cache.misses},
+        }
+
+    def print_summary(self, summary: dict):
+        print(f"{'handler':<26}{'queries':>9}{'commits':>9}{'conn':>6}{'api':>6}")
+        print("-" * 56)
+        for row in summary["handlers"]:
+            print(
+                f"{row['handler']:<26}{row['queries']:>9}{row['commits']:>9}"
+                f"{row['checkouts']:>6}{row['api_calls']:>6}"
+            )
+        print("-" * 56)
+        print(f"SQL-запросов на все действия: {summary['total_queries']}")
+        cache = summary["user_cache"]
+        print(f"Кэш пользователей: попаданий {cache['hits']}, промахов {cache['misses']}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Число SQL-запросов на хендлер бота")
+    parser.add_argument("--json", dest="json_path", help="записать итоги в JSON-файл")
+    parser.add_argument("--log-level", default="ERROR", help="уровень логов бота")
+    return parser.parse_args(argv)
+
+
+async def benchmark(args: argparse.Namespace) -> dict:
+    bench = HandlerBenchmark(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        await bench.setup(os.path.join(tmp, "benchmark.db"))
+        try:
+            await bench.run()
+        finally:
+            await db_manager.dispose()
+    summary = bench.summary()
+    bench.print_summary(summary)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+    asyncio.run(benchmark(args))
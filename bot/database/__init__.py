@@ -1,14 +1,69 @@
-from .models import User, DailyReport, WeeklyReport, Base
-from .connection import db_manager
-from .repository import UserRepository, DailyReportRepository, WeeklyReportRepository
+from .models import (
+    User,
+    DailyReport,
+    DailyStat,
+    WeeklyReport,
+    ReminderSchedule,
+    SchedulerLease,
+    SchedulerMember,
+    JobRun,
+    JobDelivery,
+    Holiday,
+    CalendarException,
+    OutboxMessage,
+    ReminderEvent,
+    ReportRecord,
+    UserRecord,
+    Base,
+)
+from .connection import db_manager, LazySession
+from .cache import UserCache, user_cache
+from .repository import (
+    UserRepository,
+    DailyReportRepository,
+    DailyStatsRepository,
+    WeeklyReportRepository,
+    ReminderScheduleRepository,
+    SchedulerLeaseRepository,
+    SchedulerMemberRepository,
+    JobLedgerRepository,
+    CalendarRepository,
+    OutboxRepository,
+    ReminderEventRepository,
+    ReportAlreadyExistsError,
+)
 
 __all__ = [
     'User',
     'DailyReport',
+    'DailyStat',
     'WeeklyReport',
+    'ReminderSchedule',
+    'SchedulerLease',
+    'SchedulerMember',
+    'JobRun',
+    'JobDelivery',
+    'Holiday',
+    'CalendarException',
+    'OutboxMessage',
+    'ReminderEvent',
+    'ReportRecord',
+    'UserRecord',
     'Base',
     'db_manager',
+    'LazySession',
     'UserRepository',
     'DailyReportRepository',
+    'DailyStatsRepository',
     'WeeklyReportRepository',
+    'ReminderScheduleRepository',
+    'SchedulerLeaseRepository',
+    'SchedulerMemberRepository',
+    'JobLedgerRepository',
+    'CalendarRepository',
+    'OutboxRepository',
+    'ReminderEventRepository',
+    'ReportAlreadyExistsError',
+    'UserCache',
+    'user_cache',
 ]
\ No newline at end of file
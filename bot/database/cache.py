@@ -0,0 +1,83 @@
+"""
+Кэш пользователей в памяти процесса: UserCheckMiddleware находит пользователя
+без запроса к БД. Записи обновляет UserRepository (create/update/delete_user);
+срок жизни ограничивает устаревание из-за записей других реплик.
+"""
+import time
+from collections import OrderedDict
+from typing import Iterable, Optional, Tuple
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from config.settings import settings
+from .models import User
+
+
+class UserCache:
+    """
+    LRU с TTL по telegram_id. Хранит копии, не привязанные к сессии: объект из кэша
+    переживает закрытие и rollback чужой сессии, а обращение к полям не ходит в БД.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, Tuple[float, User]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @staticmethod
+    def _detached_copy(user: User) -> User:
+        copy = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+        make_transient_to_detached(copy)
+        return copy
+
+    def get(self, telegram_id: int) -> Optional[User]:
+        entry = self._entries.get(telegram_id)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[telegram_id]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(telegram_id)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, user: User) -> User:
+        """Запомнить пользователя; возвращает копию из кэша (её и отдавать хендлерам)"""
+        if self.max_size <= 0:
+            return user
+        copy = self._detached_copy(user)
+        self._entries[user.telegram_id] = (time.monotonic() + self.ttl_seconds, copy)
+        self._entries.move_to_end(user.telegram_id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return copy
+
+    def put_many(self, users: Iterable[User]) -> int:
+        count = 0
+        for user in users:
+            self.put(user)
+            count += 1
+        return count
+
+    def invalidate(self, telegram_id: int) -> None:
+        self._entries.pop(telegram_id, None)
+
+    def invalidate_many(self, telegram_ids: Iterable[int]) -> None:
+        for telegram_id in telegram_ids:
+            self._entries.pop(telegram_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+user_cache = UserCache(settings.user_cache_size, settings.user_cache_ttl_seconds)
@@ -2,16 +2,35 @@
 """
 Настройка асинхронного подключения к базе данных (SQLAlchemy + aiomysql)
 """
+import os
 from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Optional
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
-from sqlalchemy.orm import DeclarativeBase
 from loguru import logger
 from config.settings import settings
 
 
-class Base(DeclarativeBase):
-    """Базовый класс для моделей SQLAlchemy"""
-    pass
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def alembic_config():
+    """Конфигурация Alembic проекта (alembic.ini + migrations/) независимо от текущего каталога"""
+    from alembic.config import Config
+
+    config = Config(os.path.join(PROJECT_ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(PROJECT_ROOT, "migrations"))
+    return config
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> Optional[str]:
+    """Последняя ревизия в migrations/ (файлы читаются один раз на процесс)"""
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
 
 
 class DatabaseManager:
@@ -19,25 +38,96 @@ class DatabaseManager:
 
     def __init__(self):
         # Подключение к БД (настройки берём из .env через settings)
-        self.engine = create_async_engine(
+        self.configure(
             settings.database_url,
+            pool_size=10,
+            max_overflow=20,
+            read_pool_size=settings.db_read_pool_size,
+        )
+
+    def configure(self, url: str, read_pool_size: Optional[int] = None, **engine_kwargs):
+        """(Пере)создать движки и фабрики сессий — например, SQLite для симуляции"""
+        self.engine = create_async_engine(
+            url,
             echo=False,
             future=True,
             pool_pre_ping=True,
-            pool_size=10,
-            max_overflow=20,
+            **engine_kwargs,
         )
         self.async_session = async_sessionmaker(
             self.engine,
             expire_on_commit=False,
             class_=AsyncSession,
         )
+        # Чтение без транзакций: AUTOCOMMIT и без ROLLBACK при возврате соединения в пул.
+        # Отдельный небольшой пул — уровень изоляции не переключается на каждом соединении
+        read_kwargs = {"pool_size": read_pool_size, "max_overflow": read_pool_size} if read_pool_size else {}
+        self.read_engine = create_async_engine(
+            url,
+            echo=False,
+            future=True,
+            pool_pre_ping=True,
+            isolation_level="AUTOCOMMIT",
+            pool_reset_on_return=None,
+            **read_kwargs,
+        )
+        # Ревизия схемы, проверенная check_schema (для этого движка)
+        self._schema_revision: Optional[str] = None
+        self.read_session = async_sessionmaker(
+            self.read_engine,
+            expire_on_commit=False,
+            class_=AsyncSession,
+        )
+
+    async def dispose(self):
+        """Закрыть соединения обоих пулов"""
+        await self.engine.dispose()
+        await self.read_engine.dispose()
+
+    async def current_revision(self) -> Optional[str]:
+        """Ревизия схемы в БД (таблица alembic_version); None — миграции не применялись"""
+        async with self.engine.connect() as conn:
+            try:
+                return await conn.scalar(text("SELECT version_num FROM alembic_version"))
+            except DBAPIError:
+                return None
+
+    async def migrate(self, revision: str = "head") -> None:
+        """alembic upgrade на соединении движка бота"""
+        from alembic import command
+
+        config = alembic_config()
+
+        def upgrade(connection):
+            config.attributes["connection"] = connection
+            command.upgrade(config, revision)
 
-    async def create_tables(self):
-        """Создание таблиц при запуске"""
         async with self.engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
-        logger.info("Таблицы базы данных успешно созданы")
+            await conn.run_sync(upgrade)
+        self._schema_revision = None
+
+    async def check_schema(self, auto_migrate: Optional[bool] = None) -> str:
+        """
+        Проверка схемы при запуске — один запрос к alembic_version (результат запоминается).
+        Ревизия отстаёт: при DB_AUTO_MIGRATE — upgrade head, иначе ошибка с подсказкой.
+        """
+        head = head_revision()
+        if self._schema_revision == head:
+            return head
+        current = await self.current_revision()
+        if current != head:
+            if auto_migrate if auto_migrate is not None else settings.db_auto_migrate:
+                logger.info(f"Миграция схемы БД: {current} -> {head}")
+                await self.migrate()
+                current = await self.current_revision()
+            else:
+                raise RuntimeError(
+                    f"Схема БД на ревизии {current}, код ожидает {head}: "
+                    f"выполните 'alembic upgrade head' или включите DB_AUTO_MIGRATE"
+                )
+        self._schema_revision = current
+        logger.info(f"Схема БД актуальна (ревизия {current})")
+        return current
 
     @asynccontextmanager
     async def session(self):
@@ -56,6 +146,10 @@ class DatabaseManager:
             finally:
                 await session.close()
 
+    def lazy_session(self) -> "LazySession":
+        """Сессия для одного update (DatabaseMiddleware): создаётся при первом обращении"""
+        return LazySession(self)
+
     async def get_session(self):
         """
         Старый способ — совместимость.
@@ -65,5 +159,96 @@ class DatabaseManager:
             yield s
 
 
+class LazySession:
+    """
+    Прокси AsyncSession для middleware: сессия создаётся при первом обращении,
+    поэтому хендлеры без БД не создают её и не откатывают пустую транзакцию.
+    В режиме read_only сессия берётся из пула AUTOCOMMIT и отдаёт соединение
+    сразу после каждого запроса (потоковый результат — после чтения) — оно не держится,
+    пока хендлер ждёт Telegram или AI.
+    """
+
+    _READ_METHODS = frozenset({"execute", "scalar", "scalars", "get"})
+    _STREAM_METHODS = frozenset({"stream", "stream_scalars"})
+
+    def __init__(self, manager: "DatabaseManager"):
+        self._manager = manager
+        self._session: Optional[AsyncSession] = None
+        self.read_only = False
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def use_read_only(self) -> bool:
+        """Перейти в режим чтения, если сессия ещё не создана; возвращает итоговый режим"""
+        if self._session is None:
+            self.read_only = True
+        return self.read_only
+
+    def _get(self) -> AsyncSession:
+        if self._session is None:
+            factory = self._manager.read_session if self.read_only else self._manager.async_session
+            self._session = factory()
+        return self._session
+
+    def __getattr__(self, name):
+        attr = getattr(self._get(), name)
+        if self.read_only and name in self._READ_METHODS:
+            return self._releasing(attr)
+        if self.read_only and name in self._STREAM_METHODS:
+            return self._releasing_stream(attr)
+        return attr
+
+    def _releasing(self, method):
+        async def call(*args, **kwargs):
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                # AUTOCOMMIT: закрытие только возвращает соединение в пул, загруженные объекты остаются
+                await self._session.close()
+        return call
+
+    def _releasing_stream(self, method):
+        async def call(*args, **kwargs):
+            try:
+                result = await method(*args, **kwargs)
+            except BaseException:
+                await self._session.close()
+                raise
+            return _ReleasingStream(result, self._session)
+        return call
+
+    async def close(self) -> None:
+        """Откатить незавершённую транзакцию и закрыть сессию (если она создавалась)"""
+        if self._session is None:
+            return
+        try:
+            if self._session.in_transaction():
+                await self._session.rollback()
+        finally:
+            await self._session.close()
+            self._session = None
+
+
+class _ReleasingStream:
+    """Потоковый результат, после чтения которого сессия отдаёт соединение в пул"""
+
+    def __init__(self, result, session: AsyncSession):
+        self._result = result
+        self._session = session
+
+    def __getattr__(self, name):
+        return getattr(self._result, name)
+
+    async def __aiter__(self):
+        try:
+            async for row in self._result:
+                yield row
+        finally:
+            await self._result.close()
+            await self._session.close()
+
+
 # Создаём экземпляр менеджера
 db_manager = DatabaseManager()
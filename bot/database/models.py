@@ -1,12 +1,14 @@
 """
 Модели базы данных с использованием SQLAlchemy ORM
 """
-from datetime import datetime
-from typing import Optional
-from sqlalchemy import BigInteger, String, DateTime, Boolean, Text, Integer, Enum
+from datetime import datetime, date
+from typing import NamedTuple, Optional
+from sqlalchemy import BigInteger, String, DateTime, Date, Boolean, Text, Integer, Enum, UniqueConstraint, Index
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 import enum
 
+from bot.utils.schedule import format_work_time
+
 
 class Base(DeclarativeBase):
     pass
@@ -17,22 +19,30 @@ class LanguageEnum(enum.Enum):
     RU = "ru"
 
 
-class WorkTimeEnum(enum.Enum):
-    MORNING = "9:00-18:00"
-    AFTERNOON = "10:00-19:00"
-
-
 class User(Base):
     __tablename__ = 'users'
+    __table_args__ = (
+        # Ключи исходной схемы (SQL-скрипт README, ревизия 0001)
+        UniqueConstraint('telegram_id', name='telegram_id'),
+        Index('idx_telegram_id', 'telegram_id'),
+        Index('idx_is_active', 'is_active'),
+        # Список в админ-панели: keyset-пагинация по имени и поиск по началу имени / фамилии
+        Index('ix_users_name', 'first_name', 'last_name', 'telegram_id'),
+        Index('ix_users_last_name', 'last_name'),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    telegram_id: Mapped[int] = mapped_column(BigInteger, unique=True, nullable=False, index=True)
+    telegram_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
     first_name: Mapped[str] = mapped_column(String(255), nullable=False)
     last_name: Mapped[str] = mapped_column(String(255), nullable=False)
     language: Mapped[str] = mapped_column(String(2), nullable=False)  # 'az' или 'ru'
-    work_time: Mapped[str] = mapped_column(String(20), nullable=False)  # '9:00-18:00' или '10:00-19:00'
+    work_start_minute: Mapped[int] = mapped_column(Integer, nullable=False)  # начало работы, минут от полуночи (местное)
+    work_end_minute: Mapped[int] = mapped_column(Integer, nullable=False)  # конец работы, минут от полуночи (местное)
+    timezone: Mapped[str] = mapped_column(String(64), nullable=False)  # IANA, например 'Asia/Baku'
+    end_bucket_utc: Mapped[int] = mapped_column(Integer, nullable=False, index=True)  # конец работы, минута суток UTC
     is_active: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     is_admin: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    blocked_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # UTC; бот заблокирован — пользователь отключён
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime,
@@ -41,17 +51,30 @@ class User(Base):
         nullable=False
     )
     
+    @property
+    def work_time(self) -> str:
+        """График для показа: '9:00-18:00'"""
+        return format_work_time(self.work_start_minute, self.work_end_minute)
+
     def __repr__(self) -> str:
         return f"<User(id={self.id}, telegram_id={self.telegram_id}, name={self.first_name} {self.last_name})>"
 
 
 class DailyReport(Base):
     __tablename__ = 'daily_reports'
+    __table_args__ = (
+        Index('idx_user_id', 'user_id'),
+        Index('idx_report_date', 'report_date'),
+        Index('idx_submitted_at', 'submitted_at'),
+        # Один отчёт на сотрудника за день; поиск «отчёт за день» — одна проба по ключу
+        UniqueConstraint('telegram_id', 'report_day', name='uq_daily_reports_user_day'),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    user_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
-    telegram_id: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
-    report_date: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    telegram_id: Mapped[int] = mapped_column(BigInteger, nullable=False)  # поиск по сотруднику — начало uq_daily_reports_user_day
+    report_date: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # местное время сдачи
+    report_day: Mapped[date] = mapped_column(Date, nullable=False)  # местная дата сотрудника (дата report_date)
     report_text: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     has_tasks: Mapped[bool] = mapped_column(Boolean, nullable=False)  # True если были задачи, False если нет
     submitted_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -61,14 +84,222 @@ class DailyReport(Base):
         return f"<DailyReport(id={self.id}, user_id={self.user_id}, date={self.report_date})>"
 
 
+class DailyStat(Base):
+    """
+    Итоги дня по отчётам: строку обновляет каждый сданный отчёт, после окончания дня
+    она пересчитывается из daily_reports и закрывается (sealed_at)
+    """
+    __tablename__ = 'daily_stats'
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)  # местная дата сотрудников (report_day)
+    total_active: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # активных сотрудников (без администраторов) на момент закрытия дня
+    submitted: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    no_tasks: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    late: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # сдано после напоминания
+    reminders_sent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    sealed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # UTC; NULL - день ещё открыт
+
+    def __repr__(self) -> str:
+        return f"<DailyStat(day={self.day}, submitted={self.submitted}/{self.total_active}, sealed={self.sealed_at})>"
+
+
 class WeeklyReport(Base):
     __tablename__ = 'weekly_reports'
+    __table_args__ = (
+        Index('idx_week_start', 'week_start'),
+        Index('idx_created_at', 'created_at'),
+    )
     
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    week_start: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+    week_start: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     week_end: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     report_text: Mapped[str] = mapped_column(Text, nullable=False)  # AI-сгенерированный отчет
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     
     def __repr__(self) -> str:
-        return f"<WeeklyReport(id={self.id}, week={self.week_start} - {self.week_end})>"
\ No newline at end of file
+        return f"<WeeklyReport(id={self.id}, week={self.week_start} - {self.week_end})>"
+
+
+class ReminderSchedule(Base):
+    """Индекс напоминаний: когда следующий раз напомнить пользователю об отчёте за день"""
+    __tablename__ = 'reminder_schedule'
+    __table_args__ = (
+        UniqueConstraint('telegram_id', 'report_day', name='uq_reminder_user_day'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    telegram_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    report_day: Mapped[date] = mapped_column(Date, nullable=False, index=True)  # местная дата пользователя
+    next_reminder_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True, index=True)  # UTC; NULL - напоминаний больше не будет
+    stop_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)  # UTC; позже не напоминать (местные 23:00)
+    max_reminders: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)  # предел по истории сдачи; NULL - до stop_at
+    reminders_sent: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    claim_token: Mapped[Optional[str]] = mapped_column(String(32), nullable=True, index=True)  # кто забрал последнюю волну
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return f"<ReminderSchedule(telegram_id={self.telegram_id}, day={self.report_day}, next={self.next_reminder_at})>"
+
+
+class SchedulerLease(Base):
+    """Аренда лидерства: только держатель аренды выполняет задачи планировщика"""
+    __tablename__ = 'scheduler_leases'
+
+    name: Mapped[str] = mapped_column(String(64), primary_key=True)
+    holder: Mapped[str] = mapped_column(String(128), nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<SchedulerLease(name={self.name}, holder={self.holder}, expires={self.expires_at})>"
+
+
+
+class SchedulerMember(Base):
+    """Живые реплики планировщика (для распределения пользователей по шардам)"""
+    __tablename__ = 'scheduler_members'
+
+    replica_id: Mapped[str] = mapped_column(String(128), primary_key=True)
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<SchedulerMember(replica_id={self.replica_id}, heartbeat={self.heartbeat_at})>"
+
+
+class JobRun(Base):
+    """Журнал запусков задач планировщика (одна запись на задачу и день)"""
+    __tablename__ = 'job_runs'
+    __table_args__ = (
+        UniqueConstraint('job_key', 'run_date', name='uq_job_run'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    job_key: Mapped[str] = mapped_column(String(96), nullable=False)
+    run_date: Mapped[date] = mapped_column(Date, nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default='running')  # 'running' | 'done'
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<JobRun(job={self.job_key}, date={self.run_date}, status={self.status})>"
+
+
+class JobDelivery(Base):
+    """Журнал доставок: кому задача уже отправила сообщение за день"""
+    __tablename__ = 'job_deliveries'
+    __table_args__ = (
+        UniqueConstraint('job_id', 'run_date', 'recipient_id', name='uq_job_delivery'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    job_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    run_date: Mapped[date] = mapped_column(Date, nullable=False)
+    recipient_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    delivered_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<JobDelivery(job={self.job_id}, date={self.run_date}, recipient={self.recipient_id})>"
+
+
+class Holiday(Base):
+    """Праздничный (нерабочий для всех) день"""
+    __tablename__ = 'holidays'
+
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    name: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<Holiday(day={self.day}, name={self.name})>"
+
+
+class CalendarException(Base):
+    """Исключение календаря для сотрудника: рабочий или выходной день вне общего графика"""
+    __tablename__ = 'calendar_exceptions'
+    __table_args__ = (
+        UniqueConstraint('telegram_id', 'day', name='uq_calendar_exception'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    telegram_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    day: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    is_working: Mapped[bool] = mapped_column(Boolean, nullable=False)  # True - работает, False - выходной
+
+    def __repr__(self) -> str:
+        return f"<CalendarException(telegram_id={self.telegram_id}, day={self.day}, working={self.is_working})>"
+
+
+class OutboxMessage(Base):
+    """
+    Исходящее сообщение планировщика: задачи ставят сообщения в outbox,
+    отдельный обработчик доставляет их с повторами и отмечает результат
+    """
+    __tablename__ = 'outbox'
+    __table_args__ = (
+        Index('ix_outbox_due', 'status', 'next_attempt_at'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    dedupe_key: Mapped[str] = mapped_column(String(128), unique=True, nullable=False)  # повторная постановка не дублирует
+    job_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    chat_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    text_key: Mapped[str] = mapped_column(String(64), nullable=False)  # ключ TEXTS
+    language: Mapped[str] = mapped_column(String(2), nullable=False)
+    keyboard: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)  # имя клавиатуры, например 'report_type'
+    report_day: Mapped[Optional[date]] = mapped_column(Date, nullable=True)  # день отчёта (для журнала напоминаний)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default='pending')  # pending | sending | sent | failed | cancelled
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # UTC; у 'sending' — срок захвата
+    claim_token: Mapped[Optional[str]] = mapped_column(String(32), nullable=True, index=True)
+    last_error: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<OutboxMessage(id={self.id}, chat_id={self.chat_id}, key={self.text_key}, status={self.status})>"
+
+
+class ReminderEvent(Base):
+    """Журнал напоминаний: кому, за какой день, когда и с каким исходом отправлено"""
+    __tablename__ = 'reminder_events'
+    __table_args__ = (
+        Index('ix_reminder_events_day_user', 'report_day', 'telegram_id'),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    telegram_id: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
+    report_day: Mapped[date] = mapped_column(Date, nullable=False)  # местная дата пользователя
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)  # 'report_request' | 'reminder'
+    outcome: Mapped[str] = mapped_column(String(16), nullable=False)  # 'sent' | 'failed' | 'blocked'
+    sent_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)  # UTC
+
+    def __repr__(self) -> str:
+        return f"<ReminderEvent(telegram_id={self.telegram_id}, day={self.report_day}, kind={self.kind}, outcome={self.outcome})>"
+
+
+# Лёгкие записи для потокового чтения: только нужные столбцы, без identity map сессии
+
+class ReportRecord(NamedTuple):
+    """Отчёт с автором для недельной сводки"""
+    date: datetime  # report_date
+    first_name: str
+    last_name: str
+    report_text: Optional[str]
+    has_tasks: bool
+
+
+class UserRecord(NamedTuple):
+    """Пользователь для списков админ-панели"""
+    telegram_id: int
+    first_name: str
+    last_name: str
+    work_start_minute: int
+    work_end_minute: int
+    is_admin: bool
+
+    @property
+    def work_time(self) -> str:
+        return format_work_time(self.work_start_minute, self.work_end_minute)
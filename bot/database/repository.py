@@ -1,13 +1,104 @@
 """
 Паттерн Repository для операций с базой данных
 """
-from typing import Optional, List
+import operator
+import uuid
+from typing import AsyncIterator, Optional, Dict, List, Sequence, Set, Tuple
 from datetime import datetime, date, timedelta
-from sqlalchemy import select, and_, update, delete
+from sqlalchemy import select, and_, or_, update, delete, insert, true, func, case, union, bindparam
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from .models import User, DailyReport, WeeklyReport
+from config.settings import settings
+from bot.utils.pages import page_cache
+from bot.utils.schedule import REMINDER_CUTOFF_HOUR, end_bucket_utc, local_to_utc, spread_offset
+
+from .cache import user_cache
+from .models import (
+    User,
+    DailyReport,
+    DailyStat,
+    WeeklyReport,
+    ReminderSchedule,
+    SchedulerLease,
+    SchedulerMember,
+    JobRun,
+    JobDelivery,
+    Holiday,
+    CalendarException,
+    OutboxMessage,
+    ReminderEvent,
+    ReportRecord,
+    UserRecord,
+)
+
+
+class ReportAlreadyExistsError(Exception):
+    """Отчёт сотрудника за этот день уже сохранён"""
+
+    def __init__(self, telegram_id: int, report_day: date):
+        super().__init__(f"report for {telegram_id} on {report_day} already exists")
+        self.telegram_id = telegram_id
+        self.report_day = report_day
+
+
+def _insert_ignore(session: AsyncSession, model):
+    """INSERT, пропускающий строки с уже существующим уникальным ключом (MySQL / SQLite)"""
+    table = model.__table__
+    if session.bind.dialect.name == "sqlite":
+        return insert(table).prefix_with("OR IGNORE")
+    return insert(table).prefix_with("IGNORE")
+
+
+def _upsert(
+    session: AsyncSession,
+    model,
+    values: Optional[Dict],
+    conflict_keys: Sequence[str],
+    update_keys: Sequence[str],
+    increment_keys: Sequence[str] = (),
+):
+    """
+    Вставка или обновление одним запросом: INSERT ... ON DUPLICATE KEY UPDATE (MySQL) /
+    INSERT ... ON CONFLICT DO UPDATE (SQLite). conflict_keys — уникальный ключ (нужен SQLite).
+    increment_keys при конфликте прибавляются к текущим значениям.
+    values=None — запрос для пачки строк: session.execute(stmt, rows).
+    """
+    table = model.__table__
+    if session.bind.dialect.name == "sqlite":
+        stmt = sqlite_insert(table)
+        new_row = stmt.excluded
+    else:
+        stmt = mysql_insert(table)
+        new_row = stmt.inserted
+    set_ = {key: new_row[key] for key in update_keys}
+    set_.update({key: table.c[key] + new_row[key] for key in increment_keys})
+    if session.bind.dialect.name == "sqlite":
+        stmt = stmt.on_conflict_do_update(index_elements=list(conflict_keys), set_=set_)
+    else:
+        stmt = stmt.on_duplicate_key_update(set_)
+    return stmt.values(**values) if values is not None else stmt
+
+
+def _shard_clause(telegram_id_column, shard: Optional[Tuple[int, int]]):
+    """Условие «пользователь принадлежит шарду (index, count)»; None — все пользователи"""
+    if shard is None:
+        return true()
+    index, count = shard
+    return telegram_id_column % count == index
+
+
+def _reporter_clause():
+    """Условие «от пользователя ждут отчёт»: активен и не администратор (ни в БД, ни в ADMIN_IDS)"""
+    return and_(
+        User.is_active == True,
+        User.is_admin == False,
+        User.telegram_id.notin_(settings.admin_ids_list),
+    )
 
 
 class UserRepository:
@@ -23,6 +114,33 @@ class UserRepository:
             logger.error(f"Ошибка получения пользователя по telegram_id {telegram_id}: {e}")
             raise
 
+    @staticmethod
+    async def get_cached(session: AsyncSession, telegram_id: int) -> Optional[User]:
+        """
+        Пользователь из кэша, при промахе — из БД (и в кэш).
+        Возвращается копия вне сессии: поля читаются без запросов, изменения — через update(current=...).
+        """
+        user = user_cache.get(telegram_id)
+        if user is not None:
+            return user
+        user = await UserRepository.get_by_telegram_id(session, telegram_id)
+        return user_cache.put(user) if user else None
+
+    @staticmethod
+    async def warm_cache(session: AsyncSession) -> int:
+        """Загрузить в кэш активных пользователей (при запуске); возвращает их число"""
+        try:
+            result = await session.scalars(
+                select(User)
+                .where(User.is_active == True)
+                .order_by(User.updated_at.desc())
+                .limit(user_cache.max_size)
+            )
+            return user_cache.put_many(result)
+        except Exception as e:
+            logger.error(f"Ошибка прогрева кэша пользователей: {e}")
+            raise
+
     @staticmethod
     async def create(
         session: AsyncSession,
@@ -30,22 +148,30 @@ class UserRepository:
         first_name: str,
         last_name: str,
         language: str,
-        work_time: str,
+        work_start_minute: int,
+        work_end_minute: int,
+        timezone: Optional[str] = None,
         is_admin: bool = False
     ) -> User:
-        """Создать нового пользователя"""
+        """Создать нового пользователя (часовой пояс по умолчанию — из настроек)"""
         try:
+            timezone = timezone or settings.timezone
             user = User(
                 telegram_id=telegram_id,
                 first_name=first_name,
                 last_name=last_name,
                 language=language,
-                work_time=work_time,
+                work_start_minute=work_start_minute,
+                work_end_minute=work_end_minute,
+                timezone=timezone,
+                end_bucket_utc=end_bucket_utc(work_end_minute, timezone),
                 is_admin=is_admin,
             )
+            # Значения по умолчанию считаются в Python — refresh после INSERT не нужен
             session.add(user)
             await session.commit()
-            await session.refresh(user)
+            user_cache.put(user)
+            page_cache.invalidate("users")
             logger.info(f"Создан новый пользователь: {telegram_id}")
             return user
         except Exception as e:
@@ -54,46 +180,322 @@ class UserRepository:
             raise
 
     @staticmethod
-    async def update(session: AsyncSession, telegram_id: int, **kwargs) -> Optional[User]:
-        """Обновить данные пользователя"""
+    async def update(
+        session: AsyncSession,
+        telegram_id: int,
+        current: Optional[User] = None,
+        **kwargs,
+    ) -> Optional[User]:
+        """
+        Обновить данные пользователя одним UPDATE ... WHERE.
+        current — уже загруженный пользователь (из middleware): новые значения переносятся
+        в него без повторного SELECT, он же и возвращается. Без current пользователь
+        читается после обновления. None — пользователя нет.
+        """
         try:
-            user = await UserRepository.get_by_telegram_id(session, telegram_id)
-            if not user:
-                return None
-
-            for key, value in kwargs.items():
-                if hasattr(user, key):
-                    setattr(user, key, value)
+            values = {key: value for key, value in kwargs.items() if key in User.__table__.columns}
+            # Изменился график или пояс — пересчитываем корзину конца рабочего дня
+            if {"work_end_minute", "timezone"} & values.keys():
+                base = current or await UserRepository.get_by_telegram_id(session, telegram_id)
+                if base is None:
+                    return None
+                values["end_bucket_utc"] = end_bucket_utc(
+                    values.get("work_end_minute", base.work_end_minute),
+                    values.get("timezone", base.timezone),
+                )
+            if not values:
+                return current or await UserRepository.get_by_telegram_id(session, telegram_id)
 
+            values["updated_at"] = datetime.utcnow()
+            result = await session.execute(
+                update(User)
+                .where(User.telegram_id == telegram_id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
             await session.commit()
-            await session.refresh(user)
+            # Правки пользователей редки — страницы списка в админ-панели сбрасываем при любой
+            page_cache.invalidate("users")
+            if result.rowcount == 0:
+                user_cache.invalidate(telegram_id)
+                return None
             logger.info(f"Обновлен пользователь {telegram_id}")
-            return user
+
+            if current is None:
+                current = await session.scalar(
+                    select(User)
+                    .where(User.telegram_id == telegram_id)
+                    .execution_options(populate_existing=True)
+                )
+            else:
+                for key, value in values.items():
+                    set_committed_value(current, key, value)
+            user_cache.put(current)
+            return current
         except Exception as e:
             await session.rollback()
             logger.error(f"Ошибка обновления пользователя {telegram_id}: {e}")
             raise
 
     @staticmethod
-    async def get_all_active(session: AsyncSession) -> List[User]:
-        """Получить всех активных пользователей"""
+    async def deactivate_unreachable(
+        session: AsyncSession,
+        telegram_ids: Sequence[int],
+        batch_size: int = 500,
+    ) -> List[User]:
+        """
+        Отключить пользователей, до которых сообщения больше не доходят
+        (заблокировали бота, удалили аккаунт): is_active=False и отметка blocked_at.
+        Пачками по batch_size; возвращает только что отключённых.
+        """
+        deactivated: List[User] = []
+        try:
+            now = datetime.utcnow()
+            ids = list(dict.fromkeys(telegram_ids))
+            for i in range(0, len(ids), batch_size):
+                batch = ids[i:i + batch_size]
+                users = list(
+                    await session.scalars(
+                        select(User).where(and_(User.telegram_id.in_(batch), User.is_active == True))
+                    )
+                )
+                if not users:
+                    continue
+                await session.execute(
+                    update(User)
+                    .where(User.telegram_id.in_([u.telegram_id for u in users]))
+                    .values(is_active=False, blocked_at=now)
+                    .execution_options(synchronize_session=False)
+                )
+                deactivated.extend(users)
+            await session.commit()
+            user_cache.invalidate_many(u.telegram_id for u in deactivated)
+            if deactivated:
+                page_cache.invalidate("users")
+                logger.info(f"Отключены недоступные пользователи: {[u.telegram_id for u in deactivated]}")
+            return deactivated
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка отключения недоступных пользователей: {e}")
+            raise
+
+    @staticmethod
+    def _name_prefix(prefix: Optional[str]):
+        """
+        Поиск по началу имени или фамилии; «Имя Фам» — имя целиком и начало фамилии.
+        LIKE 'x%' использует индексы ix_users_name / ix_users_last_name.
+        """
+        words = (prefix or "").split(maxsplit=1)
+        if not words:
+            return true()
+        if len(words) == 2:
+            return and_(User.first_name == words[0], User.last_name.startswith(words[1], autoescape=True))
+        return or_(
+            User.first_name.startswith(words[0], autoescape=True),
+            User.last_name.startswith(words[0], autoescape=True),
+        )
+
+    @staticmethod
+    async def count_active(session: AsyncSession, prefix: Optional[str] = None) -> int:
+        """Число активных пользователей (с фильтром по началу имени)"""
+        try:
+            return await session.scalar(
+                select(func.count(User.id)).where(and_(User.is_active == True, UserRepository._name_prefix(prefix)))
+            )
+        except Exception as e:
+            logger.error(f"Ошибка подсчёта активных пользователей: {e}")
+            raise
+
+    @staticmethod
+    async def get_page(
+        session: AsyncSession,
+        limit: int,
+        cursor: Optional[int] = None,
+        backward: bool = False,
+        prefix: Optional[str] = None,
+    ) -> Tuple[List[UserRecord], bool]:
+        """
+        Страница активных пользователей по (имя, фамилия, telegram_id), keyset-пагинация:
+        cursor — telegram_id крайней записи соседней страницы, backward — страница перед ним.
+        Возвращает записи по возрастанию и есть ли ещё записи дальше в направлении листания.
+        Пользователя-курсора больше нет — ([], False).
+        """
+        try:
+            order = (User.first_name, User.last_name, User.telegram_id)
+            conditions = [User.is_active == True, UserRepository._name_prefix(prefix)]
+            if cursor is not None:
+                boundary = (
+                    await session.execute(select(*order).where(User.telegram_id == cursor))
+                ).one_or_none()
+                if boundary is None:
+                    return [], False
+                first_name, last_name, telegram_id = boundary
+                beyond = operator.lt if backward else operator.gt
+                conditions.append(
+                    or_(
+                        beyond(User.first_name, first_name),
+                        and_(
+                            User.first_name == first_name,
+                            or_(
+                                beyond(User.last_name, last_name),
+                                and_(User.last_name == last_name, beyond(User.telegram_id, telegram_id)),
+                            ),
+                        ),
+                    )
+                )
+
+            result = await session.execute(
+                select(
+                    User.telegram_id,
+                    User.first_name,
+                    User.last_name,
+                    User.work_start_minute,
+                    User.work_end_minute,
+                    User.is_admin,
+                )
+                .where(and_(*conditions))
+                .order_by(*(column.desc() if backward else column.asc() for column in order))
+                .limit(limit + 1)
+            )
+            records = [UserRecord._make(row) for row in result.all()]
+            has_more = len(records) > limit
+            records = records[:limit]
+            if backward:
+                records.reverse()
+            return records, has_more
+        except Exception as e:
+            logger.error(f"Ошибка получения страницы пользователей: {e}")
+            raise
+
+    @staticmethod
+    async def get_end_buckets(session: AsyncSession) -> Dict[int, Set[str]]:
+        """Корзины конца рабочего дня (минута суток UTC) у активных сотрудников и их часовые пояса"""
+        try:
+            stmt = (
+                select(User.end_bucket_utc, User.timezone)
+                .where(_reporter_clause())
+                .distinct()
+            )
+            buckets: Dict[int, Set[str]] = {}
+            for bucket, tz_name in (await session.execute(stmt)).all():
+                buckets.setdefault(bucket, set()).add(tz_name)
+            return buckets
+        except Exception as e:
+            logger.error(f"Ошибка получения корзин конца рабочего дня: {e}")
+            raise
+
+    @staticmethod
+    async def get_bucket_timezones(session: AsyncSession, end_bucket: int) -> List[str]:
+        """Часовые пояса сотрудников корзины (в одной корзине местные даты могут различаться)"""
         try:
-            stmt = select(User).where(User.is_active == True)
+            stmt = (
+                select(User.timezone)
+                .where(
+                    and_(
+                        _reporter_clause(),
+                        User.end_bucket_utc == end_bucket,
+                    )
+                )
+                .distinct()
+            )
             result = await session.scalars(stmt)
             return list(result)
         except Exception as e:
-            logger.error(f"Ошибка получения всех активных пользователей: {e}")
+            logger.error(f"Ошибка получения часовых поясов корзины {end_bucket}: {e}")
+            raise
+
+    @staticmethod
+    async def refresh_end_buckets(session: AsyncSession, on_date: date) -> int:
+        """
+        Пересчитать корзины на дату (переход на летнее/зимнее время).
+        Считаем по парам (пояс, конец работы), а не по пользователям; возвращает число изменённых пар.
+        """
+        try:
+            pairs = await session.execute(
+                select(User.timezone, User.work_end_minute, User.end_bucket_utc).distinct()
+            )
+            changed = 0
+            for tz_name, end_minute, bucket in pairs.all():
+                actual = end_bucket_utc(end_minute, tz_name, on_date)
+                if actual == bucket:
+                    continue
+                await session.execute(
+                    update(User)
+                    .where(
+                        and_(
+                            User.timezone == tz_name,
+                            User.work_end_minute == end_minute,
+                            User.end_bucket_utc == bucket,
+                        )
+                    )
+                    .values(end_bucket_utc=actual)
+                    .execution_options(synchronize_session=False)
+                )
+                changed += 1
+            await session.commit()
+            if changed:
+                user_cache.clear()
+            return changed
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка пересчёта корзин конца рабочего дня: {e}")
             raise
 
     @staticmethod
-    async def get_users_by_work_time(session: AsyncSession, work_time: str) -> List[User]:
-        """Получить пользователей по рабочему времени"""
+    async def get_pending_reporters(
+        session: AsyncSession,
+        report_date: date,
+        end_bucket: Optional[int] = None,
+        timezone: Optional[str] = None,
+        shard: Optional[Tuple[int, int]] = None,
+        working_day: bool = True,
+    ) -> List[User]:
+        """
+        Активные сотрудники (не админы, в том числе из ADMIN_IDS) без отчёта за указанный день.
+        Один запрос с NOT EXISTS вместо проверки отчёта по каждому пользователю.
+        end_bucket / timezone — ограничить выборку корзиной конца рабочего дня и поясом,
+        shard — (index, count) для распределения между репликами,
+        working_day — рабочий ли день по общему календарю: в рабочий исключаются
+        взявшие выходной, в нерабочий остаются только вышедшие на работу.
+        """
         try:
-            stmt = select(User).where(and_(User.is_active == True, User.work_time == work_time))
+            has_report = (
+                select(DailyReport.id)
+                .where(
+                    and_(
+                        DailyReport.telegram_id == User.telegram_id,
+                        DailyReport.report_day == report_date,
+                    )
+                )
+                .exists()
+            )
+            stmt = select(User).where(
+                and_(
+                    _reporter_clause(),
+                    ~has_report,
+                    _shard_clause(User.telegram_id, shard),
+                )
+            )
+            exception = (
+                select(CalendarException.id)
+                .where(
+                    and_(
+                        CalendarException.telegram_id == User.telegram_id,
+                        CalendarException.day == report_date,
+                        CalendarException.is_working == (not working_day),
+                    )
+                )
+                .exists()
+            )
+            stmt = stmt.where(~exception if working_day else exception)
+            if end_bucket is not None:
+                stmt = stmt.where(User.end_bucket_utc == end_bucket)
+            if timezone is not None:
+                stmt = stmt.where(User.timezone == timezone)
             result = await session.scalars(stmt)
             return list(result)
         except Exception as e:
-            logger.error(f"Ошибка получения пользователей по рабочему времени {work_time}: {e}")
+            logger.error(f"Ошибка получения пользователей без отчёта за {report_date}: {e}")
             raise
 
     @staticmethod
@@ -103,21 +505,33 @@ class UserRepository:
         Возвращает True если удаление успешно, False если пользователь не найден
         """
         try:
-            user = await UserRepository.get_by_telegram_id(session, telegram_id)
-            if not user:
-                logger.warning(f"Попытка удалить несуществующего пользователя {telegram_id}")
-                return False
-
-            # Сначала удаляем все отчеты пользователя
+            # Отчёты, его очередь напоминаний и неотправленные сообщения outbox,
+            # затем сам пользователь — без предварительного SELECT
             await session.execute(
                 delete(DailyReport).where(DailyReport.telegram_id == telegram_id)
             )
-            
-            # Затем удаляем самого пользователя
-            await session.delete(user)
+            await session.execute(
+                delete(ReminderSchedule).where(ReminderSchedule.telegram_id == telegram_id)
+            )
+            await session.execute(
+                delete(OutboxMessage).where(
+                    and_(OutboxMessage.chat_id == telegram_id, OutboxMessage.status.in_(("pending", "sending")))
+                )
+            )
+            result = await session.execute(
+                delete(User)
+                .where(User.telegram_id == telegram_id)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                await session.rollback()
+                logger.warning(f"Попытка удалить несуществующего пользователя {telegram_id}")
+                return False
             await session.commit()
+            user_cache.invalidate(telegram_id)
+            page_cache.invalidate("users")
             
-            logger.info(f"Удален пользователь {telegram_id} ({user.first_name} {user.last_name}) и все его отчеты")
+            logger.info(f"Удален пользователь {telegram_id} и все его отчеты")
             return True
             
         except Exception as e:
@@ -138,19 +552,43 @@ class DailyReportRepository:
         report_text: Optional[str],
         has_tasks: bool,
     ) -> DailyReport:
+        """
+        Сохранить отчёт (report_date — местное время сотрудника).
+        Отчёт за этот день уже есть — ReportAlreadyExistsError (уникальный ключ в БД),
+        поэтому отдельная проверка get_by_date перед вызовом не нужна.
+        reminder_count считается в БД и у возвращённого объекта не заполнен.
+        """
         try:
-            report = DailyReport(
-                user_id=user_id,
-                telegram_id=telegram_id,
-                report_date=report_date,
-                report_text=report_text,
-                has_tasks=has_tasks,
+            values = {
+                "user_id": user_id,
+                "telegram_id": telegram_id,
+                "report_date": report_date,
+                "report_day": report_date.date(),
+                "report_text": report_text,
+                "has_tasks": has_tasks,
+                "submitted_at": datetime.utcnow(),
+            }
+            # INSERT сразу переносит число отправленных напоминаний из очереди (подзапрос),
+            # отчёт учитывается в итогах дня, затем день убирается из очереди —
+            # три запроса и commit, без SELECT до и после
+            reminders_sent = func.coalesce(
+                ReminderScheduleRepository.reminders_sent(telegram_id, values["report_day"]), 0
             )
-            session.add(report)
+            result = await session.execute(
+                insert(DailyReport).values(**values, reminder_count=reminders_sent)
+            )
+            await session.execute(
+                DailyStatsRepository.count_report(session, values["report_day"], has_tasks, reminders_sent)
+            )
+            await ReminderScheduleRepository.cancel(session, telegram_id, values["report_day"])
             await session.commit()
-            await session.refresh(report)
+            report = DailyReport(id=result.inserted_primary_key[0], **values)
             logger.info(f"Создан ежедневный отчёт для пользователя {telegram_id}")
             return report
+        except IntegrityError:
+            await session.rollback()
+            logger.warning(f"Повторный отчёт пользователя {telegram_id} за {report_date.date()} отклонён")
+            raise ReportAlreadyExistsError(telegram_id, report_date.date())
         except Exception as e:
             await session.rollback()
             logger.error(f"Ошибка создания ежедневного отчёта: {e}")
@@ -158,15 +596,12 @@ class DailyReportRepository:
 
     @staticmethod
     async def get_by_date(session: AsyncSession, telegram_id: int, report_date: date) -> Optional[DailyReport]:
-        """Получить отчёт по пользователю и дате"""
+        """Получить отчёт по пользователю и дате (проба по уникальному ключу)"""
         try:
-            start_date = datetime.combine(report_date, datetime.min.time())
-            end_date = datetime.combine(report_date, datetime.max.time())
             stmt = select(DailyReport).where(
                 and_(
                     DailyReport.telegram_id == telegram_id,
-                    DailyReport.report_date >= start_date,
-                    DailyReport.report_date <= end_date,
+                    DailyReport.report_day == report_date,
                 )
             )
             return await session.scalar(stmt)
@@ -175,71 +610,1156 @@ class DailyReportRepository:
             raise
 
     @staticmethod
-    async def get_reports_by_date_range(
-        session: AsyncSession,
-        start_date: datetime,
-        end_date: datetime
-    ) -> List[DailyReport]:
-        """Получить отчёты за указанный диапазон дат"""
+    async def get_counts(session: AsyncSession, day: date, week_start: date) -> Dict[str, int]:
+        """
+        Числа для статистики одним запросом: активных сотрудников (без администраторов),
+        отчётов за day и за неделю с week_start по day (по дню отчёта report_day, а не по времени сдачи).
+        Считает БД, строки отчётов не загружаются.
+        """
         try:
-            stmt = select(DailyReport).where(
-                and_(
-                    DailyReport.report_date >= start_date,
-                    DailyReport.report_date <= end_date,
+            active_users = select(func.count(User.id)).where(_reporter_clause()).scalar_subquery()
+            row = (
+                await session.execute(
+                    select(
+                        active_users,
+                        func.count(case((DailyReport.report_day == day, DailyReport.id))),
+                        func.count(DailyReport.id),
+                    ).where(DailyReport.report_day.between(week_start, day))
                 )
-            ).order_by(DailyReport.report_date.asc())
-            result = await session.scalars(stmt)
-            return list(result)
+            ).one()
+            return {"active_users": row[0] or 0, "today_reports": row[1], "week_reports": row[2]}
         except Exception as e:
-            logger.error(f"Ошибка получения отчётов за период {start_date} - {end_date}: {e}")
+            logger.error(f"Ошибка подсчёта статистики отчётов за {day}: {e}")
             raise
 
     @staticmethod
-    async def increment_reminder_count(session: AsyncSession, telegram_id: int, report_date: date) -> None:
-        """Увеличить счётчик напоминаний"""
+    async def get_day_status(session: AsyncSession, day: date) -> List[Tuple[str, str, Optional[bool]]]:
+        """
+        Активные сотрудники (без администраторов) и их отчёт за день одним LEFT JOIN: (имя, фамилия, has_tasks).
+        has_tasks = None — отчёта нет. Сдавшие — в порядке сдачи, остальные — по регистрации.
+        """
         try:
-            start_date = datetime.combine(report_date, datetime.min.time())
-            end_date = datetime.combine(report_date, datetime.max.time())
-            await session.execute(
-                update(DailyReport)
+            result = await session.execute(
+                select(User.first_name, User.last_name, DailyReport.has_tasks)
+                .outerjoin(
+                    DailyReport,
+                    and_(
+                        DailyReport.telegram_id == User.telegram_id,
+                        DailyReport.report_day == day,
+                    ),
+                )
+                .where(_reporter_clause())
+                .order_by(DailyReport.report_date, User.id)
+            )
+            return list(result.all())
+        except Exception as e:
+            logger.error(f"Ошибка получения статуса отчётов за {day}: {e}")
+            raise
+
+    @staticmethod
+    async def stream_with_authors(
+        session: AsyncSession,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> AsyncIterator[ReportRecord]:
+        """
+        Отчёты активных сотрудников за период с именами авторов потоком, по дате сдачи.
+        Один JOIN вместо отчётов и пользователей целиком; строки читаются пачками.
+        """
+        try:
+            result = await session.stream(
+                select(
+                    DailyReport.report_date,
+                    User.first_name,
+                    User.last_name,
+                    DailyReport.report_text,
+                    DailyReport.has_tasks,
+                )
+                .join(User, User.telegram_id == DailyReport.telegram_id)
                 .where(
                     and_(
-                        DailyReport.telegram_id == telegram_id,
                         DailyReport.report_date >= start_date,
                         DailyReport.report_date <= end_date,
+                        User.is_active == True,
+                    )
+                )
+                .order_by(DailyReport.report_date.asc())
+                .execution_options(yield_per=settings.db_stream_batch_size)
+            )
+            async for row in result:
+                yield ReportRecord._make(row)
+        except Exception as e:
+            logger.error(f"Ошибка чтения отчётов за период {start_date} - {end_date}: {e}")
+            raise
+
+    @staticmethod
+    async def get_submission_history(
+        session: AsyncSession,
+        telegram_ids: Sequence[int],
+        since: datetime,
+    ) -> Dict[int, List[Tuple[datetime, datetime, int]]]:
+        """
+        История сдачи отчётов с since: telegram_id -> [(report_date, submitted_at, reminder_count)].
+        Только нужные столбцы, без загрузки текстов отчётов.
+        """
+        history: Dict[int, List[Tuple[datetime, datetime, int]]] = {}
+        if not telegram_ids:
+            return history
+        try:
+            for i in range(0, len(telegram_ids), 1000):
+                result = await session.execute(
+                    select(
+                        DailyReport.telegram_id,
+                        DailyReport.report_date,
+                        DailyReport.submitted_at,
+                        DailyReport.reminder_count,
+                    ).where(
+                        and_(
+                            DailyReport.telegram_id.in_(telegram_ids[i:i + 1000]),
+                            DailyReport.report_date >= since,
+                        )
                     )
                 )
-                .values(reminder_count=DailyReport.reminder_count + 1)
+                for telegram_id, report_date, submitted_at, reminder_count in result.all():
+                    history.setdefault(telegram_id, []).append((report_date, submitted_at, reminder_count))
+            return history
+        except Exception as e:
+            logger.error(f"Ошибка получения истории сдачи отчётов: {e}")
+            raise
+
+
+class DailyStatsRepository:
+    """
+    Итоги по дням (daily_stats): статистика за период читает по строке на день
+    вместо всех отчётов периода
+    """
+
+    @staticmethod
+    def count_report(session: AsyncSession, report_day: date, has_tasks: bool, reminders_sent):
+        """Запрос: учесть сданный отчёт в открытом дне (reminders_sent — число или выражение SQL)"""
+        return _upsert(
+            session,
+            DailyStat,
+            {
+                "day": report_day,
+                "submitted": 1,
+                "no_tasks": 0 if has_tasks else 1,
+                "late": case((reminders_sent > 0, 1), else_=0),
+                "reminders_sent": reminders_sent,
+            },
+            conflict_keys=("day",),
+            update_keys=(),
+            increment_keys=("submitted", "no_tasks", "late", "reminders_sent"),
+        )
+
+    @staticmethod
+    async def _rebuild(session: AsyncSession, days: Sequence[date]) -> None:
+        """
+        Пересчитать дни из daily_reports и очереди напоминаний и закрыть их.
+        Напоминания не сдавшим берутся из reminder_schedule — до её очистки.
+        """
+        reports = await session.execute(
+            select(
+                DailyReport.report_day,
+                func.count(DailyReport.id),
+                func.count(case((DailyReport.has_tasks == False, DailyReport.id))),
+                func.count(case((DailyReport.reminder_count > 0, DailyReport.id))),
+                func.coalesce(func.sum(DailyReport.reminder_count), 0),
+            )
+            .where(DailyReport.report_day.in_(days))
+            .group_by(DailyReport.report_day)
+        )
+        totals = {day: counts for day, *counts in reports.all()}
+        queued = await session.execute(
+            select(ReminderSchedule.report_day, func.sum(ReminderSchedule.reminders_sent))
+            .where(ReminderSchedule.report_day.in_(days))
+            .group_by(ReminderSchedule.report_day)
+        )
+        not_reported = {day: sent or 0 for day, sent in queued.all()}
+        total_active = await session.scalar(select(func.count(User.id)).where(_reporter_clause()))
+
+        now = datetime.utcnow()
+        rows = []
+        for day in days:
+            submitted, no_tasks, late, reminders_sent = totals.get(day, (0, 0, 0, 0))
+            rows.append({
+                "day": day,
+                "total_active": total_active,
+                "submitted": submitted,
+                "no_tasks": no_tasks,
+                "late": late,
+                "reminders_sent": reminders_sent + not_reported.get(day, 0),
+                "sealed_at": now,
+            })
+        await session.execute(
+            _upsert(
+                session,
+                DailyStat,
+                None,
+                conflict_keys=("day",),
+                update_keys=("total_active", "submitted", "no_tasks", "late", "reminders_sent", "sealed_at"),
+            ),
+            rows,
+        )
+
+    @staticmethod
+    async def seal_before(session: AsyncSession, day: date) -> List[date]:
+        """
+        Закрыть открытые дни раньше day (и дни с напоминаниями, но без отчётов).
+        Вызывать до очистки reminder_schedule за эти дни. Возвращает закрытые дни.
+        """
+        try:
+            open_days = await session.scalars(
+                union(
+                    select(DailyStat.day).where(and_(DailyStat.sealed_at.is_(None), DailyStat.day < day)),
+                    select(ReminderSchedule.report_day)
+                    .outerjoin(DailyStat, DailyStat.day == ReminderSchedule.report_day)
+                    .where(and_(ReminderSchedule.report_day < day, DailyStat.sealed_at.is_(None))),
+                )
             )
+            days = sorted(open_days)
+            if days:
+                await DailyStatsRepository._rebuild(session, days)
             await session.commit()
+            return days
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка закрытия итогов дней до {day}: {e}")
+            raise
+
+    @staticmethod
+    async def backfill(session: AsyncSession, since: date, until: date, chunk: int = 100) -> int:
+        """
+        Пересчитать и закрыть итоги всех дней с отчётами в [since, until].
+        total_active истории неизвестен — берётся текущее число активных сотрудников.
+        Возвращает число дней.
+        """
+        try:
+            days = list(
+                await session.scalars(
+                    select(DailyReport.report_day)
+                    .where(and_(DailyReport.report_day >= since, DailyReport.report_day <= until))
+                    .distinct()
+                    .order_by(DailyReport.report_day)
+                )
+            )
+            for i in range(0, len(days), chunk):
+                await DailyStatsRepository._rebuild(session, days[i:i + chunk])
+                await session.commit()
+            return len(days)
         except Exception as e:
             await session.rollback()
-            logger.error(f"Ошибка увеличения reminder_count: {e}")
+            logger.error(f"Ошибка пересчёта итогов дней {since} - {until}: {e}")
+            raise
+
+    @staticmethod
+    async def get_range(session: AsyncSession, since: date, until: date) -> List[DailyStat]:
+        """
+        Итоги дней [since, until] одним запросом; у открытых дней total_active —
+        текущее число активных сотрудников (без администраторов)
+        """
+        try:
+            active_now = select(func.count(User.id)).where(_reporter_clause()).scalar_subquery()
+            result = await session.execute(
+                select(DailyStat, active_now)
+                .where(and_(DailyStat.day >= since, DailyStat.day <= until))
+                .order_by(DailyStat.day)
+            )
+            stats = []
+            for stat, active in result.all():
+                if stat.sealed_at is None:
+                    set_committed_value(stat, "total_active", active)
+                stats.append(stat)
+            return stats
+        except Exception as e:
+            logger.error(f"Ошибка получения итогов дней {since} - {until}: {e}")
             raise
 
 
-class WeeklyReportRepository:
-    """Репозиторий для недельных отчётов"""
+class ReminderScheduleRepository:
+    """Репозиторий индекса напоминаний (следующее время напоминания на пользователя и день)"""
 
     @staticmethod
-    async def create(session: AsyncSession, week_start: datetime, week_end: datetime, report_text: str) -> WeeklyReport:
+    async def seed(
+        session: AsyncSession,
+        entries: Sequence[Tuple[int, Optional[datetime], Optional[int]]],
+        report_day: date,
+        stop_at: Optional[datetime] = None,
+        spread_seconds: int = 0,
+    ) -> None:
+        """
+        Поставить пользователей в очередь напоминаний за день (существующие записи не трогаем).
+        entries — (telegram_id, первое напоминание, предел числа напоминаний или None).
+        Время — naive UTC; report_day — местная дата пользователей.
+        spread_seconds > 0 — первое напоминание сдвигается на детерминированное
+        смещение пользователя (spread_offset), и волна растягивается на это окно.
+        """
+        if not entries:
+            return
         try:
-            report = WeeklyReport(week_start=week_start, week_end=week_end, report_text=report_text)
-            session.add(report)
+            await session.execute(
+                _insert_ignore(session, ReminderSchedule),
+                [
+                    {
+                        "telegram_id": telegram_id,
+                        "report_day": report_day,
+                        "next_reminder_at": (
+                            first_reminder_at + timedelta(seconds=spread_offset(telegram_id, spread_seconds))
+                            if first_reminder_at else None
+                        ),
+                        "stop_at": stop_at,
+                        "max_reminders": max_reminders,
+                        "reminders_sent": 0,
+                        "updated_at": datetime.utcnow(),
+                    }
+                    for telegram_id, first_reminder_at, max_reminders in entries
+                ],
+            )
             await session.commit()
-            await session.refresh(report)
-            logger.info(f"Создан недельный отчёт {week_start} - {week_end}")
-            return report
         except Exception as e:
             await session.rollback()
-            logger.error(f"Ошибка создания недельного отчёта: {e}")
+            logger.error(f"Ошибка постановки напоминаний за {report_day}: {e}")
             raise
 
     @staticmethod
-    async def get_latest(session: AsyncSession) -> Optional[WeeklyReport]:
+    async def claim_due(
+        session: AsyncSession,
+        now: datetime,
+        next_reminder_at: Optional[datetime],
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> List[Tuple[User, date, Optional[datetime]]]:
+        """
+        Забрать пользователей (с днём отчёта и stop_at), которым пора напомнить (now — naive UTC), и сразу сдвинуть
+        их следующее напоминание на next_reminder_at (NULL — больше не напоминать; своё время — reschedule).
+        Захват — один UPDATE с токеном, поэтому две реплики не заберут одну запись,
+        а перезапуск после захвата не приводит к повторам.
+        Записи сдавших отчёт, неактивных пользователей, после stop_at
+        и исчерпавших max_reminders закрываются.
+        """
         try:
-            stmt = select(WeeklyReport).order_by(WeeklyReport.created_at.desc()).limit(1)
-            return await session.scalar(stmt)
+            due = and_(
+                ReminderSchedule.next_reminder_at <= now,
+                _shard_clause(ReminderSchedule.telegram_id, shard),
+            )
+            # report_day у каждой записи свой (местная дата пользователя)
+            has_report = (
+                select(DailyReport.id)
+                .where(
+                    and_(
+                        DailyReport.telegram_id == ReminderSchedule.telegram_id,
+                        DailyReport.report_day == ReminderSchedule.report_day,
+                    )
+                )
+                .exists()
+            )
+            too_late = and_(ReminderSchedule.stop_at.isnot(None), ReminderSchedule.stop_at <= now)
+            enough = and_(
+                ReminderSchedule.max_reminders.isnot(None),
+                ReminderSchedule.reminders_sent >= ReminderSchedule.max_reminders,
+            )
+            can_remind = (
+                select(User.id)
+                .where(
+                    and_(
+                        User.telegram_id == ReminderSchedule.telegram_id,
+                        _reporter_clause(),
+                    )
+                )
+                .exists()
+            )
+
+            await session.execute(
+                update(ReminderSchedule)
+                .where(and_(due, has_report | ~can_remind | too_late | enough))
+                .values(next_reminder_at=None, updated_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+
+            token = uuid.uuid4().hex
+            claimed = await session.execute(
+                update(ReminderSchedule)
+                .where(due)
+                .values(
+                    next_reminder_at=next_reminder_at,
+                    reminders_sent=ReminderSchedule.reminders_sent + 1,
+                    claim_token=token,
+                    updated_at=datetime.utcnow(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            if claimed.rowcount == 0:
+                await session.commit()
+                return []
+
+            result = await session.execute(
+                select(User, ReminderSchedule.report_day, ReminderSchedule.stop_at)
+                .join(ReminderSchedule, ReminderSchedule.telegram_id == User.telegram_id)
+                .where(ReminderSchedule.claim_token == token)
+            )
+            # Одно напоминание на пользователя, даже если у него открыто два дня
+            due_days: Dict[int, Tuple[User, date, Optional[datetime]]] = {}
+            for user, report_day, stop_at in result.all():
+                current = due_days.get(user.telegram_id)
+                if current is None or report_day > current[1]:
+                    due_days[user.telegram_id] = (user, report_day, stop_at)
+            await session.commit()
+            return list(due_days.values())
         except Exception as e:
-            logger.error(f"Ошибка получения последнего недельного отчёта: {e}")
-            raise
\ No newline at end of file
+            await session.rollback()
+            logger.error(f"Ошибка выборки напоминаний: {e}")
+            raise
+
+    @staticmethod
+    async def reschedule(session: AsyncSession, entries: Sequence[Tuple[int, date, datetime]]) -> None:
+        """Своё время следующего напоминания (telegram_id, report_day, next_reminder_at) — одной пачкой"""
+        if not entries:
+            return
+        try:
+            # Core-таблица: executemany по (telegram_id, report_day), а не ORM-обновление по ключу
+            table = ReminderSchedule.__table__
+            await session.execute(
+                update(table)
+                .where(
+                    and_(
+                        table.c.telegram_id == bindparam("b_telegram_id"),
+                        table.c.report_day == bindparam("b_report_day"),
+                    )
+                )
+                .values(next_reminder_at=bindparam("b_next_reminder_at")),
+                [
+                    {"b_telegram_id": telegram_id, "b_report_day": report_day, "b_next_reminder_at": next_at}
+                    for telegram_id, report_day, next_at in entries
+                ],
+            )
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка переноса напоминаний: {e}")
+            raise
+
+    @staticmethod
+    def reminders_sent(telegram_id: int, report_day: date):
+        """Подзапрос: сколько напоминаний за день успели отправить (NULL — пользователя нет в очереди)"""
+        return (
+            select(ReminderSchedule.reminders_sent)
+            .where(
+                and_(
+                    ReminderSchedule.telegram_id == telegram_id,
+                    ReminderSchedule.report_day == report_day,
+                )
+            )
+            .scalar_subquery()
+        )
+
+    @staticmethod
+    async def cancel(session: AsyncSession, telegram_id: int, report_day: date) -> None:
+        """Убрать пользователя из очереди напоминаний за день (без commit — в транзакции вызывающего)"""
+        await session.execute(
+            delete(ReminderSchedule).where(
+                and_(
+                    ReminderSchedule.telegram_id == telegram_id,
+                    ReminderSchedule.report_day == report_day,
+                )
+            )
+        )
+
+    @staticmethod
+    async def purge_before(session: AsyncSession, report_day: date) -> None:
+        """Удалить записи за дни раньше указанного"""
+        try:
+            await session.execute(delete(ReminderSchedule).where(ReminderSchedule.report_day < report_day))
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка очистки индекса напоминаний: {e}")
+            raise
+
+
+class SchedulerLeaseRepository:
+    """Репозиторий аренды лидерства (несколько реплик бота)"""
+
+    @staticmethod
+    async def try_acquire(session: AsyncSession, name: str, holder: str, ttl_seconds: int) -> bool:
+        """
+        Взять или продлить аренду. Успех, если аренда наша или истекла.
+        Возвращает True, если после вызова аренда принадлежит holder.
+        """
+        try:
+            now = datetime.utcnow()
+            expires_at = now + timedelta(seconds=ttl_seconds)
+            result = await session.execute(
+                update(SchedulerLease)
+                .where(
+                    and_(
+                        SchedulerLease.name == name,
+                        (SchedulerLease.holder == holder) | (SchedulerLease.expires_at < now),
+                    )
+                )
+                .values(holder=holder, expires_at=expires_at)
+                .execution_options(synchronize_session=False)
+            )
+            acquired = result.rowcount > 0
+            if not acquired:
+                result = await session.execute(
+                    _insert_ignore(session, SchedulerLease),
+                    {"name": name, "holder": holder, "expires_at": expires_at},
+                )
+                acquired = result.rowcount > 0
+            await session.commit()
+            return acquired
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка аренды {name}: {e}")
+            raise
+
+    @staticmethod
+    async def release(session: AsyncSession, name: str, holder: str) -> None:
+        """Отпустить аренду, если она наша"""
+        try:
+            await session.execute(
+                delete(SchedulerLease).where(
+                    and_(SchedulerLease.name == name, SchedulerLease.holder == holder)
+                )
+            )
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка освобождения аренды {name}: {e}")
+            raise
+
+
+class SchedulerMemberRepository:
+    """Репозиторий живых реплик планировщика"""
+
+    @staticmethod
+    async def heartbeat(session: AsyncSession, replica_id: str, ttl_seconds: int) -> List[str]:
+        """
+        Отметить реплику живой, удалить пропавшие и вернуть
+        отсортированный список живых реплик.
+        """
+        try:
+            now = datetime.utcnow()
+            result = await session.execute(
+                update(SchedulerMember)
+                .where(SchedulerMember.replica_id == replica_id)
+                .values(heartbeat_at=now)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                await session.execute(
+                    _insert_ignore(session, SchedulerMember),
+                    {"replica_id": replica_id, "heartbeat_at": now},
+                )
+            await session.execute(
+                delete(SchedulerMember)
+                .where(SchedulerMember.heartbeat_at < now - timedelta(seconds=ttl_seconds))
+                .execution_options(synchronize_session=False)
+            )
+            members = await session.scalars(
+                select(SchedulerMember.replica_id).order_by(SchedulerMember.replica_id)
+            )
+            members = list(members)
+            await session.commit()
+            return members
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка heartbeat реплики {replica_id}: {e}")
+            raise
+
+    @staticmethod
+    async def leave(session: AsyncSession, replica_id: str) -> None:
+        """Удалить реплику из списка живых (остальные перераспределят её пользователей)"""
+        try:
+            await session.execute(delete(SchedulerMember).where(SchedulerMember.replica_id == replica_id))
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка выхода реплики {replica_id}: {e}")
+            raise
+
+
+class JobLedgerRepository:
+    """Журнал запусков и доставок задач планировщика (идемпотентность и догонка)"""
+
+    @staticmethod
+    async def start_run(session: AsyncSession, job_key: str, run_date: date) -> bool:
+        """
+        Отметить начало запуска. Возвращает False, если запуск за этот день
+        уже завершён (повторять не нужно).
+        """
+        try:
+            await session.execute(
+                _insert_ignore(session, JobRun),
+                {
+                    "job_key": job_key,
+                    "run_date": run_date,
+                    "status": "running",
+                    "started_at": datetime.utcnow(),
+                },
+            )
+            status = await session.scalar(
+                select(JobRun.status).where(and_(JobRun.job_key == job_key, JobRun.run_date == run_date))
+            )
+            await session.commit()
+            return status != "done"
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка записи запуска {job_key} за {run_date}: {e}")
+            raise
+
+    @staticmethod
+    async def finish_run(session: AsyncSession, job_key: str, run_date: date) -> None:
+        """Отметить запуск завершённым"""
+        try:
+            await session.execute(
+                update(JobRun)
+                .where(and_(JobRun.job_key == job_key, JobRun.run_date == run_date))
+                .values(status="done", finished_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка завершения запуска {job_key} за {run_date}: {e}")
+            raise
+
+    @staticmethod
+    async def delivered_ids(session: AsyncSession, job_id: str, run_date: date) -> Set[int]:
+        """Получатели, которым задача уже доставила сообщение за день"""
+        try:
+            result = await session.scalars(
+                select(JobDelivery.recipient_id).where(
+                    and_(JobDelivery.job_id == job_id, JobDelivery.run_date == run_date)
+                )
+            )
+            return set(result)
+        except Exception as e:
+            logger.error(f"Ошибка получения доставок {job_id} за {run_date}: {e}")
+            raise
+
+    @staticmethod
+    async def record_deliveries(
+        session: AsyncSession,
+        job_id: str,
+        run_date: date,
+        recipient_ids: Sequence[int],
+    ) -> None:
+        """Записать доставки одной пачкой"""
+        if not recipient_ids:
+            return
+        try:
+            now = datetime.utcnow()
+            await session.execute(
+                _insert_ignore(session, JobDelivery),
+                [
+                    {"job_id": job_id, "run_date": run_date, "recipient_id": recipient_id, "delivered_at": now}
+                    for recipient_id in recipient_ids
+                ],
+            )
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка записи доставок {job_id} за {run_date}: {e}")
+            raise
+
+    @staticmethod
+    async def purge_before(session: AsyncSession, run_date: date) -> None:
+        """Удалить журнал за дни раньше указанного"""
+        try:
+            await session.execute(delete(JobDelivery).where(JobDelivery.run_date < run_date))
+            await session.execute(delete(JobRun).where(JobRun.run_date < run_date))
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка очистки журнала задач: {e}")
+            raise
+
+
+class WeeklyReportRepository:
+    """Репозиторий для недельных отчётов"""
+
+    @staticmethod
+    async def create(session: AsyncSession, week_start: datetime, week_end: datetime, report_text: str) -> WeeklyReport:
+        try:
+            report = WeeklyReport(week_start=week_start, week_end=week_end, report_text=report_text)
+            session.add(report)
+            await session.commit()
+            await session.refresh(report)
+            logger.info(f"Создан недельный отчёт {week_start} - {week_end}")
+            return report
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка создания недельного отчёта: {e}")
+            raise
+
+    @staticmethod
+    async def get_latest(session: AsyncSession) -> Optional[WeeklyReport]:
+        try:
+            stmt = select(WeeklyReport).order_by(WeeklyReport.created_at.desc()).limit(1)
+            return await session.scalar(stmt)
+        except Exception as e:
+            logger.error(f"Ошибка получения последнего недельного отчёта: {e}")
+            raise
+
+
+class CalendarRepository:
+    """Репозиторий производственного календаря: праздники и исключения сотрудников"""
+
+    @staticmethod
+    async def get_holidays(session: AsyncSession, since: date) -> Dict[date, Optional[str]]:
+        """Праздники начиная с даты: {день: название}"""
+        try:
+            result = await session.execute(
+                select(Holiday.day, Holiday.name).where(Holiday.day >= since).order_by(Holiday.day)
+            )
+            return {day: name for day, name in result.all()}
+        except Exception as e:
+            logger.error(f"Ошибка получения праздников: {e}")
+            raise
+
+    @staticmethod
+    async def add_holiday(session: AsyncSession, day: date, name: Optional[str] = None) -> None:
+        """Добавить праздник (или переименовать существующий)"""
+        try:
+            await session.execute(_upsert(session, Holiday, {"day": day, "name": name}, ["day"], ["name"]))
+            await session.commit()
+            logger.info(f"Добавлен праздник {day} ({name})")
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка добавления праздника {day}: {e}")
+            raise
+
+    @staticmethod
+    async def remove_holiday(session: AsyncSession, day: date) -> bool:
+        """Удалить праздник; False — такого не было"""
+        try:
+            result = await session.execute(delete(Holiday).where(Holiday.day == day))
+            await session.commit()
+            return result.rowcount > 0
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка удаления праздника {day}: {e}")
+            raise
+
+    @staticmethod
+    async def get_extra_work_days(session: AsyncSession, since: date) -> Set[date]:
+        """Дни, в которые хотя бы один сотрудник работает вне общего графика"""
+        try:
+            result = await session.scalars(
+                select(CalendarException.day)
+                .where(and_(CalendarException.day >= since, CalendarException.is_working == True))
+                .distinct()
+            )
+            return set(result)
+        except Exception as e:
+            logger.error(f"Ошибка получения дополнительных рабочих дней: {e}")
+            raise
+
+    @staticmethod
+    async def get_user_exception(session: AsyncSession, telegram_id: int, day: date) -> Optional[bool]:
+        """Исключение сотрудника на день: True/False — рабочий/выходной, None — по общему календарю"""
+        try:
+            return await session.scalar(
+                select(CalendarException.is_working).where(
+                    and_(CalendarException.telegram_id == telegram_id, CalendarException.day == day)
+                )
+            )
+        except Exception as e:
+            logger.error(f"Ошибка получения исключения календаря {telegram_id} за {day}: {e}")
+            raise
+
+    @staticmethod
+    async def set_user_exception(
+        session: AsyncSession,
+        telegram_id: int,
+        day: date,
+        is_working: Optional[bool],
+    ) -> None:
+        """Задать исключение сотрудника на день; None — убрать исключение"""
+        try:
+            if is_working is None:
+                stmt = delete(CalendarException).where(
+                    and_(CalendarException.telegram_id == telegram_id, CalendarException.day == day)
+                )
+            else:
+                stmt = _upsert(
+                    session,
+                    CalendarException,
+                    {"telegram_id": telegram_id, "day": day, "is_working": is_working},
+                    ["telegram_id", "day"],
+                    ["is_working"],
+                )
+            await session.execute(stmt)
+            await session.commit()
+            logger.info(f"Исключение календаря {telegram_id} за {day}: {is_working}")
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка записи исключения календаря {telegram_id} за {day}: {e}")
+            raise
+
+
+class OutboxRepository:
+    """Outbox исходящих сообщений планировщика: постановка пачками, захват, отметка результата"""
+
+    ENQUEUE_CHUNK = 1000
+
+    @staticmethod
+    async def enqueue(
+        session: AsyncSession,
+        job_id: str,
+        messages: Sequence[Dict],
+        available_at: datetime,
+    ) -> int:
+        """
+        Поставить сообщения в outbox (dedupe_key, chat_id, text_key, language, keyboard),
+        отправлять не раньше available_at (naive UTC).
+        Уже поставленные (тот же dedupe_key) пропускаются. Возвращает число новых.
+        """
+        if not messages:
+            return 0
+        try:
+            now = datetime.utcnow()
+            added = 0
+            for i in range(0, len(messages), OutboxRepository.ENQUEUE_CHUNK):
+                result = await session.execute(
+                    _insert_ignore(session, OutboxMessage),
+                    [
+                        {
+                            **message,
+                            "job_id": job_id,
+                            "status": "pending",
+                            "attempts": 0,
+                            "next_attempt_at": available_at,
+                            "created_at": now,
+                        }
+                        for message in messages[i:i + OutboxRepository.ENQUEUE_CHUNK]
+                    ],
+                )
+                added += max(result.rowcount, 0)
+            await session.commit()
+            return added
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка постановки сообщений {job_id} в outbox: {e}")
+            raise
+
+    @staticmethod
+    async def claim_batch(
+        session: AsyncSession,
+        now: datetime,
+        limit: int,
+        lease_until: datetime,
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> List[OutboxMessage]:
+        """
+        Захватить до limit сообщений, которые пора отправить: ожидающие и
+        'sending' с истёкшим захватом (обработчик упал посреди отправки).
+        Захват — UPDATE с токеном и сроком lease_until, поэтому реплики не пересекаются.
+        """
+        try:
+            due = and_(
+                OutboxMessage.status.in_(("pending", "sending")),
+                OutboxMessage.next_attempt_at <= now,
+                _shard_clause(OutboxMessage.chat_id, shard),
+            )
+            ids = list(
+                await session.scalars(select(OutboxMessage.id).where(due).order_by(OutboxMessage.id).limit(limit))
+            )
+            if not ids:
+                return []
+
+            token = uuid.uuid4().hex
+            await session.execute(
+                update(OutboxMessage)
+                .where(and_(OutboxMessage.id.in_(ids), due))
+                .values(
+                    status="sending",
+                    claim_token=token,
+                    attempts=OutboxMessage.attempts + 1,
+                    next_attempt_at=lease_until,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            result = await session.scalars(
+                select(OutboxMessage).where(OutboxMessage.claim_token == token).order_by(OutboxMessage.id)
+            )
+            messages = list(result)
+            await session.commit()
+            return messages
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка захвата сообщений outbox: {e}")
+            raise
+
+    @staticmethod
+    async def find_obsolete(
+        session: AsyncSession,
+        messages: Sequence[OutboxMessage],
+        now: datetime,
+    ) -> Dict[int, str]:
+        """
+        Сообщения пачки, которые отправлять уже незачем (id -> причина): получатель удалён
+        или отключён; у сообщений о дне отчёта (report_day) — отчёт уже сдан или
+        наступил REMINDER_CUTOFF_HOUR по местному времени получателя
+        """
+        if not messages:
+            return {}
+        try:
+            chat_ids = {message.chat_id for message in messages}
+            result = await session.execute(
+                select(User.telegram_id, User.timezone).where(
+                    and_(User.telegram_id.in_(chat_ids), User.is_active.is_(True))
+                )
+            )
+            timezones = dict(result.all())
+            days = {message.report_day for message in messages if message.report_day is not None}
+            submitted: Set[Tuple[int, date]] = set()
+            if days:
+                result = await session.execute(
+                    select(DailyReport.telegram_id, DailyReport.report_day).where(
+                        and_(DailyReport.telegram_id.in_(chat_ids), DailyReport.report_day.in_(days))
+                    )
+                )
+                submitted = set(result.all())
+
+            obsolete: Dict[int, str] = {}
+            for message in messages:
+                if message.chat_id not in timezones:
+                    obsolete[message.id] = "recipient removed or inactive"
+                elif message.report_day is None:
+                    continue
+                elif (message.chat_id, message.report_day) in submitted:
+                    obsolete[message.id] = "report already submitted"
+                elif now >= local_to_utc(timezones[message.chat_id], message.report_day, REMINDER_CUTOFF_HOUR * 60):
+                    obsolete[message.id] = "reminder cutoff passed"
+            return obsolete
+        except Exception as e:
+            logger.error(f"Ошибка проверки актуальности сообщений outbox: {e}")
+            raise
+
+    @staticmethod
+    async def mark_cancelled(session: AsyncSession, reasons: Dict[int, str]) -> None:
+        """Снять неактуальные сообщения с отправки (id -> причина)"""
+        if not reasons:
+            return
+        try:
+            by_reason: Dict[str, List[int]] = {}
+            for message_id, reason in reasons.items():
+                by_reason.setdefault(reason, []).append(message_id)
+            for reason, ids in by_reason.items():
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_(ids))
+                    .values(status="cancelled", last_error=reason, finished_at=datetime.utcnow())
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка снятия сообщений outbox: {e}")
+            raise
+
+    @staticmethod
+    async def mark_sent(session: AsyncSession, ids: Sequence[int]) -> None:
+        """Отметить сообщения доставленными"""
+        if not ids:
+            return
+        try:
+            await session.execute(
+                update(OutboxMessage)
+                .where(OutboxMessage.id.in_(ids))
+                .values(status="sent", last_error=None, finished_at=datetime.utcnow())
+                .execution_options(synchronize_session=False)
+            )
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка отметки доставки outbox: {e}")
+            raise
+
+    @staticmethod
+    async def mark_failed(
+        session: AsyncSession,
+        errors: Sequence[Tuple[int, str]],
+        retry_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Отметить недоставленные сообщения (id, ошибка): с retry_at — вернуть
+        в очередь на повтор, без него — окончательно 'failed'
+        """
+        if not errors:
+            return
+        try:
+            by_error: Dict[str, List[int]] = {}
+            for message_id, error in errors:
+                by_error.setdefault(error[:255], []).append(message_id)
+            if retry_at is None:
+                values = {"status": "failed", "finished_at": datetime.utcnow()}
+            else:
+                values = {"status": "pending", "next_attempt_at": retry_at}
+            for error, ids in by_error.items():
+                await session.execute(
+                    update(OutboxMessage)
+                    .where(OutboxMessage.id.in_(ids))
+                    .values(last_error=error, **values)
+                    .execution_options(synchronize_session=False)
+                )
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка отметки недоставленных сообщений outbox: {e}")
+            raise
+
+    @staticmethod
+    async def get_backlog(session: AsyncSession, since: datetime) -> Dict:
+        """
+        Состояние outbox: число сообщений по статусам (отправленные и неудачные —
+        с момента since) и время постановки самого старого ожидающего
+        """
+        try:
+            active = OutboxMessage.status.in_(("pending", "sending"))
+            result = await session.execute(
+                select(OutboxMessage.status, func.count(OutboxMessage.id))
+                .where(active | (OutboxMessage.finished_at >= since))
+                .group_by(OutboxMessage.status)
+            )
+            counts = {status: count for status, count in result.all()}
+            oldest = await session.scalar(select(func.min(OutboxMessage.created_at)).where(active))
+            return {
+                "pending": counts.get("pending", 0),
+                "sending": counts.get("sending", 0),
+                "sent": counts.get("sent", 0),
+                "failed": counts.get("failed", 0),
+                "oldest_pending_at": oldest,
+            }
+        except Exception as e:
+            logger.error(f"Ошибка получения состояния outbox: {e}")
+            raise
+
+    @staticmethod
+    async def purge_before(session: AsyncSession, before: datetime) -> None:
+        """Удалить завершённые (sent / failed / cancelled) сообщения старше указанного момента"""
+        try:
+            await session.execute(
+                delete(OutboxMessage).where(
+                    and_(OutboxMessage.status.in_(("sent", "failed", "cancelled")), OutboxMessage.finished_at < before)
+                )
+            )
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка очистки outbox: {e}")
+            raise
+
+
+class ReminderEventRepository:
+    """Журнал напоминаний и конверсия «напоминание -> отчёт»"""
+
+    @staticmethod
+    async def add_many(session: AsyncSession, events: Sequence[Dict]) -> None:
+        """Записать события одной пачкой (telegram_id, report_day, kind, outcome, sent_at)"""
+        if not events:
+            return
+        try:
+            await session.execute(insert(ReminderEvent), list(events))
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка записи журнала напоминаний ({len(events)} событий): {e}")
+            raise
+
+    @staticmethod
+    def _converted():
+        """Отчёт за день события сдан после отправки напоминания"""
+        return (
+            select(DailyReport.id)
+            .where(
+                and_(
+                    DailyReport.telegram_id == ReminderEvent.telegram_id,
+                    DailyReport.report_day == ReminderEvent.report_day,
+                    DailyReport.submitted_at >= ReminderEvent.sent_at,
+                )
+            )
+            .exists()
+        )
+
+    @staticmethod
+    async def conversion_by_day(session: AsyncSession, since: date, kind: str = "reminder") -> List[Tuple]:
+        """
+        По дням с since: (день, доставлено напоминаний, получивших пользователей,
+        из них сдали отчёт после напоминания)
+        """
+        try:
+            converted = ReminderEventRepository._converted()
+            result = await session.execute(
+                select(
+                    ReminderEvent.report_day,
+                    func.count(ReminderEvent.id),
+                    func.count(func.distinct(ReminderEvent.telegram_id)),
+                    func.count(func.distinct(case((converted, ReminderEvent.telegram_id)))),
+                )
+                .where(
+                    and_(
+                        ReminderEvent.report_day >= since,
+                        ReminderEvent.kind == kind,
+                        ReminderEvent.outcome == "sent",
+                    )
+                )
+                .group_by(ReminderEvent.report_day)
+                .order_by(ReminderEvent.report_day)
+            )
+            return list(result.all())
+        except Exception as e:
+            logger.error(f"Ошибка расчёта конверсии напоминаний по дням: {e}")
+            raise
+
+    @staticmethod
+    async def conversion_by_user(
+        session: AsyncSession,
+        since: date,
+        limit: int = 10,
+        kind: str = "reminder",
+    ) -> List[Tuple]:
+        """
+        Пользователи с наибольшим числом напоминаний с since: (telegram_id, имя, фамилия,
+        доставлено напоминаний, дней с напоминаниями, дней со сданным после напоминания отчётом)
+        """
+        try:
+            converted = ReminderEventRepository._converted()
+            reminders = func.count(ReminderEvent.id)
+            result = await session.execute(
+                select(
+                    ReminderEvent.telegram_id,
+                    User.first_name,
+                    User.last_name,
+                    reminders,
+                    func.count(func.distinct(ReminderEvent.report_day)),
+                    func.count(func.distinct(case((converted, ReminderEvent.report_day)))),
+                )
+                .outerjoin(User, User.telegram_id == ReminderEvent.telegram_id)
+                .where(
+                    and_(
+                        ReminderEvent.report_day >= since,
+                        ReminderEvent.kind == kind,
+                        ReminderEvent.outcome == "sent",
+                    )
+                )
+                .group_by(ReminderEvent.telegram_id, User.first_name, User.last_name)
+                .order_by(reminders.desc())
+                .limit(limit)
+            )
+            return list(result.all())
+        except Exception as e:
+            logger.error(f"Ошибка расчёта конверсии напоминаний по пользователям: {e}")
+            raise
+
+    @staticmethod
+    async def purge_before(session: AsyncSession, report_day: date) -> None:
+        """Удалить события за дни раньше указанного"""
+        try:
+            await session.execute(delete(ReminderEvent).where(ReminderEvent.report_day < report_day))
+            await session.commit()
+        except Exception as e:
+            await session.rollback()
+            logger.error(f"Ошибка очистки журнала напоминаний: {e}")
+            raise
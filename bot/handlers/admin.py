@@ -1,19 +1,39 @@
 """
 Обработчики для админ-панели - С ФУНКЦИЕЙ УДАЛЕНИЯ ПОЛЬЗОВАТЕЛЕЙ
 """
+import secrets
 from datetime import date, datetime, timedelta
-from aiogram import Router, F
+from typing import Optional, Tuple
+from aiogram import Router, F, flags
+from aiogram.dispatcher.event.bases import SkipHandler
 from aiogram.filters import Command
-from aiogram.types import Message, CallbackQuery, BufferedInputFile
+from aiogram.fsm.context import FSMContext
+from aiogram.types import Message, CallbackQuery, BufferedInputFile, InlineKeyboardMarkup
 from sqlalchemy.ext.asyncio import AsyncSession
 from loguru import logger
 
-from bot.keyboards import get_admin_keyboard, get_user_list_keyboard, get_delete_confirmation_keyboard
-from bot.utils import get_text, format_answer
-from bot.database import User, UserRepository, DailyReportRepository
+from config.settings import settings
+from bot.keyboards import (
+    get_admin_keyboard,
+    get_user_list_keyboard,
+    get_delete_confirmation_keyboard,
+    get_text_pages_keyboard,
+)
+from bot.utils import get_text, format_answer, page_cache, text_pages, PagedText, MESSAGE_LIMIT
+from bot.database import (
+    User,
+    UserRepository,
+    DailyReportRepository,
+    CalendarRepository,
+    OutboxRepository,
+    ReminderEventRepository,
+)
 from bot.filters import IsAdminFilter, IsNotAdminFilter
-from bot.services import deepseek_service, document_service
+from bot.states import AdminStates
+from bot.services import deepseek_service, document_service, outbox_service, summary_service
 from bot.services.scheduler_service import SchedulerService
+from bot.services.summary_service import PERIODS
+from bot.services.calendar_service import work_calendar
 
 router = Router()
 
@@ -21,6 +41,13 @@ router = Router()
 generating_reports = {}
 
 
+@router.message(AdminStates.user_search, F.text.startswith("/"))
+async def admin_users_search_leave(message: Message, state: FSMContext):
+    """Любая команда отменяет ожидание поиска; сама команда обрабатывается дальше"""
+    await state.set_state(None)
+    raise SkipHandler()
+
+
 @router.message(Command("admin"), IsAdminFilter())
 @router.message(F.text.in_(["⚙️ Админ-панель", "⚙️ Admin panel"]), IsAdminFilter())
 async def cmd_admin(message: Message, user: User):
@@ -56,38 +83,26 @@ async def cmd_admin_not_authorized(message: Message, user: User):
 
 
 @router.callback_query(F.data == "admin_stats", IsAdminFilter())
+@flags.db("read")
 async def admin_stats(callback: CallbackQuery, user: User, session: AsyncSession):
     """Показать статистику"""
     try:
         language = user.language if user else "ru"
         
-        all_users = await UserRepository.get_all_active(session)
-        total_users = len(all_users)
-        
         today = date.today()
-        start_date = datetime.combine(today, datetime.min.time())
-        end_date = datetime.combine(today, datetime.max.time())
-        today_reports = await DailyReportRepository.get_reports_by_date_range(
-            session,
-            start_date,
-            end_date
-        )
-        
-        week_start = today - timedelta(days=today.weekday())
-        week_start_date = datetime.combine(week_start, datetime.min.time())
-        week_reports = await DailyReportRepository.get_reports_by_date_range(
+        counts = await DailyReportRepository.get_counts(
             session,
-            week_start_date,
-            end_date
+            today,
+            today - timedelta(days=today.weekday())
         )
         
         text = get_text(
             "stats",
             language,
-            total_users=total_users,
-            active_users=total_users,
-            today_reports=len(today_reports),
-            week_reports=len(week_reports)
+            total_users=counts["active_users"],
+            active_users=counts["active_users"],
+            today_reports=counts["today_reports"],
+            week_reports=counts["week_reports"]
         )
         
         await callback.message.edit_text(text)
@@ -101,40 +116,140 @@ async def admin_stats(callback: CallbackQuery, user: User, session: AsyncSession
         await callback.answer(get_text("error", language), show_alert=True)
 
 
+async def _users_page(
+    session: AsyncSession,
+    language: str,
+    admin_id: int,
+    prefix: Optional[str] = None,
+    cursor: Optional[int] = None,
+    backward: bool = False,
+) -> Tuple[str, InlineKeyboardMarkup]:
+    """Текст и клавиатура страницы списка пользователей; готовые страницы берутся из кэша"""
+    key = ("users", language, admin_id, prefix, cursor, backward)
+    page = page_cache.get(key)
+    if page is not None:
+        return page
+    
+    users, has_more = await UserRepository.get_page(
+        session, settings.admin_users_page_size, cursor=cursor, backward=backward, prefix=prefix
+    )
+    if not users and cursor is not None:
+        # Крайний пользователь страницы удалён или отключён — с начала списка
+        return await _users_page(session, language, admin_id, prefix)
+    count = await UserRepository.count_active(session, prefix)
+    
+    users_text = ""
+    for u in users:
+        admin_badge = " 👑" if u.is_admin else ""
+        users_text += f"• {u.first_name} {u.last_name} ({u.work_time}){admin_badge}\n"
+    
+    if prefix:
+        text = get_text(
+            "user_list_search",
+            language,
+            query=prefix,
+            count=count,
+            users=users_text or get_text("user_search_empty", language)
+        )
+    else:
+        text = get_text("user_list", language, count=count, users=users_text)
+    
+    # Куда можно листать: назад — если пришли вперёд по курсору, вперёд — если пришли назад
+    has_prev = has_more if backward else cursor is not None
+    has_next = cursor is not None if backward else has_more
+    keyboard = get_user_list_keyboard(
+        users,
+        language,
+        admin_id,
+        prev_cursor=users[0].telegram_id if users and has_prev else None,
+        next_cursor=users[-1].telegram_id if users and has_next else None,
+    )
+    return page_cache.put(key, (text, keyboard))
+
+
 @router.callback_query(F.data == "admin_users", IsAdminFilter())
-async def admin_users(callback: CallbackQuery, user: User, session: AsyncSession):
-    """Показать список пользователей с кнопками удаления"""
+@flags.db("read")
+async def admin_users(callback: CallbackQuery, user: User, session: AsyncSession, state: FSMContext):
+    """Показать первую страницу списка пользователей с кнопками удаления (поиск сбрасывается)"""
     try:
         language = user.language if user else "ru"
         
-        users = await UserRepository.get_all_active(session)
+        await state.update_data(users_search=None)
+        text, keyboard = await _users_page(session, language, callback.from_user.id)
         
-        users_text = ""
-        for u in users:
-            admin_badge = " 👑" if u.is_admin else ""
-            users_text += f"• {u.first_name} {u.last_name} ({u.work_time}){admin_badge}\n"
+        await callback.message.edit_text(text, reply_markup=keyboard)
+        await callback.answer()
         
-        text = get_text(
-            "user_list",
-            language,
-            count=len(users),
-            users=users_text
-        )
+        logger.info(f"Администратор {callback.from_user.id} просмотрел список пользователей")
+    
+    except Exception as e:
+        logger.error(f"Ошибка показа пользователей: {e}")
+        language = user.language if user else "ru"
+        await callback.answer(get_text("error", language), show_alert=True)
+
+
+@router.callback_query(F.data.startswith("users_prev_") | F.data.startswith("users_next_"), IsAdminFilter())
+@flags.db("read")
+async def admin_users_page(callback: CallbackQuery, user: User, session: AsyncSession, state: FSMContext):
+    """Листание списка пользователей (с текущим поиском)"""
+    try:
+        language = user.language if user else "ru"
         
-        keyboard = get_user_list_keyboard(users, language, callback.from_user.id)
+        _, direction, cursor = callback.data.split("_")
+        prefix = (await state.get_data()).get("users_search")
+        text, keyboard = await _users_page(
+            session, language, callback.from_user.id, prefix, int(cursor), backward=direction == "prev"
+        )
         
         await callback.message.edit_text(text, reply_markup=keyboard)
         await callback.answer()
+    
+    except Exception as e:
+        logger.error(f"Ошибка листания пользователей: {e}")
+        language = user.language if user else "ru"
+        await callback.answer(get_text("error", language), show_alert=True)
+
+
+@router.callback_query(F.data == "users_search", IsAdminFilter())
+async def admin_users_search(callback: CallbackQuery, user: User, state: FSMContext):
+    """Запросить начало имени для поиска пользователей"""
+    try:
+        language = user.language if user else "ru"
         
-        logger.info(f"Администратор {callback.from_user.id} просмотрел список пользователей")
+        await state.set_state(AdminStates.user_search)
+        await callback.message.answer(get_text("user_search_prompt", language))
+        await callback.answer()
     
     except Exception as e:
-        logger.error(f"Ошибка показа пользователей: {e}")
+        logger.error(f"Ошибка запуска поиска пользователей: {e}")
         language = user.language if user else "ru"
         await callback.answer(get_text("error", language), show_alert=True)
 
 
+@router.message(AdminStates.user_search, F.text, ~F.text.startswith("/"), IsAdminFilter())
+@flags.db("read")
+async def admin_users_search_query(message: Message, user: User, session: AsyncSession, state: FSMContext):
+    """Первая страница найденных пользователей; поиск сохраняется для листания"""
+    try:
+        language = user.language if user else "ru"
+        
+        prefix = " ".join(message.text.split())[:64]
+        await state.set_state(None)
+        await state.update_data(users_search=prefix)
+        text, keyboard = await _users_page(session, language, message.from_user.id, prefix)
+        
+        await message.answer(text, reply_markup=keyboard)
+        
+        logger.info(f"Администратор {message.from_user.id} искал пользователей: {prefix}")
+    
+    except Exception as e:
+        logger.error(f"Ошибка поиска пользователей: {e}")
+        language = user.language if user else "ru"
+        await message.answer(get_text("error", language))
+
+
 @router.callback_query(F.data.startswith("delete_user_"), IsAdminFilter())
+@flags.db("read")
 async def delete_user_confirm(callback: CallbackQuery, user: User, session: AsyncSession):
     """
     ✅ ИСПРАВЛЕНО: Подтверждение удаления пользователя
@@ -241,7 +356,8 @@ async def delete_user_execute(callback: CallbackQuery, user: User, session: Asyn
 
 
 @router.callback_query(F.data.startswith("cancel_delete_"), IsAdminFilter())
-async def delete_user_cancel(callback: CallbackQuery, user: User, session: AsyncSession):
+@flags.db("read")
+async def delete_user_cancel(callback: CallbackQuery, user: User, session: AsyncSession, state: FSMContext):
     """
     ✅ ИСПРАВЛЕНО: Отменить удаление пользователя
     """
@@ -249,22 +365,9 @@ async def delete_user_cancel(callback: CallbackQuery, user: User, session: Async
         # ✅ ИСПРАВЛЕНО: Определяем язык сразу
         language = user.language if user else "ru"
         
-        # Возвращаемся к списку пользователей
-        users = await UserRepository.get_all_active(session)
-        
-        users_text = ""
-        for u in users:
-            admin_badge = " 👑" if u.is_admin else ""
-            users_text += f"• {u.first_name} {u.last_name} ({u.work_time}){admin_badge}\n"
-        
-        text = get_text(
-            "user_list",
-            language,
-            count=len(users),
-            users=users_text
-        )
-        
-        keyboard = get_user_list_keyboard(users, language, callback.from_user.id)
+        # Возвращаемся к списку пользователей (с текущим поиском)
+        prefix = (await state.get_data()).get("users_search")
+        text, keyboard = await _users_page(session, language, callback.from_user.id, prefix)
         
         await callback.message.edit_text(text, reply_markup=keyboard)
         await callback.answer("❌ Отменено" if language == "ru" else "❌ Ləğv edildi")
@@ -296,64 +399,57 @@ async def admin_panel_back(callback: CallbackQuery, user: User):
         await callback.answer(get_text("error", language), show_alert=True)
 
 
+def _text_page(token: str, paged: PagedText, number: int) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+    """Страница длинного текста и стрелки листания; номер вне диапазона прижимается к краю"""
+    number = min(max(number, 0), len(paged) - 1)
+    keyboard = get_text_pages_keyboard(token, number, len(paged)) if len(paged) > 1 else None
+    return paged.page(number), keyboard
+
+
+def _paginate(text: str) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+    """
+    Первая страница текста для отправки; длинный текст кладётся в кэш листания
+    (режется на страницы один раз, дальше стрелки берут готовые), короткий — как есть
+    """
+    if len(text) <= MESSAGE_LIMIT:
+        return text, None
+    token = secrets.token_hex(4)
+    return _text_page(token, text_pages.put(("text", token), PagedText(text)), 0)
+
+
+@router.callback_query(F.data.startswith("text_page_"), IsAdminFilter())
+async def admin_text_page(callback: CallbackQuery, user: User):
+    """Листание длинного текста (сводка за день, недельный отчёт)"""
+    try:
+        language = user.language if user else "ru"
+        
+        _, token, number = callback.data.rsplit("_", 2)
+        paged = text_pages.get(("text", token))
+        if paged is None:
+            await callback.answer(get_text("page_expired", language), show_alert=True)
+            return
+        
+        text, keyboard = _text_page(token, paged, int(number))
+        await callback.message.edit_text(text, reply_markup=keyboard)
+        await callback.answer()
+    
+    except Exception as e:
+        logger.error(f"Ошибка листания текста: {e}")
+        language = user.language if user else "ru"
+        await callback.answer(get_text("error", language), show_alert=True)
+
+
 @router.callback_query(F.data == "admin_daily_reports", IsAdminFilter())
+@flags.db("read")
 async def admin_daily_reports(callback: CallbackQuery, user: User, session: AsyncSession):
     """Показать отчеты за сегодня"""
     try:
         language = user.language if user else "ru"
         
-        today = date.today()
-        start_date = datetime.combine(today, datetime.min.time())
-        end_date = datetime.combine(today, datetime.max.time())
-        
-        users = await UserRepository.get_all_active(session)
-        reports = await DailyReportRepository.get_reports_by_date_range(
-            session,
-            start_date,
-            end_date
-        )
-        
-        total_users = len(users)
-        submitted_reports = len(reports)
-        no_tasks_count = sum(1 for r in reports if not r.has_tasks)
-        not_submitted = total_users - submitted_reports
-        
-        details = "👥 Подробности / Təfərrüatlar:\n\n"
-        
-        details += "✅ С задачами / Tapşırıqlarla:\n"
-        for report in reports:
-            if report.has_tasks:
-                u = next((user for user in users if user.telegram_id == report.telegram_id), None)
-                if u:
-                    details += f"  • {u.first_name} {u.last_name}\n"
-        
-        if no_tasks_count > 0:
-            details += "\n🚫 Без задач / Tapşırıqsız:\n"
-            for report in reports:
-                if not report.has_tasks:
-                    u = next((user for user in users if user.telegram_id == report.telegram_id), None)
-                    if u:
-                        details += f"  • {u.first_name} {u.last_name}\n"
-        
-        if not_submitted > 0:
-            details += "\n❌ Не отправили / Göndərmədi:\n"
-            submitted_ids = {r.telegram_id for r in reports}
-            for u in users:
-                if u.telegram_id not in submitted_ids:
-                    details += f"  • {u.first_name} {u.last_name}\n"
+        summary = await summary_service.daily(session, date.today())
+        text, keyboard = _paginate(summary_service.render(summary, language))
         
-        text = get_text(
-            "daily_report_summary",
-            language,
-            date=today.strftime("%d.%m.%Y"),
-            total=total_users,
-            submitted=submitted_reports,
-            not_submitted=not_submitted,
-            no_tasks=no_tasks_count,
-            details=details
-        )
-        
-        await callback.message.edit_text(text)
+        await callback.message.edit_text(text, reply_markup=keyboard)
         await callback.answer()
         
         logger.info(f"Администратор {callback.from_user.id} просмотрел ежедневные отчеты")
@@ -365,6 +461,7 @@ async def admin_daily_reports(callback: CallbackQuery, user: User, session: Asyn
 
 
 @router.callback_query(F.data == "admin_weekly_report", IsAdminFilter())
+@flags.db("read")
 async def admin_weekly_report(callback: CallbackQuery, user: User, session: AsyncSession):
     """Генерация недельного отчета"""
     try:
@@ -401,13 +498,12 @@ async def admin_weekly_report(callback: CallbackQuery, user: User, session: Asyn
         start_datetime = datetime.combine(week_start, datetime.min.time())
         end_datetime = datetime.combine(week_end, datetime.max.time())
         
-        reports = await DailyReportRepository.get_reports_by_date_range(
-            session,
-            start_datetime,
-            end_datetime
+        report_text = await deepseek_service.generate_weekly_report(
+            DailyReportRepository.stream_with_authors(session, start_datetime, end_datetime),
+            language=language
         )
         
-        if not reports:
+        if report_text is None:
             del generating_reports[admin_id]
             await loading_msg.delete()
             no_data_text = (
@@ -418,26 +514,6 @@ async def admin_weekly_report(callback: CallbackQuery, user: User, session: Asyn
             await callback.message.answer(no_data_text)
             return
         
-        users = await UserRepository.get_all_active(session)
-        user_dict = {u.telegram_id: u for u in users}
-        
-        reports_data = []
-        for report in reports:
-            u = user_dict.get(report.telegram_id)
-            if u:
-                reports_data.append({
-                    'date': report.report_date,
-                    'first_name': u.first_name,
-                    'last_name': u.last_name,
-                    'report_text': report.report_text,
-                    'has_tasks': report.has_tasks
-                })
-        
-        report_text = await deepseek_service.generate_weekly_report(
-            reports_data,
-            language=language
-        )
-        
         formatted_text = format_answer(report_text)
         
         week_start_str = week_start.strftime("%d.%m.%Y")
@@ -453,10 +529,22 @@ async def admin_weekly_report(callback: CallbackQuery, user: User, session: Asyn
         
         header = get_text("weekly_report_header", language, 
                          week_start=week_start_str, week_end=week_end_str)
+        week_stats, _ = await summary_service.period(session, "week", today)
+        header += "\n" + get_text(
+            "weekly_stats",
+            language,
+            submitted=week_stats.submitted,
+            expected=week_stats.expected,
+            rate=week_stats.rate,
+            no_tasks=week_stats.no_tasks,
+            late=week_stats.late,
+        )
         
+        text, keyboard = _paginate(f"{header}\n\n{formatted_text}")
         await callback.message.answer(
-            f"{header}\n\n{formatted_text}",
-            parse_mode="HTML"
+            text,
+            parse_mode="HTML",
+            reply_markup=keyboard
         )
         
         await callback.message.answer_document(
@@ -481,15 +569,188 @@ async def admin_weekly_report(callback: CallbackQuery, user: User, session: Asyn
         await callback.message.answer(get_text("error", language))
 
 
+@router.message(Command("calendar"), IsAdminFilter())
+@router.message(Command("holidays"), IsAdminFilter())
+async def admin_calendar(message: Message, user: User):
+    """Производственный календарь: рабочие дни и ближайшие праздники"""
+    try:
+        today = date.today()
+        holidays = "\n".join(
+            f"• {day:%d.%m.%Y}" + (f" — {name}" if name else "")
+            for day, name in sorted(work_calendar.holidays.items())
+            if day >= today
+        ) or get_text("calendar_no_holidays", user.language)
+        weekdays = ", ".join(str(day) for day in sorted(work_calendar.weekdays))
+        await message.answer(get_text("calendar_info", user.language, weekdays=weekdays, holidays=holidays))
+    except Exception as e:
+        logger.error(f"Ошибка показа календаря: {e}")
+        await message.answer(get_text("error", user.language))
+
+
+@router.message(Command("holiday"), IsAdminFilter())
+async def admin_add_holiday(message: Message, user: User, session: AsyncSession):
+    """Добавить праздник: /holiday 2026-12-31 Новый год"""
+    try:
+        parts = message.text.split(maxsplit=2)
+        try:
+            day = date.fromisoformat(parts[1])
+        except (IndexError, ValueError):
+            await message.answer(get_text("holiday_usage", user.language))
+            return
+
+        await CalendarRepository.add_holiday(session, day, parts[2].strip() if len(parts) > 2 else None)
+        await work_calendar.refresh()
+        await message.answer(get_text("holiday_added", user.language, day=f"{day:%d.%m.%Y}"))
+        logger.info(f"Администратор {user.telegram_id} добавил праздник {day}")
+    except Exception as e:
+        logger.error(f"Ошибка добавления праздника: {e}")
+        await message.answer(get_text("error", user.language))
+
+
+@router.message(Command("holiday_del"), IsAdminFilter())
+async def admin_remove_holiday(message: Message, user: User, session: AsyncSession):
+    """Удалить праздник: /holiday_del 2026-12-31"""
+    try:
+        parts = message.text.split()
+        try:
+            day = date.fromisoformat(parts[1])
+        except (IndexError, ValueError):
+            await message.answer(get_text("holiday_del_usage", user.language))
+            return
+
+        removed = await CalendarRepository.remove_holiday(session, day)
+        await work_calendar.refresh()
+        key = "holiday_removed" if removed else "holiday_not_found"
+        await message.answer(get_text(key, user.language, day=f"{day:%d.%m.%Y}"))
+        logger.info(f"Администратор {user.telegram_id} удалил праздник {day}: {removed}")
+    except Exception as e:
+        logger.error(f"Ошибка удаления праздника: {e}")
+        await message.answer(get_text("error", user.language))
+
+
+@router.message(Command("user_day"), IsAdminFilter())
+async def admin_user_day(message: Message, user: User, session: AsyncSession):
+    """Исключение для сотрудника: /user_day 123456789 2026-12-31 work|off|reset"""
+    modes = {"work": True, "off": False, "reset": None}
+    try:
+        parts = message.text.split()
+        try:
+            telegram_id = int(parts[1])
+            day = date.fromisoformat(parts[2])
+            mode = parts[3].lower()
+            is_working = modes[mode]
+        except (IndexError, ValueError, KeyError):
+            await message.answer(get_text("user_day_usage", user.language))
+            return
+
+        await CalendarRepository.set_user_exception(session, telegram_id, day, is_working)
+        await work_calendar.refresh()
+        await message.answer(
+            get_text("user_day_updated", user.language, day=f"{day:%d.%m.%Y}", telegram_id=telegram_id, mode=mode)
+        )
+        logger.info(f"Администратор {user.telegram_id} задал {day} для {telegram_id}: {mode}")
+    except Exception as e:
+        logger.error(f"Ошибка записи исключения календаря: {e}")
+        await message.answer(get_text("error", user.language))
+
+
+@router.message(Command("outbox"), IsAdminFilter())
+@flags.db("read")
+async def admin_outbox(message: Message, user: User, session: AsyncSession):
+    """Состояние outbox: очередь сообщений планировщика и пропускная способность"""
+    try:
+        backlog = await OutboxRepository.get_backlog(session, datetime.utcnow() - timedelta(days=1))
+        oldest = backlog["oldest_pending_at"]
+        stats = outbox_service.stats
+        await message.answer(
+            get_text(
+                "outbox_status",
+                user.language,
+                pending=backlog["pending"],
+                sending=backlog["sending"],
+                sent=backlog["sent"],
+                failed=backlog["failed"],
+                oldest=f"{oldest:%d.%m.%Y %H:%M} UTC" if oldest else get_text("outbox_empty", user.language),
+                total_sent=stats.sent,
+                total_retried=stats.retried,
+                total_failed=stats.failed,
+                rate=stats.rate,
+            )
+        )
+    except Exception as e:
+        logger.error(f"Ошибка показа outbox: {e}")
+        await message.answer(get_text("error", user.language))
+
+
+@router.message(Command("reminder_stats"), IsAdminFilter())
+@flags.db("read")
+async def admin_reminder_stats(message: Message, user: User, session: AsyncSession):
+    """Конверсия напоминаний в отчёты: /reminder_stats [дней]"""
+    try:
+        parts = message.text.split()
+        days = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else 14
+        since = date.today() - timedelta(days=days)
+        empty = get_text("reminder_stats_empty", user.language)
+
+        by_day = "\n".join(
+            get_text(
+                "reminder_stats_day",
+                user.language,
+                day=f"{day:%d.%m}",
+                reminders=reminders,
+                users=users,
+                converted=converted,
+                rate=converted / users if users else 0,
+            )
+            for day, reminders, users, converted in await ReminderEventRepository.conversion_by_day(session, since)
+        ) or empty
+        by_user = "\n".join(
+            get_text(
+                "reminder_stats_user",
+                user.language,
+                name=f"{first_name} {last_name}" if first_name else str(telegram_id),
+                reminders=reminders,
+                days=days_reminded,
+                converted=converted,
+                rate=converted / days_reminded if days_reminded else 0,
+            )
+            for telegram_id, first_name, last_name, reminders, days_reminded, converted
+            in await ReminderEventRepository.conversion_by_user(session, since)
+        ) or empty
+
+        await message.answer(get_text("reminder_stats", user.language, days=days, by_day=by_day, by_user=by_user))
+    except Exception as e:
+        logger.error(f"Ошибка показа статистики напоминаний: {e}")
+        await message.answer(get_text("error", user.language))
+
+
+@router.message(Command("stats"), IsAdminFilter())
+@flags.db("read")
+async def admin_period_stats(message: Message, user: User, session: AsyncSession):
+    """Сдача отчётов за период по итогам дней: /stats [week|month|quarter]"""
+    try:
+        parts = message.text.split()
+        period = parts[1].lower() if len(parts) > 1 else "month"
+        if period not in PERIODS:
+            await message.answer(get_text("period_stats_usage", user.language))
+            return
+
+        total, breakdown = await summary_service.period(session, period, date.today())
+        await message.answer(summary_service.render_period(total, breakdown, user.language))
+    except Exception as e:
+        logger.error(f"Ошибка показа статистики за период: {e}")
+        await message.answer(get_text("error", user.language))
+
+
 @router.message(Command("debug_notify"), IsAdminFilter())
-async def debug_notify(message: Message, user: User):
+async def debug_notify(message: Message, user: User, session: AsyncSession):
     """DEBUG: Принудительно разослать уведомления"""
     try:
         from aiogram import Bot
         bot: Bot = message.bot
         sched = SchedulerService(bot)
-        await sched._send_daily_notifications("9:00-18:00")
-        await sched._send_daily_notifications("10:00-19:00")
+        for bucket in await UserRepository.get_end_buckets(session):
+            await sched._send_daily_notifications(bucket, record=False)
         await sched._send_hourly_reminders()
         await message.answer("✅ debug_notify: отправлено")
     except Exception as e:
@@ -503,7 +764,7 @@ async def debug_admin_daily(message: Message, user: User):
         from aiogram import Bot
         bot: Bot = message.bot
         sched = SchedulerService(bot)
-        await sched._send_daily_admin_report()
+        await sched._send_daily_admin_report(record=False)
         await message.answer("✅ admin daily sent")
     except Exception as e:
         await message.answer(f"❌ admin daily error: {e}")
@@ -516,7 +777,7 @@ async def debug_weekly(message: Message, user: User):
         from aiogram import Bot
         bot: Bot = message.bot
         sched = SchedulerService(bot)
-        await sched._send_weekly_report()
+        await sched._send_weekly_report(record=False)
         await message.answer("✅ weekly sent")
     except Exception as e:
         await message.answer(f"❌ weekly error: {e}")
\ No newline at end of file
@@ -15,7 +15,14 @@ from bot.keyboards import (
     get_language_keyboard,
     get_work_time_keyboard,
 )
-from bot.utils import get_text
+from bot.utils import (
+    get_text,
+    WORK_TIME_PRESETS,
+    DEFAULT_WORK_TIME,
+    format_work_time,
+    parse_work_time,
+    is_valid_timezone,
+)
 from bot.database import User, UserRepository
 from bot.filters import IsRegisteredFilter
 
@@ -98,9 +105,10 @@ async def edit_first_name_process(
             await message.answer(get_text("invalid_name", user.language))
             return
         
-        await UserRepository.update(
+        updated_user = await UserRepository.update(
             session,
             user.telegram_id,
+            current=user,
             first_name=first_name
         )
         
@@ -109,7 +117,6 @@ async def edit_first_name_process(
         text = get_text("profile_updated", user.language)
         await message.answer(text)
         
-        updated_user = await UserRepository.get_by_telegram_id(session, user.telegram_id)
         profile_text = get_text(
             "profile_info",
             updated_user.language,
@@ -158,9 +165,10 @@ async def edit_last_name_process(
             await message.answer(get_text("invalid_last_name", user.language))
             return
         
-        await UserRepository.update(
+        updated_user = await UserRepository.update(
             session,
             user.telegram_id,
+            current=user,
             last_name=last_name
         )
         
@@ -169,7 +177,6 @@ async def edit_last_name_process(
         text = get_text("profile_updated", user.language)
         await message.answer(text)
         
-        updated_user = await UserRepository.get_by_telegram_id(session, user.telegram_id)
         profile_text = get_text(
             "profile_info",
             updated_user.language,
@@ -213,17 +220,15 @@ async def edit_work_time_process(
     """Обработать редактирование рабочего времени"""
     try:
         work_time_code = callback.data.split("_", 2)[2]
+        start_minute, end_minute = WORK_TIME_PRESETS.get(work_time_code, DEFAULT_WORK_TIME)
+        work_time = format_work_time(start_minute, end_minute)
         
-        work_time_map = {
-            "9-18": "9:00-18:00",
-            "10-19": "10:00-19:00"
-        }
-        work_time = work_time_map.get(work_time_code, "9:00-18:00")
-        
-        await UserRepository.update(
+        updated_user = await UserRepository.update(
             session,
             user.telegram_id,
-            work_time=work_time
+            current=user,
+            work_start_minute=start_minute,
+            work_end_minute=end_minute
         )
         
         await callback.answer()
@@ -232,7 +237,6 @@ async def edit_work_time_process(
         text = get_text("profile_updated", user.language)
         await callback.message.edit_text(text)
         
-        updated_user = await UserRepository.get_by_telegram_id(session, user.telegram_id)
         profile_text = get_text(
             "profile_info",
             updated_user.language,
@@ -251,6 +255,52 @@ async def edit_work_time_process(
         await callback.answer(get_text("error", user.language), show_alert=True)
 
 
+@router.message(Command("worktime"), IsRegisteredFilter())
+async def cmd_worktime(message: Message, user: User, session: AsyncSession, state: FSMContext):
+    """Задать свой график: /worktime 8:30-17:30"""
+    try:
+        await state.clear()
+        parts = message.text.split(maxsplit=1)
+        parsed = parse_work_time(parts[1]) if len(parts) > 1 else None
+        if parsed is None:
+            await message.answer(get_text("worktime_usage", user.language, work_time=user.work_time))
+            return
+
+        start_minute, end_minute = parsed
+        await UserRepository.update(
+            session,
+            user.telegram_id,
+            current=user,
+            work_start_minute=start_minute,
+            work_end_minute=end_minute
+        )
+        work_time = format_work_time(start_minute, end_minute)
+        await message.answer(get_text("worktime_updated", user.language, work_time=work_time))
+        logger.info(f"Пользователь {user.telegram_id} задал график {work_time}")
+    except Exception as e:
+        logger.error(f"Ошибка обновления графика: {e}")
+        await message.answer(get_text("error", user.language))
+
+
+@router.message(Command("timezone"), IsRegisteredFilter())
+async def cmd_timezone(message: Message, user: User, session: AsyncSession, state: FSMContext):
+    """Задать часовой пояс: /timezone Europe/Moscow"""
+    try:
+        await state.clear()
+        parts = message.text.split(maxsplit=1)
+        timezone = parts[1].strip() if len(parts) > 1 else ""
+        if not is_valid_timezone(timezone):
+            await message.answer(get_text("timezone_usage", user.language, timezone=user.timezone))
+            return
+
+        await UserRepository.update(session, user.telegram_id, current=user, timezone=timezone)
+        await message.answer(get_text("timezone_updated", user.language, timezone=timezone))
+        logger.info(f"Пользователь {user.telegram_id} сменил часовой пояс на {timezone}")
+    except Exception as e:
+        logger.error(f"Ошибка обновления часового пояса: {e}")
+        await message.answer(get_text("error", user.language))
+
+
 @router.callback_query(F.data == "edit_language")
 async def edit_language_start(callback: CallbackQuery, state: FSMContext, user: User):
     """Начать редактирование языка"""
@@ -277,9 +327,10 @@ async def edit_language_process(
     try:
         language = callback.data.split("_")[1]
         
-        await UserRepository.update(
+        updated_user = await UserRepository.update(
             session,
             user.telegram_id,
+            current=user,
             language=language
         )
         
@@ -289,7 +340,6 @@ async def edit_language_process(
         text = get_text("profile_updated", language)
         await callback.message.edit_text(text)
         
-        updated_user = await UserRepository.get_by_telegram_id(session, user.telegram_id)
         profile_text = get_text(
             "profile_info",
             updated_user.language,
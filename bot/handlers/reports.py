@@ -1,31 +1,30 @@
 """
 Отчеты - ФИНАЛЬНАЯ ВЕРСИЯ
 """
-from aiogram import Router, F
+from aiogram import Router, F, flags
 from aiogram.filters import Command
 from aiogram.types import Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
-from datetime import date, datetime
 from loguru import logger
-import pytz
 
-from config.settings import settings
 from bot.states import ReportStates
 from bot.keyboards import (
     get_report_type_keyboard, 
     get_cancel_and_examples_keyboard,
     get_examples_keyboard
 )
-from bot.utils import get_text
-from bot.database import User, DailyReportRepository
+from bot.utils import get_text, format_minute, local_now
+from bot.database import User, DailyReportRepository, ReportAlreadyExistsError
 from bot.filters import IsRegisteredFilter
+from bot.services.calendar_service import work_calendar
 
 router = Router()
 
 
 @router.message(Command("report"), IsRegisteredFilter())
 @router.message(F.text.in_(["📊 Отправить отчет", "📊 Hesabat göndər"]), IsRegisteredFilter())
+@flags.db("read")
 async def cmd_report(message: Message, user: User, session: AsyncSession, state: FSMContext):
     """Начать отправку отчета"""
     try:
@@ -33,25 +32,25 @@ async def cmd_report(message: Message, user: User, session: AsyncSession, state:
         if user.is_admin:
             # await message.answer(get_text("admin_no_daily_report", user.language))
             return
-        # Проверка времени
-        baku_tz = pytz.timezone(settings.timezone)
-        now_baku = datetime.now(baku_tz)
-        current_hour = now_baku.hour
-        
-        # Определяем конец рабочего дня
-        if user.work_time == "9:00-18:00":
-            end_hour = 18
-        else:  # "10:00-19:00"
-            end_hour = 19
+        # Проверка времени (по часовому поясу пользователя)
+        now_local = local_now(user.timezone)
+        current_minute = now_local.hour * 60 + now_local.minute
+        today = now_local.date()
+
+        # Выходной или праздник — отчет не нужен
+        if not await work_calendar.is_working_day_for(session, user.telegram_id, today):
+            await message.answer(get_text("report_day_off", user.language))
+            logger.info(f"report blocked (day off) tg={user.telegram_id}, day={today}")
+            return
         
         # Если еще не конец рабочего дня
-        if current_hour < end_hour:
-            text = get_text("report_too_early", user.language, end_time=f"{end_hour}:00")
+        if current_minute < user.work_end_minute:
+            end_time = format_minute(user.work_end_minute)
+            text = get_text("report_too_early", user.language, end_time=end_time)
             await message.answer(text)
-            logger.info(f"report blocked (too early) tg={user.telegram_id}, hour={current_hour}, end={end_hour}")
+            logger.info(f"report blocked (too early) tg={user.telegram_id}, now={now_local:%H:%M}, end={end_time}")
             return
         
-        today = date.today()
         existing = await DailyReportRepository.get_by_date(session, user.telegram_id, today)
         if existing:
             await message.answer(get_text("report_already_submitted", user.language))
@@ -70,11 +69,12 @@ async def cmd_report(message: Message, user: User, session: AsyncSession, state:
 
 # ✅ ИСПРАВЛЕНО: Убрано требование state
 @router.callback_query(F.data == "report_has_tasks")
+@flags.db("read")
 async def report_has_tasks(callback: CallbackQuery, state: FSMContext, user: User, session: AsyncSession):
     """Пользователь выбрал что есть задачи"""
     try:
         # Проверяем, не отправлен ли уже отчет
-        today = date.today()
+        today = local_now(user.timezone).date()
         existing = await DailyReportRepository.get_by_date(session, user.telegram_id, today)
         if existing:
             await callback.answer(get_text("report_already_submitted", user.language), show_alert=True)
@@ -145,14 +145,8 @@ async def report_no_tasks(
 ):
     """Пользователь выбрал что нет задач"""
     try:
-        # Проверяем, не отправлен ли уже отчет
-        today_date = date.today()
-        existing = await DailyReportRepository.get_by_date(session, user.telegram_id, today_date)
-        if existing:
-            await callback.answer(get_text("report_already_submitted", user.language), show_alert=True)
-            return
-        
-        today = datetime.now()
+        # Повторный отчёт за день отклонит уникальный ключ (ReportAlreadyExistsError) — без SELECT заранее
+        today = local_now(user.timezone).replace(tzinfo=None)
         
         await DailyReportRepository.create(
             session=session,
@@ -171,6 +165,8 @@ async def report_no_tasks(
         
         logger.info(f"Пользователь {user.telegram_id} сообщил об отсутствии задач")
     
+    except ReportAlreadyExistsError:
+        await callback.answer(get_text("report_already_submitted", user.language), show_alert=True)
     except Exception as e:
         logger.error(f"Ошибка в report_no_tasks: {e}")
         await callback.answer(get_text("error", user.language), show_alert=True)
@@ -224,7 +220,7 @@ async def receive_report_text(
             return
         
         # Сохраняем отчет
-        today = datetime.now()
+        today = local_now(user.timezone).replace(tzinfo=None)
         
         await DailyReportRepository.create(
             session=session,
@@ -242,6 +238,9 @@ async def receive_report_text(
         
         logger.info(f"Пользователь {user.telegram_id} отправил ежедневный отчет")
     
+    except ReportAlreadyExistsError:
+        await state.clear()
+        await message.answer(get_text("report_already_submitted", user.language))
     except Exception as e:
         logger.error(f"Ошибка получения текста отчета: {e}")
         await message.answer(get_text("error", user.language))
\ No newline at end of file
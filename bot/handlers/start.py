@@ -17,7 +17,7 @@ from bot.keyboards import (
     get_confirmation_keyboard,
     get_main_menu_keyboard,
 )
-from bot.utils import get_text
+from bot.utils import get_text, WORK_TIME_PRESETS, DEFAULT_WORK_TIME, format_work_time
 from bot.database import User, UserRepository
 from bot.filters import IsNotRegisteredFilter, IsRegisteredFilter
 
@@ -183,8 +183,9 @@ async def select_work_time(callback: CallbackQuery, state: FSMContext):
     """Выбор рабочего времени"""
     try:
         code = callback.data.split("_", 2)[2]
-        work_time = {"9-18": "9:00-18:00", "10-19": "10:00-19:00"}.get(code, "9:00-18:00")
-        await state.update_data(work_time=work_time)
+        start_minute, end_minute = WORK_TIME_PRESETS.get(code, DEFAULT_WORK_TIME)
+        work_time = format_work_time(start_minute, end_minute)
+        await state.update_data(work_start_minute=start_minute, work_end_minute=end_minute)
         data = await state.get_data()
         lang = data["language"]
         await callback.message.edit_text(
@@ -214,7 +215,8 @@ async def confirm_registration(callback: CallbackQuery, state: FSMContext, sessi
             first_name=data["first_name"],
             last_name=data["last_name"],
             language=lang,
-            work_time=data["work_time"],
+            work_start_minute=data["work_start_minute"],
+            work_end_minute=data["work_end_minute"],
             is_admin=is_admin
         )
 
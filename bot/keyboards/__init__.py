@@ -14,6 +14,7 @@ from .keyboards import (
     get_admin_keyboard,
     get_user_list_keyboard,
     get_delete_confirmation_keyboard,
+    get_text_pages_keyboard,
 )
 
 __all__ = [
@@ -29,4 +30,5 @@ __all__ = [
     'get_admin_keyboard',
     'get_user_list_keyboard',
     'get_delete_confirmation_keyboard',
+    'get_text_pages_keyboard',
 ]
\ No newline at end of file
@@ -1,7 +1,7 @@
 """
 Клавиатуры - С ФУНКЦИЕЙ УДАЛЕНИЯ ПОЛЬЗОВАТЕЛЕЙ
 """
-from typing import List
+from typing import List, Optional
 from aiogram.types import InlineKeyboardMarkup, ReplyKeyboardRemove
 from aiogram.utils.keyboard import InlineKeyboardBuilder, ReplyKeyboardBuilder
 
@@ -165,18 +165,26 @@ def get_admin_keyboard(language: str = "ru") -> InlineKeyboardMarkup:
     return builder.as_markup()
 
 
-def get_user_list_keyboard(users: List, language: str, current_admin_id: int) -> InlineKeyboardMarkup:
+def get_user_list_keyboard(
+    users: List,
+    language: str,
+    current_admin_id: int,
+    prev_cursor: Optional[int] = None,
+    next_cursor: Optional[int] = None,
+) -> InlineKeyboardMarkup:
     """
-    ✅ НОВОЕ: Клавиатура списка пользователей с кнопками удаления
+    Клавиатура страницы списка пользователей: удаление, листание и поиск.
+    prev_cursor / next_cursor — telegram_id крайних записей страницы, если есть куда листать.
     """
     texts = {
-        "ru": {"back": "◀️ Назад"},
-        "az": {"back": "◀️ Geri"}
+        "ru": {"back": "◀️ Назад", "prev": "⬅️", "next": "➡️", "search": "🔍 Поиск"},
+        "az": {"back": "◀️ Geri", "prev": "⬅️", "next": "➡️", "search": "🔍 Axtarış"}
     }
     
     builder = InlineKeyboardBuilder()
     
     # Добавляем кнопки удаления для каждого пользователя
+    sizes = []
     for user in users:
         # Нельзя удалить себя или других админов
         if user.telegram_id == current_admin_id or user.is_admin:
@@ -184,12 +192,25 @@ def get_user_list_keyboard(users: List, language: str, current_admin_id: int) ->
             
         button_text = f"🗑 {user.first_name} {user.last_name}"
         builder.button(text=button_text, callback_data=f"delete_user_{user.telegram_id}")
+        sizes.append(1)
     
-    # Кнопка "Назад"
+    # Листание: одна строка из доступных стрелок
+    arrows = 0
+    if prev_cursor is not None:
+        builder.button(text=texts[language]["prev"], callback_data=f"users_prev_{prev_cursor}")
+        arrows += 1
+    if next_cursor is not None:
+        builder.button(text=texts[language]["next"], callback_data=f"users_next_{next_cursor}")
+        arrows += 1
+    if arrows:
+        sizes.append(arrows)
+    
+    # Поиск и "Назад"
+    builder.button(text=texts[language]["search"], callback_data="users_search")
     builder.button(text=texts[language]["back"], callback_data="admin_panel_back")
+    sizes.append(2)
     
-    # Располагаем по 1 кнопке в ряд
-    builder.adjust(1)
+    builder.adjust(*sizes)
     
     return builder.as_markup()
 
@@ -208,4 +229,16 @@ def get_delete_confirmation_keyboard(telegram_id: int, language: str) -> InlineK
     builder.button(text=texts[language]["cancel"], callback_data=f"cancel_delete_{telegram_id}")
     builder.adjust(1)
     
-    return builder.as_markup()
\ No newline at end of file
+    return builder.as_markup()
+
+
+def get_text_pages_keyboard(token: str, number: int, total: int) -> InlineKeyboardMarkup:
+    """Листание длинного текста: стрелки к соседним страницам (number — с нуля)"""
+    builder = InlineKeyboardBuilder()
+    if number > 0:
+        builder.button(text="⬅️", callback_data=f"text_page_{token}_{number - 1}")
+    if number < total - 1:
+        builder.button(text="➡️", callback_data=f"text_page_{token}_{number + 1}")
+    builder.adjust(2)
+    
+    return builder.as_markup()
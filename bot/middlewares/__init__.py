@@ -1,6 +1,7 @@
 from .middlewares import (
     LoggingMiddleware,
     DatabaseMiddleware,
+    DatabaseModeMiddleware,
     UserCheckMiddleware,
     AdminCheckMiddleware,
 )
@@ -8,6 +9,7 @@ from .middlewares import (
 __all__ = [
     'LoggingMiddleware',
     'DatabaseMiddleware',
+    'DatabaseModeMiddleware',
     'UserCheckMiddleware',
     'AdminCheckMiddleware',
 ]
\ No newline at end of file
@@ -3,10 +3,11 @@ Middleware - ИСПРАВЛЕННАЯ ВЕРСИЯ
 """
 from typing import Callable, Dict, Any, Awaitable
 from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
 from aiogram.types import TelegramObject, Message, CallbackQuery
 from loguru import logger
 
-from bot.database import db_manager, UserRepository
+from bot.database import db_manager, LazySession, UserRepository
 from config.settings import settings as app_settings
 
 
@@ -26,20 +27,36 @@ class LoggingMiddleware(BaseMiddleware):
 
 
 class DatabaseMiddleware(BaseMiddleware):
-    """Создание сессии БД для каждого update"""
+    """Сессия БД для каждого update: создаётся при первом обращении (LazySession)"""
     async def __call__(
         self,
         handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
         event: TelegramObject,
         data: Dict[str, Any]
     ) -> Any:
-        async with db_manager.session() as session:
-            data["session"] = session
-            try:
-                return await handler(event, data)
-            finally:
-                if session.in_transaction():
-                    await session.rollback()
+        session = db_manager.lazy_session()
+        data["session"] = session
+        try:
+            return await handler(event, data)
+        finally:
+            await session.close()
+
+
+class DatabaseModeMiddleware(BaseMiddleware):
+    """
+    Хендлеры с флагом db="read" читают через пул AUTOCOMMIT и не держат соединение.
+    Inner middleware: флаги хендлера известны только после выбора хендлера
+    """
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        session = data.get("session")
+        if isinstance(session, LazySession) and get_flag(data, "db") == "read":
+            session.use_read_only()
+        return await handler(event, data)
 
 
 class UserCheckMiddleware(BaseMiddleware):
@@ -64,7 +81,17 @@ class UserCheckMiddleware(BaseMiddleware):
             return await handler(event, data)
 
         try:
-            user = await UserRepository.get_by_telegram_id(session, tg_user.id)
+            # Обычно из кэша — без запроса к БД. Промах читаем через пул AUTOCOMMIT,
+            # а не сессией update: она ещё не создана, и DatabaseModeMiddleware
+            # сможет перевести хендлер с db="read" на пул чтения
+            async with db_manager.read_session() as reader:
+                user = await UserRepository.get_cached(reader, tg_user.id)
+            if user and user.blocked_at is not None:
+                # Отключённый из-за блокировки снова пишет боту — значит, разблокировал
+                user = await UserRepository.update(
+                    session, user.telegram_id, current=user, is_active=True, blocked_at=None
+                )
+                logger.info(f"[UserCheck] пользователь {tg_user.id} разблокировал бота — снова активен")
             data["user"] = user
             data["is_registered"] = user is not None
 
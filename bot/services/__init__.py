@@ -1,5 +1,15 @@
 from .deepseek_service import deepseek_service
 from .document_service import document_service
+from .outbound_service import OutboundScheduler, outbound_scheduler, bulk_lane
+from .broadcast_service import Broadcaster, DeliveryResult, is_permanent_failure
+from .reminder_log import ReminderEventWriter, reminder_events
+from .outbox_service import OutboxService, outbox_service
+from .reminder_policy import ReminderPolicy, ReminderPlan
+from .calendar_service import WorkCalendar, work_calendar
+from .summary_service import DailySummary, PeriodStats, SummaryService, summary_service
 from .scheduler_service import SchedulerService
 
-__all__ = ['deepseek_service', 'document_service', 'SchedulerService']
\ No newline at end of file
+__all__ = ['deepseek_service', 'document_service', 'OutboundScheduler', 'outbound_scheduler', 'bulk_lane',
+           'Broadcaster', 'DeliveryResult', 'is_permanent_failure',
+           'ReminderEventWriter', 'reminder_events', 'OutboxService', 'outbox_service', 'ReminderPolicy', 'ReminderPlan',
+           'WorkCalendar', 'work_calendar', 'DailySummary', 'PeriodStats', 'SummaryService', 'summary_service', 'SchedulerService']
\ No newline at end of file
@@ -0,0 +1,201 @@
+"""
+Массовая рассылка с ограничением параллельности и скорости (Telegram Bot API)
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramRetryAfter,
+    TelegramNetworkError,
+    TelegramServerError,
+    TelegramForbiddenError,
+    TelegramBadRequest,
+)
+from aiogram.methods import TelegramMethod
+from loguru import logger
+
+from config.settings import settings
+from bot.services.outbound_service import bulk_lane
+
+
+BroadcastItem = Union[TelegramMethod, Sequence[TelegramMethod]]
+
+# Ответы Bad Request, после которых писать в чат бессмысленно
+_PERMANENT_BAD_REQUEST = (
+    "chat not found",
+    "user not found",
+    "user is deactivated",
+    "peer_id_invalid",
+)
+
+
+def is_permanent_failure(error: Optional[BaseException]) -> bool:
+    """
+    Постоянная ошибка доставки: пользователь заблокировал бота, удалил аккаунт
+    или чат не существует. Повторять отправку не нужно.
+    """
+    if isinstance(error, TelegramForbiddenError):
+        return True
+    if isinstance(error, TelegramBadRequest):
+        message = str(error.message).lower()
+        return any(marker in message for marker in _PERMANENT_BAD_REQUEST)
+    return False
+
+
+@dataclass
+class DeliveryResult:
+    """Результат доставки одному получателю"""
+    chat_id: int
+    ok: bool
+    attempts: int = 0
+    error: Optional[BaseException] = None
+
+    @property
+    def permanent(self) -> bool:
+        """Недоставка окончательная (см. is_permanent_failure)"""
+        return not self.ok and is_permanent_failure(self.error)
+
+
+def item_chat_id(item: BroadcastItem) -> int:
+    """Получатель элемента рассылки"""
+    method = item if isinstance(item, TelegramMethod) else item[0]
+    return getattr(method, "chat_id", 0)
+
+
+class TokenBucket:
+    """
+    Token bucket: не больше `rate` запросов в секунду с допустимым всплеском `capacity`.
+    pause() останавливает выдачу токенов всем ожидающим (например, после RetryAfter).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class Broadcaster:
+    """
+    Рассылка пачки сообщений:
+    - не больше `concurrency` одновременных запросов
+    - общий лимит скорости (token bucket) и пауза между сообщениями в один чат
+    - TelegramRetryAfter: ждём указанное время (и приостанавливаем всю рассылку), затем повтор
+    - запросы идут по полосе bulk: ответы пользователям в хендлерах обслуживаются раньше
+    - возвращает результат по каждому получателю
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        concurrency: Optional[int] = None,
+        rate_per_second: Optional[float] = None,
+        per_chat_interval: Optional[float] = None,
+        max_retries: Optional[int] = None,
+    ):
+        self.bot = bot
+        self.concurrency = concurrency or settings.broadcast_concurrency
+        self.per_chat_interval = (
+            per_chat_interval if per_chat_interval is not None else settings.broadcast_per_chat_interval
+        )
+        self.max_retries = max_retries if max_retries is not None else settings.broadcast_max_retries
+        self.bucket = TokenBucket(rate_per_second or settings.broadcast_rate_per_second)
+
+    async def broadcast(self, items: Iterable[BroadcastItem]) -> List[DeliveryResult]:
+        """
+        Разослать элементы. Элемент — один метод Bot API (SendMessage, SendDocument, ...)
+        или последовательность методов для одного чата (отправляются по порядку).
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            methods = [item] if isinstance(item, TelegramMethod) else list(item)
+            if methods:
+                queue.put_nowait(methods)
+
+        results: List[DeliveryResult] = []
+        if queue.empty():
+            return results
+
+        last_sent: Dict[int, float] = {}
+
+        async def worker():
+            while True:
+                try:
+                    methods = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                results.append(await self._deliver(methods, last_sent))
+
+        workers = min(self.concurrency, queue.qsize())
+        with bulk_lane():
+            await asyncio.gather(*(worker() for _ in range(workers)))
+        return results
+
+    async def _deliver(self, methods: List[TelegramMethod], last_sent: Dict[int, float]) -> DeliveryResult:
+        chat_id = item_chat_id(methods)
+        result = DeliveryResult(chat_id=chat_id, ok=False)
+        try:
+            for method in methods:
+                await self._call(method, result, last_sent)
+            result.ok = True
+        except Exception as e:
+            result.error = e
+        return result
+
+    async def _call(self, method: TelegramMethod, result: DeliveryResult, last_sent: Dict[int, float]) -> Any:
+        retries = 0
+        while True:
+            # Лимит на один чат (Telegram: ~1 сообщение в секунду в личный чат)
+            wait = last_sent.get(result.chat_id, 0.0) + self.per_chat_interval - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            await self.bucket.acquire()
+            last_sent[result.chat_id] = time.monotonic()
+            result.attempts += 1
+            try:
+                return await self.bot(method)
+            except TelegramRetryAfter as e:
+                if retries >= self.max_retries:
+                    raise
+                retries += 1
+                logger.warning(f"[broadcast] flood control, ждём {e.retry_after} с (чат {result.chat_id})")
+                self.bucket.pause(e.retry_after)
+            except (TelegramNetworkError, TelegramServerError) as e:
+                if retries >= self.max_retries:
+                    raise
+                retries += 1
+                logger.warning(f"[broadcast] временная ошибка для {result.chat_id}: {e}, повтор {retries}")
+                await asyncio.sleep(2 ** retries)
+
+
+def log_broadcast_results(tag: str, results: List[DeliveryResult]) -> None:
+    """Итог рассылки в лог: количество доставленных и ошибки по получателям"""
+    failed = [r for r in results if not r.ok]
+    for r in failed:
+        if r.permanent:
+            logger.warning(f"[{tag}] чат {r.chat_id} недоступен: {r.error}")
+        else:
+            logger.error(f"[{tag}] ошибка Telegram для {r.chat_id}: {r.error}")
+    logger.info(f"[{tag}] доставлено {len(results) - len(failed)}/{len(results)}")
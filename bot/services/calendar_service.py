@@ -0,0 +1,57 @@
+"""
+Производственный календарь: рабочие дни недели, праздники и исключения сотрудников.
+Общий календарь держится в памяти, чтобы задачи планировщика отсекали
+нерабочие дни до запросов к БД и Bot API.
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Set
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from bot.database import db_manager, CalendarRepository
+from bot.utils.clock import utcnow
+
+
+class WorkCalendar:
+    """
+    Общий график (рабочие дни недели + праздники из настроек и таблицы holidays)
+    и дни, в которые кто-то работает по исключению (для быстрой проверки «есть ли работа»)
+    """
+
+    def __init__(self, weekdays: Iterable[int], holidays: Iterable[date] = ()):
+        self.weekdays: Set[int] = set(weekdays)
+        self.static_holidays: Set[date] = set(holidays)
+        self.holidays: Dict[date, Optional[str]] = dict.fromkeys(self.static_holidays)
+        self.extra_work_days: Set[date] = set()
+
+    def is_working_day(self, day: date) -> bool:
+        """Рабочий ли день по общему календарю"""
+        return day.weekday() in self.weekdays and day not in self.holidays
+
+    def has_work(self, day: date) -> bool:
+        """Работает ли в этот день хоть кто-то (общий календарь или исключения)"""
+        return self.is_working_day(day) or day in self.extra_work_days
+
+    async def is_working_day_for(self, session: AsyncSession, telegram_id: int, day: date) -> bool:
+        """Рабочий ли день для сотрудника: исключение важнее общего календаря"""
+        exception = await CalendarRepository.get_user_exception(session, telegram_id, day)
+        return exception if exception is not None else self.is_working_day(day)
+
+    async def refresh(self) -> None:
+        """Перечитать праздники и дни-исключения из БД (прошлые дни не нужны)"""
+        since = utcnow().date() - timedelta(days=2)
+        try:
+            async with db_manager.session() as session:
+                holidays = await CalendarRepository.get_holidays(session, since)
+                extra_work_days = await CalendarRepository.get_extra_work_days(session, since)
+        except Exception as e:
+            logger.error(f"[calendar] ошибка загрузки календаря: {e}")
+            return
+        self.holidays = {**dict.fromkeys(self.static_holidays), **holidays}
+        self.extra_work_days = extra_work_days
+        logger.debug(f"[calendar] праздников: {len(self.holidays)}, дней-исключений: {len(extra_work_days)}")
+
+
+work_calendar = WorkCalendar(settings.working_days_list, settings.holidays_list)
@@ -243,9 +243,26 @@
 Сервис DeepSeek AI - ФИНАЛЬНАЯ ВЕРСИЯ
 """
 import httpx
-from typing import List, Dict
+from dataclasses import dataclass, field
+from datetime import date
+from typing import AsyncIterable, List, Optional
 from loguru import logger
 from config.settings import settings
+from bot.database import ReportRecord
+
+
+@dataclass
+class WeeklyDigest:
+    """
+    Отчёты недели, собранные за один проход потока: исходные данные промпта
+    и строки упрощённого отчёта по датам — сами записи не хранятся
+    """
+    first_date: date
+    last_date: date
+    total: int = 0
+    with_tasks: int = 0
+    reports_text: List[str] = field(default_factory=list)
+    by_date: List[str] = field(default_factory=list)
 
 
 class DeepSeekService:
@@ -258,41 +275,61 @@ class DeepSeekService:
     
     async def generate_weekly_report(
         self,
-        reports_data: List[Dict],
+        reports: AsyncIterable[ReportRecord],
         language: str = "ru"
-    ) -> str:
-        """Сгенерировать недельный отчет"""
+    ) -> Optional[str]:
+        """
+        Сгенерировать недельный отчет из потока отчётов (по дате сдачи).
+        None — отчётов за неделю нет
+        """
+        digest = await self._collect(reports, language)
+        if digest is None:
+            return None
         try:
-            prompt = self._create_weekly_report_prompt(reports_data, language)
+            prompt = self._create_weekly_report_prompt("".join(digest.reports_text), language)
             response_text = await self._call_deepseek_api(prompt)
             return response_text
         
         except Exception as e:
             logger.error(f"Ошибка DeepSeek API: {e}")
             logger.warning("Использую fallback-генерацию")
-            return self._generate_fallback_report(reports_data, language)
+            return self._generate_fallback_report(digest, language)
+    
+    async def _collect(self, reports: AsyncIterable[ReportRecord], language: str) -> Optional[WeeklyDigest]:
+        """Один проход по потоку: текст для промпта и упрощённый отчёт строятся по ходу чтения"""
+        no_tasks_text = "Задач не было" if language == "ru" else "Tapşırıq olmayıb"
+        digest: Optional[WeeklyDigest] = None
+        async for report in reports:
+            day = report.date.date()
+            if digest is None:
+                digest = WeeklyDigest(first_date=day, last_date=day)
+            if not digest.by_date or day != digest.last_date:
+                # Отчёты идут по дате сдачи — новая дата открывает новый раздел
+                if digest.by_date:
+                    digest.by_date.append("\n")
+                digest.by_date.append(f"*{day.strftime('%d.%m.%Y')}:*\n")
+            digest.last_date = day
+            digest.total += 1
+            if report.has_tasks:
+                digest.with_tasks += 1
+            
+            user_name = f"{report.first_name} {report.last_name}"
+            task_text = report.report_text if report.has_tasks else no_tasks_text
+            digest.reports_text.append(f"\n{report.date.strftime('%Y-%m-%d')} - {user_name}:\n{task_text}\n")
+            digest.by_date.append(f"• **{user_name}**: {task_text}\n")
+        if digest is not None:
+            digest.by_date.append("\n")
+        return digest
     
     def _create_weekly_report_prompt(
         self,
-        reports_data: List[Dict],
+        reports_text: str,
         language: str
     ) -> str:
         """
         ✅ ИСПРАВЛЕНО: Улучшенный промпт - строго по реальным датам
         """
         
-        reports_text = ""
-        for report in reports_data:
-            date_str = report['date'].strftime("%Y-%m-%d")
-            user_name = f"{report['first_name']} {report['last_name']}"
-            
-            reports_text += f"\n{date_str} - {user_name}:\n"
-            if report['has_tasks']:
-                reports_text += f"{report['report_text']}\n"
-            else:
-                no_tasks_text = "Задач не было" if language == "ru" else "Tapşırıq olmayıb"
-                reports_text += f"{no_tasks_text}\n"
-        
         if language == "ru":
             prompt = f"""Ты - бизнес-аналитик. Создай КРАТКИЙ и СТРУКТУРИРОВАННЫЙ еженедельный отчет для руководства.
 
@@ -410,35 +447,22 @@ TƏLƏBLƏR:
     
     def _generate_fallback_report(
         self,
-        reports_data: List[Dict],
+        digest: WeeklyDigest,
         language: str
     ) -> str:
         """Fallback отчет при недоступности API"""
         
+        period = f"{digest.first_date.strftime('%d.%m.%Y')} - {digest.last_date.strftime('%d.%m.%Y')}\n"
+        by_date = "".join(digest.by_date)
+        total = digest.total
+        with_tasks = digest.with_tasks
+        
         if language == "ru":
             report = "**📊 ЕЖЕНЕДЕЛЬНЫЙ ОТЧЕТ**\n\n"
-            report += f"📅 Период: {reports_data[0]['date'].strftime('%d.%m.%Y')} - "
-            report += f"{reports_data[-1]['date'].strftime('%d.%m.%Y')}\n"
+            report += f"📅 Период: {period}"
             report += "⚠️ *Упрощенная версия*\n\n"
-            
-            from collections import defaultdict
-            by_date = defaultdict(list)
-            for r in reports_data:
-                by_date[r['date'].strftime('%d.%m.%Y')].append(r)
-            
             report += "**📅 ОТЧЕТЫ ПО ДАТАМ:**\n\n"
-            for date, day_reports in sorted(by_date.items()):
-                report += f"*{date}:*\n"
-                for r in day_reports:
-                    user_name = f"{r['first_name']} {r['last_name']}"
-                    if r['has_tasks']:
-                        report += f"• **{user_name}**: {r['report_text']}\n"
-                    else:
-                        report += f"• **{user_name}**: Задач не было\n"
-                report += "\n"
-            
-            total = len(reports_data)
-            with_tasks = sum(1 for r in reports_data if r['has_tasks'])
+            report += by_date
             
             report += "**📈 СТАТИСТИКА:**\n"
             report += f"• Всего отчетов: {total}\n"
@@ -447,28 +471,10 @@ TƏLƏBLƏR:
             
         else:
             report = "**📊 HƏFTƏLİK HESABAT**\n\n"
-            report += f"📅 Dövr: {reports_data[0]['date'].strftime('%d.%m.%Y')} - "
-            report += f"{reports_data[-1]['date'].strftime('%d.%m.%Y')}\n"
+            report += f"📅 Dövr: {period}"
             report += "⚠️ *Sadələşdirilmiş versiya*\n\n"
-            
-            from collections import defaultdict
-            by_date = defaultdict(list)
-            for r in reports_data:
-                by_date[r['date'].strftime('%d.%m.%Y')].append(r)
-            
             report += "**📅 TARİXLƏRƏ GÖRƏ HESABATLAR:**\n\n"
-            for date, day_reports in sorted(by_date.items()):
-                report += f"*{date}:*\n"
-                for r in day_reports:
-                    user_name = f"{r['first_name']} {r['last_name']}"
-                    if r['has_tasks']:
-                        report += f"• **{user_name}**: {r['report_text']}\n"
-                    else:
-                        report += f"• **{user_name}**: Tapşırıq olmayıb\n"
-                report += "\n"
-            
-            total = len(reports_data)
-            with_tasks = sum(1 for r in reports_data if r['has_tasks'])
+            report += by_date
             
             report += "**📈 STATİSTİKA:**\n"
             report += f"• Cəmi hesabat: {total}\n"
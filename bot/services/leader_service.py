@@ -0,0 +1,153 @@
+"""
+Выбор лидера между репликами бота: задачи планировщика выполняет только держатель аренды
+"""
+import asyncio
+import os
+from abc import ABC, abstractmethod
+import socket
+import time
+import uuid
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+
+from config.settings import settings
+from bot.database import db_manager, SchedulerLeaseRepository
+
+
+def make_replica_id() -> str:
+    """Уникальный идентификатор процесса бота"""
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+class Lease(ABC):
+    """Аренда лидерства (интерфейс)"""
+
+    @abstractmethod
+    async def try_acquire(self) -> bool:
+        """Взять или продлить аренду. True — аренда наша."""
+
+    @abstractmethod
+    async def release(self) -> None:
+        """Отпустить аренду"""
+
+
+class AlwaysLeaderLease(Lease):
+    """Одна реплика: всегда лидер (выбор лидера отключён)"""
+
+    async def try_acquire(self) -> bool:
+        return True
+
+    async def release(self) -> None:
+        return None
+
+
+class InProcessLease(Lease):
+    """
+    Аренда в памяти процесса — замена БД для тестов и симуляции
+    нескольких реплик в одном процессе.
+    """
+
+    _leases: Dict[str, Tuple[str, float]] = {}
+
+    def __init__(self, name: str, holder: str, ttl_seconds: float):
+        self.name = name
+        self.holder = holder
+        self.ttl_seconds = ttl_seconds
+
+    async def try_acquire(self) -> bool:
+        now = time.monotonic()
+        current = self._leases.get(self.name)
+        if current is None or current[0] == self.holder or current[1] < now:
+            self._leases[self.name] = (self.holder, now + self.ttl_seconds)
+            return True
+        return False
+
+    async def release(self) -> None:
+        current = self._leases.get(self.name)
+        if current and current[0] == self.holder:
+            del self._leases[self.name]
+
+
+class DatabaseLease(Lease):
+    """Аренда-строка в таблице scheduler_leases с продлением по heartbeat (MySQL / SQLite)"""
+
+    def __init__(self, name: str, holder: str, ttl_seconds: int):
+        self.name = name
+        self.holder = holder
+        self.ttl_seconds = ttl_seconds
+
+    async def try_acquire(self) -> bool:
+        async with db_manager.session() as session:
+            return await SchedulerLeaseRepository.try_acquire(session, self.name, self.holder, self.ttl_seconds)
+
+    async def release(self) -> None:
+        async with db_manager.session() as session:
+            await SchedulerLeaseRepository.release(session, self.name, self.holder)
+
+
+class LeaderElector:
+    """
+    Периодически продлевает аренду. Если лидер упал, аренда истекает через ttl,
+    и другая реплика забирает её на следующем heartbeat.
+    При ошибке связи с БД реплика считает себя не-лидером.
+    """
+
+    def __init__(self, lease: Lease, heartbeat_seconds: float):
+        self.lease = lease
+        self.heartbeat_seconds = heartbeat_seconds
+        self.is_leader = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def heartbeat(self) -> bool:
+        """Одна попытка взять/продлить аренду"""
+        try:
+            leader = await self.lease.try_acquire()
+        except Exception as e:
+            logger.error(f"[leader] ошибка продления аренды: {e}")
+            leader = False
+        if leader != self.is_leader:
+            logger.info(f"[leader] {'получено' if leader else 'потеряно'} лидерство")
+        self.is_leader = leader
+        return leader
+
+    async def _run(self):
+        while True:
+            await self.heartbeat()
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    def start(self) -> None:
+        """Запустить heartbeat в фоне (нужен работающий event loop)"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Остановить heartbeat и отпустить аренду"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.is_leader:
+            try:
+                await self.lease.release()
+            except Exception as e:
+                logger.error(f"[leader] ошибка освобождения аренды: {e}")
+        self.is_leader = False
+
+
+def create_leader_elector(replica_id: Optional[str] = None) -> LeaderElector:
+    """Выбор лидера по настройкам: LEADER_ELECTION=off | db | memory"""
+    mode = settings.leader_election.lower()
+    holder = replica_id or make_replica_id()
+    ttl = settings.leader_lease_ttl_seconds
+    if mode == "db":
+        lease: Lease = DatabaseLease(settings.leader_lease_name, holder, ttl)
+    elif mode == "memory":
+        lease = InProcessLease(settings.leader_lease_name, holder, ttl)
+    else:
+        lease = AlwaysLeaderLease()
+    logger.info(f"[leader] режим={mode}, реплика={holder}")
+    return LeaderElector(lease, settings.leader_heartbeat_seconds)
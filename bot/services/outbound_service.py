@@ -0,0 +1,140 @@
+"""
+Исходящие запросы к Bot API: общий лимит скорости и две полосы приоритета.
+Ответы пользователям (interactive) обслуживаются раньше рассылок (bulk),
+поэтому рассылка планировщика не задерживает кнопки и ответы в хендлерах.
+"""
+import asyncio
+import contextlib
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Deque, Dict, Optional
+
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import GetUpdates, Response, TelegramMethod
+from loguru import logger
+
+from config.settings import settings
+
+
+INTERACTIVE = "interactive"
+BULK = "bulk"
+
+# Полоса текущей задачи; по умолчанию запросы считаются ответами пользователю
+_lane: ContextVar[str] = ContextVar("outbound_lane", default=INTERACTIVE)
+
+
+def current_lane() -> str:
+    return _lane.get()
+
+
+@contextlib.contextmanager
+def bulk_lane():
+    """Запросы внутри блока (и созданных в нём задач) идут по полосе рассылок"""
+    token = _lane.set(BULK)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+class LaneRateLimiter:
+    """
+    Token bucket с очередями по полосам: пока ждёт хоть один interactive-запрос,
+    токены bulk не выдаются. pause() останавливает выдачу всем (RetryAfter).
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._queues: Dict[str, Deque[asyncio.Future]] = {INTERACTIVE: deque(), BULK: deque()}
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def waiting(self, lane: str) -> int:
+        return len(self._queues[lane])
+
+    async def acquire(self, lane: str = INTERACTIVE) -> None:
+        waiter = asyncio.get_running_loop().create_future()
+        self._queues[lane].append(waiter)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.get_running_loop().create_task(self._dispatch())
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter in self._queues[lane]:
+                self._queues[lane].remove(waiter)
+            raise
+
+    def _next_waiter(self) -> Optional[asyncio.Future]:
+        for lane in (INTERACTIVE, BULK):
+            queue = self._queues[lane]
+            while queue:
+                waiter = queue.popleft()
+                if not waiter.done():
+                    return waiter
+        return None
+
+    async def _dispatch(self) -> None:
+        while any(self._queues.values()):
+            now = time.monotonic()
+            if now < self._paused_until:
+                await asyncio.sleep(self._paused_until - now)
+                continue
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+            waiter = self._next_waiter()
+            if waiter is None:
+                return
+            self._tokens -= 1
+            waiter.set_result(None)
+
+
+class OutboundScheduler(BaseRequestMiddleware):
+    """
+    Middleware сессии бота: каждый запрос к Bot API (кроме getUpdates) проходит
+    через общий лимит; полоса берётся из контекста (bulk_lane() у рассылок).
+    RetryAfter от Telegram приостанавливает обе полосы.
+    """
+
+    def __init__(self, rate_per_second: Optional[float] = None):
+        self.limiter = LaneRateLimiter(rate_per_second or settings.outbound_rate_per_second)
+        self.served: Dict[str, int] = {INTERACTIVE: 0, BULK: 0}
+        self.max_wait: Dict[str, float] = {INTERACTIVE: 0.0, BULK: 0.0}
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType,
+        bot,
+        method: TelegramMethod,
+    ) -> Response:
+        # Long polling не расходует лимит отправки
+        if isinstance(method, GetUpdates):
+            return await make_request(bot, method)
+
+        lane = current_lane()
+        started = time.monotonic()
+        await self.limiter.acquire(lane)
+        waited = time.monotonic() - started
+        self.served[lane] += 1
+        self.max_wait[lane] = max(self.max_wait[lane], waited)
+        if lane == INTERACTIVE and waited > 1:
+            logger.warning(f"[outbound] ответ {type(method).__name__} ждал лимита {waited:.1f} с")
+        try:
+            return await make_request(bot, method)
+        except TelegramRetryAfter as e:
+            logger.warning(f"[outbound] flood control, пауза {e.retry_after} с для всех запросов")
+            self.limiter.pause(e.retry_after)
+            raise
+
+
+outbound_scheduler = OutboundScheduler()
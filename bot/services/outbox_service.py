@@ -0,0 +1,171 @@
+"""
+Outbox исходящих сообщений планировщика: задачи ставят сообщения в таблицу outbox,
+обработчик доставляет их пачками с повторами и отмечает результат.
+Перезапуск или недоступность Telegram не теряют сообщения — они ждут в БД.
+"""
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from aiogram.methods import SendMessage
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from bot.database import OutboxMessage, OutboxRepository
+from bot.keyboards import get_report_type_keyboard
+from bot.utils import get_text, utcnow
+from bot.services.broadcast_service import Broadcaster, DeliveryResult, log_broadcast_results
+from bot.services.reminder_log import ReminderEventWriter, reminder_events
+
+
+# Клавиатуры, которые можно приложить к сообщению outbox (по имени)
+KEYBOARDS = {
+    "report_type": get_report_type_keyboard,
+}
+
+
+@dataclass
+class OutboxStats:
+    """Счётчики обработчика outbox с момента запуска"""
+    sent: int = 0
+    failed: int = 0
+    retried: int = 0
+    cancelled: int = 0
+    busy_seconds: float = 0.0
+
+    @property
+    def rate(self) -> float:
+        """Пропускная способность: доставлено сообщений в секунду работы обработчика"""
+        return self.sent / self.busy_seconds if self.busy_seconds else 0.0
+
+
+class OutboxService:
+    """Постановка сообщений в outbox и их доставка"""
+
+    def __init__(self, events: Optional[ReminderEventWriter] = None):
+        self.stats = OutboxStats()
+        self.events = events
+
+    @staticmethod
+    def message(
+        dedupe_key: str,
+        chat_id: int,
+        text_key: str,
+        language: str,
+        keyboard: Optional[str] = None,
+        report_day: Optional[date] = None,
+    ) -> Dict:
+        """
+        Строка для enqueue; dedupe_key защищает от повторной постановки.
+        С report_day каждая попытка доставки попадает в журнал напоминаний.
+        """
+        return {
+            "dedupe_key": dedupe_key,
+            "chat_id": chat_id,
+            "text_key": text_key,
+            "language": language,
+            "keyboard": keyboard,
+            "report_day": report_day,
+        }
+
+    async def enqueue(self, session: AsyncSession, job_id: str, messages: Sequence[Dict]) -> int:
+        added = await OutboxRepository.enqueue(session, job_id, messages, utcnow())
+        logger.info(f"[outbox] {job_id}: в очередь {added} из {len(messages)}")
+        return added
+
+    @staticmethod
+    def render(message: OutboxMessage) -> SendMessage:
+        """Сообщение outbox -> вызов Bot API"""
+        keyboard = KEYBOARDS.get(message.keyboard) if message.keyboard else None
+        return SendMessage(
+            chat_id=message.chat_id,
+            text=get_text(message.text_key, message.language),
+            reply_markup=keyboard(message.language) if keyboard else None,
+        )
+
+    async def drain(
+        self,
+        session: AsyncSession,
+        broadcaster: Broadcaster,
+        shard: Optional[Tuple[int, int]] = None,
+    ) -> List[DeliveryResult]:
+        """
+        Доставить всё, что пора отправить, пачками по outbox_batch_size.
+        Временные ошибки — повтор с экспоненциальной паузой (до outbox_max_attempts),
+        постоянные — сразу 'failed'. Перед отправкой пачка сверяется с БД: неактуальное
+        (отчёт сдан, день закончился, получатель удалён) снимается как 'cancelled'.
+        Возвращает результаты по получателям.
+        """
+        results: List[DeliveryResult] = []
+        while True:
+            now = utcnow()
+            batch = await OutboxRepository.claim_batch(
+                session,
+                now,
+                settings.outbox_batch_size,
+                now + timedelta(seconds=settings.outbox_lease_seconds),
+                shard=shard,
+            )
+            if not batch:
+                break
+
+            started = time.perf_counter()
+            # Повторы доходят до получателя через минуты и часы — за это время отчёт могли сдать
+            obsolete = await OutboxRepository.find_obsolete(session, batch, now)
+            await OutboxRepository.mark_cancelled(session, obsolete)
+            self.stats.cancelled += len(obsolete)
+            # Несколько сообщений одному чату — одним элементом рассылки, по порядку
+            by_chat: Dict[int, List[OutboxMessage]] = defaultdict(list)
+            for message in batch:
+                if message.id not in obsolete:
+                    by_chat[message.chat_id].append(message)
+            part = await broadcaster.broadcast([self.render(m) for m in messages] for messages in by_chat.values())
+            await self._mark(session, by_chat, part)
+            self.stats.busy_seconds += time.perf_counter() - started
+            results.extend(part)
+
+            if len(batch) < settings.outbox_batch_size:
+                break
+
+        if results:
+            log_broadcast_results("outbox", results)
+            logger.info(f"[outbox] пропускная способность {self.stats.rate:.1f} сообщ./с")
+        return results
+
+    async def _mark(
+        self,
+        session: AsyncSession,
+        by_chat: Dict[int, List[OutboxMessage]],
+        results: List[DeliveryResult],
+    ) -> None:
+        sent: List[int] = []
+        failed: List[Tuple[int, str]] = []
+        retries: Dict[int, List[Tuple[int, str]]] = defaultdict(list)
+        now = utcnow()
+        for result in results:
+            for message in by_chat.get(result.chat_id, []):
+                if self.events is not None and message.report_day is not None:
+                    outcome = "sent" if result.ok else "blocked" if result.permanent else "failed"
+                    self.events.record(message.chat_id, message.report_day, message.text_key, outcome, now)
+                if result.ok:
+                    sent.append(message.id)
+                elif result.permanent or message.attempts >= settings.outbox_max_attempts:
+                    failed.append((message.id, str(result.error)))
+                else:
+                    retries[message.attempts].append((message.id, str(result.error)))
+
+        await OutboxRepository.mark_sent(session, sent)
+        await OutboxRepository.mark_failed(session, failed)
+        for attempts, errors in retries.items():
+            retry_at = now + timedelta(seconds=settings.outbox_retry_seconds * 2 ** (attempts - 1))
+            await OutboxRepository.mark_failed(session, errors, retry_at=retry_at)
+
+        self.stats.sent += len(sent)
+        self.stats.failed += len(failed)
+        self.stats.retried += sum(len(errors) for errors in retries.values())
+
+
+outbox_service = OutboxService(reminder_events)
@@ -0,0 +1,107 @@
+"""
+Журнал напоминаний: события копятся в памяти и пишутся в reminder_events пачками
+в фоне — отправка не ждёт commit на каждое сообщение
+"""
+import asyncio
+from datetime import date, datetime
+from typing import Dict, List, Optional
+
+from loguru import logger
+
+from config.settings import settings
+from bot.database import db_manager, ReminderEventRepository
+from bot.utils import utcnow
+
+
+class ReminderEventWriter:
+    """
+    record() только кладёт событие в буфер. Фоновая задача пишет буфер одной
+    вставкой раз в flush_seconds или сразу, как набралось batch_size событий.
+    Ошибка записи — события возвращаются в буфер (не больше max_buffered).
+    """
+
+    def __init__(self, batch_size: int, flush_seconds: float, max_buffered: Optional[int] = None):
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.max_buffered = max_buffered or batch_size * 20
+        self.written = 0
+        self.dropped = 0
+        self._buffer: List[Dict] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def record(
+        self,
+        telegram_id: int,
+        report_day: date,
+        kind: str,
+        outcome: str,
+        sent_at: Optional[datetime] = None,
+    ) -> None:
+        self._buffer.append(
+            {
+                "telegram_id": telegram_id,
+                "report_day": report_day,
+                "kind": kind,
+                "outcome": outcome,
+                "sent_at": sent_at or utcnow(),
+            }
+        )
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Записать накопленное; возвращает число записанных событий"""
+        written = 0
+        while self._buffer:
+            batch = self._buffer[:self.batch_size]
+            del self._buffer[:self.batch_size]
+            try:
+                async with db_manager.session() as session:
+                    await ReminderEventRepository.add_many(session, batch)
+            except asyncio.CancelledError:
+                # Остановка посреди записи: пачка допишется при stop()
+                self._buffer[:0] = batch
+                raise
+            except Exception as e:
+                logger.error(f"[reminder-log] ошибка записи {len(batch)} событий: {e}")
+                self._buffer[:0] = batch
+                overflow = len(self._buffer) - self.max_buffered
+                if overflow > 0:
+                    del self._buffer[:overflow]
+                    self.dropped += overflow
+                    logger.warning(f"[reminder-log] буфер переполнен, отброшено {overflow} старых событий")
+                break
+            written += len(batch)
+        self.written += written
+        return written
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Запустить фоновую запись (нужен работающий event loop)"""
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Остановить фоновую запись и дописать остаток"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            self._wakeup = None
+        await self.flush()
+
+
+reminder_events = ReminderEventWriter(settings.reminder_log_batch_size, settings.reminder_log_flush_seconds)
@@ -0,0 +1,122 @@
+"""
+Адаптивный график напоминаний: по истории сдачи отчётов (submitted_at и reminder_count)
+решаем, когда напомнить сотруднику впервые и сколько напоминаний ему нужно.
+Напоминания до привычного времени сдачи пропускаются — сотрудник и так сдаёт отчёт сам,
+а ближе к отсечке (23:00) напоминания идут чаще.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import settings
+from bot.database import User, DailyReportRepository
+from bot.utils import local_to_utc
+
+
+@dataclass(frozen=True)
+class ReminderPlan:
+    """Первое напоминание (минут после конца рабочего дня) и предел числа напоминаний"""
+    first_delay_minutes: int
+    max_reminders: Optional[int] = None
+
+
+class ReminderPolicy:
+    """
+    - истории мало (меньше min_samples отчётов) — как раньше: каждые interval минут до отсечки
+    - иначе первое напоминание — за lead минут до привычного времени сдачи
+      (percentile задержек после конца рабочего дня), но не раньше interval
+    - число напоминаний — на одно больше, чем сотруднику обычно нужно (тот же percentile
+      по reminder_count; сдаёт сам — одно), и не больше max_reminders: напоминания,
+      на которые он не реагирует, не шлём
+    - пауза до следующего напоминания — interval, но не больше половины времени до отсечки
+      и не меньше min_interval: чем ближе отсечка, тем чаще
+    """
+
+    def __init__(
+        self,
+        interval_minutes: int,
+        min_samples: int,
+        lead_minutes: int,
+        max_reminders: int,
+        min_interval_minutes: int,
+        percentile: float = 0.8,
+    ):
+        self.interval_minutes = interval_minutes
+        self.min_samples = min_samples
+        self.lead_minutes = lead_minutes
+        self.max_reminders = max_reminders
+        self.min_interval_minutes = min(min_interval_minutes, interval_minutes)
+        self.percentile = percentile
+
+    @property
+    def default(self) -> ReminderPlan:
+        return ReminderPlan(first_delay_minutes=self.interval_minutes)
+
+    def _usual(self, values: Sequence[int]) -> int:
+        """Значение percentile из непустой выборки"""
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.percentile))]
+
+    def plan(self, delays: Sequence[int], reminder_counts: Sequence[int] = ()) -> ReminderPlan:
+        """
+        delays — задержки сдачи после конца рабочего дня (минуты) за прошлые дни,
+        reminder_counts — сколько напоминаний было до сдачи в те же дни
+        """
+        if len(delays) < self.min_samples:
+            return self.default
+        usual = self._usual([max(0, delay) for delay in delays])
+        first_delay = max(self.interval_minutes, usual - self.lead_minutes)
+        # Сколько напоминаний обычно нужно; нет данных — предел по умолчанию
+        if not reminder_counts:
+            return ReminderPlan(first_delay_minutes=first_delay, max_reminders=self.max_reminders)
+        needed = self._usual([max(0, count) for count in reminder_counts])
+        return ReminderPlan(
+            first_delay_minutes=first_delay,
+            max_reminders=min(self.max_reminders, needed + 1),
+        )
+
+    def next_delay_minutes(self, now: datetime, stop_at: Optional[datetime]) -> int:
+        """Пауза до следующего напоминания (now и stop_at — naive UTC)"""
+        if stop_at is None:
+            return self.interval_minutes
+        remaining = (stop_at - now).total_seconds() / 60
+        return int(max(self.min_interval_minutes, min(self.interval_minutes, remaining / 2)))
+
+    @staticmethod
+    def submission_delay(report_date: datetime, submitted_at: datetime, end_minute: int, tz_name: str) -> int:
+        """Через сколько минут после конца рабочего дня (report_date — местная дата) сдан отчёт (UTC)"""
+        end_utc = local_to_utc(tz_name, report_date.date(), end_minute)
+        return int((submitted_at - end_utc).total_seconds() // 60)
+
+    async def plan_for(self, session: AsyncSession, users: Sequence[User], today: date) -> Dict[int, ReminderPlan]:
+        """Планы для группы сотрудников по истории за reminder_policy_days дней (один запрос)"""
+        since = datetime.combine(today - timedelta(days=settings.reminder_policy_days), datetime.min.time())
+        history = await DailyReportRepository.get_submission_history(
+            session, [user.telegram_id for user in users], since
+        )
+        plans: Dict[int, ReminderPlan] = {}
+        for user in users:
+            records: List[Tuple[datetime, datetime, int]] = [
+                record for record in history.get(user.telegram_id, []) if record[0].date() < today
+            ]
+            delays = [
+                self.submission_delay(report_date, submitted_at, user.work_end_minute, user.timezone)
+                for report_date, submitted_at, _ in records
+            ]
+            plans[user.telegram_id] = self.plan(delays, [count for _, _, count in records])
+        return plans
+
+
+def create_reminder_policy() -> Optional[ReminderPolicy]:
+    """Политика из настроек; None — фиксированный интервал для всех (REMINDER_POLICY=fixed)"""
+    if settings.reminder_policy != "adaptive":
+        return None
+    return ReminderPolicy(
+        interval_minutes=settings.reminder_interval_minutes,
+        min_samples=settings.reminder_policy_min_samples,
+        lead_minutes=settings.reminder_policy_lead_minutes,
+        max_reminders=settings.reminder_policy_max_reminders,
+        min_interval_minutes=settings.reminder_policy_min_interval_minutes,
+    )
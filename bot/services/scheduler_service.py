@@ -1,9 +1,11 @@
 """
 Планировщик задач - ИСПРАВЛЕННАЯ ВЕРСИЯ
 """
-from datetime import datetime, timedelta, date
+import asyncio
+from datetime import datetime, timedelta, date, time
+import functools
 import pytz
-from typing import List, Dict
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
 from loguru import logger
 from aiogram import Bot
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
@@ -11,19 +13,69 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 
 from config.settings import settings
-from bot.database import db_manager, UserRepository, DailyReportRepository
-from bot.utils import get_text
-from bot.keyboards import get_report_type_keyboard
+from bot.database import (
+    db_manager,
+    UserRepository,
+    DailyReportRepository,
+    DailyStatsRepository,
+    ReminderScheduleRepository,
+    JobLedgerRepository,
+    OutboxRepository,
+    ReminderEventRepository,
+)
+from bot.utils import (
+    REMINDER_CUTOFF_HOUR,
+    get_text,
+    format_minute,
+    local_now,
+    local_to_utc,
+    utcnow,
+    split_html,
+)
 from bot.services.deepseek_service import deepseek_service
 from bot.services.document_service import document_service
+from bot.services.summary_service import summary_service
+from bot.services.broadcast_service import (
+    Broadcaster,
+    BroadcastItem,
+    DeliveryResult,
+    item_chat_id,
+    log_broadcast_results,
+)
+from bot.services.calendar_service import WorkCalendar, work_calendar
+from bot.services.outbox_service import OutboxService, outbox_service
+from bot.services.reminder_policy import ReminderPolicy, create_reminder_policy
+from bot.services.leader_service import LeaderElector, create_leader_elector, make_replica_id
+from bot.services.shard_service import ShardCoordinator, create_shard_coordinator
+from aiogram.methods import SendMessage, SendDocument
 from aiogram.types import BufferedInputFile
 
+# Сколько отключённых пользователей перечислять в сообщении админам
+DEACTIVATED_LIST_LIMIT = 50
+
+# Задача уведомлений корзины конца рабочего дня (минута суток UTC)
+NOTIFICATION_JOB_ID = "notification_b{bucket}"
+
 
 class SchedulerService:
     """Сервис для планирования периодических задач"""
 
-    def __init__(self, bot: Bot):
+    def __init__(
+        self,
+        bot: Bot,
+        leader: Optional[LeaderElector] = None,
+        shards: Optional[ShardCoordinator] = None,
+        calendar: Optional[WorkCalendar] = None,
+        outbox: Optional[OutboxService] = None,
+        policy: Optional[ReminderPolicy] = None,
+    ):
         self.bot = bot
+        self.replica_id = make_replica_id()
+        self.leader = leader or create_leader_elector(self.replica_id)
+        self.shards = shards or create_shard_coordinator(self.replica_id)
+        self.calendar = calendar or work_calendar
+        self.outbox = outbox or outbox_service
+        self.policy = policy or create_reminder_policy()
         self.timezone = pytz.timezone(settings.timezone)
         self.scheduler = AsyncIOScheduler(
             timezone=self.timezone,
@@ -33,59 +85,293 @@ class SchedulerService:
                 "max_instances": 1,
             },
         )
-        # ✅ ДОБАВЛЕНО: Храним последнее время отправки напоминания каждому пользователю
-        self.last_reminder_time: Dict[int, datetime] = {}
+        self.broadcaster = Broadcaster(bot)
+        self._bucket_jobs: Dict[int, str] = {}
+        self._bucket_timezones: Dict[int, Set[str]] = {}
+        self._buckets_refreshed_day: Optional[date] = None
+        self.shards.on_rebalance = self._catch_up_after_rebalance
 
-    def start(self):
+    async def start(self):
         """Запустить планировщик"""
         now_baku = datetime.now(self.timezone).strftime("%Y-%m-%d %H:%M:%S %Z")
         logger.info(f"APScheduler starting, current Baku time: {now_baku}")
 
+        # Первая попытка взять лидерство до старта задач, дальше — heartbeat в фоне
+        await self.leader.heartbeat()
+        self.leader.start()
+        await self.shards.heartbeat()
+        self.shards.start()
+        if self.outbox.events is not None:
+            self.outbox.events.start()
+        await self.calendar.refresh()
+
+        self._schedule_calendar_refresh()
         self._schedule_daily_notifications()
+        await self._sync_notification_buckets()
         self._schedule_hourly_reminders()
+        self._schedule_outbox_drain()
         self._schedule_daily_admin_report()
         self._schedule_weekly_report()
+        self._schedule_housekeeping()
 
         self.scheduler.start()
+        self._catch_up_missed_jobs()
         logger.info("Планировщик успешно запущен")
 
-    def shutdown(self):
+    async def shutdown(self):
         self.scheduler.shutdown()
+        await self.leader.stop()
+        await self.shards.stop()
+        if self.outbox.events is not None:
+            await self.outbox.events.stop()
         logger.info("Планировщик остановлен")
 
-    def _schedule_daily_notifications(self):
-        """Ежедневные уведомления в конце рабочего дня"""
-        h1, m1 = map(int, settings.notification_time_1.split(':'))
-        h2, m2 = map(int, settings.notification_time_2.split(':'))
+    def _catch_up_missed_jobs(self, job_ids: Optional[Iterable[str]] = None):
+        """
+        Догонка: cron-задачи (все или job_ids), время которых прошло не более
+        scheduler_catch_up_hours назад (бот был выключен), запускаются сразу.
+        Журнал запусков делает повтор уже выполненной задачи пустым.
+        """
+        now = pytz.utc.localize(utcnow()).astimezone(self.timezone)
+        window = timedelta(hours=settings.scheduler_catch_up_hours)
+        only = set(job_ids) if job_ids is not None else None
+        for job in self.scheduler.get_jobs():
+            if only is not None and job.id not in only:
+                continue
+            if not isinstance(job.trigger, CronTrigger):
+                continue
+            # Последний запуск по расписанию внутри окна
+            fire_time = None
+            candidate = job.trigger.get_next_fire_time(None, now - window)
+            while candidate is not None and candidate <= now:
+                fire_time = candidate
+                candidate = job.trigger.get_next_fire_time(candidate, candidate + timedelta(seconds=1))
+            if fire_time is None:
+                continue
+            self.scheduler.add_job(
+                job.func,
+                args=job.args,
+                kwargs={**job.kwargs, "run_date": fire_time.date()},
+                id=f"{job.id}_catch_up",
+                replace_existing=True,
+            )
+            logger.info(f"[catch-up] {job.id}: пропущен запуск {fire_time:%Y-%m-%d %H:%M}, запускаю сейчас")
+
+    def _catch_up_after_rebalance(self, shard: Tuple[int, int]):
+        """
+        Шарды пересчитаны (реплика выбыла или вошла): задачи корзин, чьё время уже прошло,
+        догоняются для нового шарда — иначе пользователи выбывшей реплики остались бы
+        без уведомления. Уже получивших отсеивает ключ дедупликации outbox.
+        """
+        if not self._bucket_jobs:
+            return
+        logger.info(f"[shard] новый шард {shard[0]}/{shard[1]} — догонка уведомлений корзин")
+        self._catch_up_missed_jobs(self._bucket_jobs.values())
+
+    def _run_key(self, job_id: str, per_user: bool = False) -> str:
+        """Ключ запуска в журнале: у задач по пользователям — с учётом шарда"""
+        shard = self.shards.shard if per_user else None
+        return f"{job_id}@{shard[0]}/{shard[1]}" if shard else job_id
+
+    async def _begin_run(self, session, job_key: str, run_date: date) -> bool:
+        """Отметить начало запуска; False — задача за этот день уже выполнена"""
+        if await JobLedgerRepository.start_run(session, job_key, run_date):
+            return True
+        logger.info(f"[ledger] {job_key} за {run_date} уже выполнена — пропуск")
+        return False
+
+    async def _deliver_once(
+        self,
+        session,
+        job_id: str,
+        run_date: date,
+        items: Sequence[BroadcastItem],
+    ) -> List[DeliveryResult]:
+        """
+        Рассылка через журнал доставок: уже получившие пропускаются,
+        доставки фиксируются пачками — после сбоя повтор продолжит с места остановки.
+        """
+        delivered = await JobLedgerRepository.delivered_ids(session, job_id, run_date)
+        pending = [item for item in items if item_chat_id(item) not in delivered]
+        if len(pending) < len(items):
+            logger.info(f"[ledger] {job_id} за {run_date}: {len(items) - len(pending)} уже получили — пропуск")
+
+        results: List[DeliveryResult] = []
+        chunk = settings.broadcast_ledger_chunk
+        for i in range(0, len(pending), chunk):
+            part = await self.broadcaster.broadcast(pending[i:i + chunk])
+            await JobLedgerRepository.record_deliveries(
+                session, job_id, run_date, [r.chat_id for r in part if r.ok]
+            )
+            results.extend(part)
+        log_broadcast_results(job_id, results)
+        return results
+
+    async def _deliver(
+        self,
+        session,
+        job_id: str,
+        run_date: date,
+        items: Sequence[BroadcastItem],
+        record: bool = True,
+    ) -> List[DeliveryResult]:
+        """Рассылка задачи: плановая — через журнал доставок, ручная (record=False) — мимо него"""
+        if record:
+            return await self._deliver_once(session, job_id, run_date, items)
+        results = await self.broadcaster.broadcast(items)
+        log_broadcast_results(f"{job_id} (вручную)", results)
+        return results
+
+    async def _finish_run(self, session, job_key: str, run_date: date, results: List[DeliveryResult]):
+        """Закрыть запуск, если не осталось временных ошибок; иначе повтор дошлёт оставшимся"""
+        if all(r.ok or r.permanent for r in results):
+            await JobLedgerRepository.finish_run(session, job_key, run_date)
+
+    async def _deactivate_unreachable(self, session, results: List[DeliveryResult]):
+        """Отключить получателей с постоянной ошибкой доставки и сообщить админам"""
+        unreachable = [r.chat_id for r in results if r.permanent]
+        if not unreachable:
+            return
+        users = await UserRepository.deactivate_unreachable(session, unreachable)
+        if not users:
+            return
+
+        lines = [f"• {u.first_name} {u.last_name} ({u.telegram_id})" for u in users[:DEACTIVATED_LIST_LIMIT]]
+        if len(users) > DEACTIVATED_LIST_LIMIT:
+            lines.append(f"… и ещё {len(users) - DEACTIVATED_LIST_LIMIT}")
+        text = (
+            f"🚫 Отключены пользователи, заблокировавшие бота: {len(users)}\n\n"
+            + "\n".join(lines)
+            + "\n\nНапоминания им больше не отправляются; при новом сообщении боту пользователь снова станет активным."
+        )
+        results = await self.broadcaster.broadcast(
+            SendMessage(chat_id=admin_id, text=text) for admin_id in settings.admin_ids_list
+        )
+        log_broadcast_results("deactivated", results)
+
+    def _leader_only(self, job):
+        """Обёртка задачи: выполняется только на реплике-лидере"""
+        @functools.wraps(job)
+        async def run(*args, **kwargs):
+            if not self.leader.is_leader:
+                logger.debug(f"[leader] не лидер — пропуск {job.__name__}")
+                return
+            return await job(*args, **kwargs)
+        return run
+
+    def _per_user(self, job):
+        """
+        Обёртка задачи по пользователям: при шардировании выполняется на каждой
+        реплике для её шарда, иначе — только на лидере
+        """
+        if not self.shards.enabled:
+            return self._leader_only(job)
+
+        @functools.wraps(job)
+        async def run(*args, **kwargs):
+            if self.shards.shard is None:
+                logger.debug(f"[shard] шард не назначен — пропуск {job.__name__}")
+                return
+            return await job(*args, **kwargs)
+        return run
 
+    def _schedule_calendar_refresh(self):
+        """Периодически перечитывать праздники и исключения (их меняют админы, в т.ч. на других репликах)"""
         self.scheduler.add_job(
-            self._send_daily_notifications,
-            CronTrigger(hour=h1, minute=m1, timezone=self.timezone),
-            args=["9:00-18:00"],
-            id='notification_9_18'
+            self.calendar.refresh,
+            IntervalTrigger(seconds=settings.calendar_refresh_seconds, timezone=self.timezone),
+            id='calendar_refresh'
         )
 
+    def _has_work_at(self, at: datetime, timezones) -> bool:
+        """
+        Есть ли работа в местные даты момента at (naive UTC) в данных поясах.
+        Пояса неизвестны — проверяем все возможные местные даты (±1 день).
+        """
+        if timezones:
+            days = {local_now(tz_name, at).date() for tz_name in timezones}
+        else:
+            days = {at.date() + timedelta(days=shift) for shift in (-1, 0, 1)}
+        return any(self.calendar.has_work(day) for day in days)
+
+    def _schedule_daily_notifications(self):
+        """
+        Уведомления в конце рабочего дня: по одной cron-задаче на корзину
+        (минута суток UTC), состав корзин периодически сверяется с БД
+        """
         self.scheduler.add_job(
-            self._send_daily_notifications,
-            CronTrigger(hour=h2, minute=m2, timezone=self.timezone),
-            args=["10:00-19:00"],
-            id='notification_10_19'
+            self._sync_notification_buckets,
+            IntervalTrigger(seconds=settings.notification_bucket_sync_seconds, timezone=self.timezone),
+            id='notification_buckets_sync'
+        )
+        logger.info(
+            f"Уведомления по корзинам конца рабочего дня "
+            f"(сверка каждые {settings.notification_bucket_sync_seconds} с)"
         )
-        logger.info(f"Ежедневные уведомления запланированы на {settings.notification_time_1} и {settings.notification_time_2} (Baku)")
+
+    async def _sync_notification_buckets(self):
+        """
+        Завести задачи для новых корзин и снять задачи опустевших.
+        Раз в сутки корзины пересчитываются (переход на летнее время).
+        Выполняется на каждой реплике: задачи по пользователям есть у всех.
+        """
+        try:
+            async with db_manager.session() as session:
+                today = utcnow().date()
+                if self._buckets_refreshed_day != today:
+                    changed = await UserRepository.refresh_end_buckets(session, today)
+                    if changed:
+                        logger.info(f"[buckets] пересчитано корзин: {changed}")
+                    self._buckets_refreshed_day = today
+                self._bucket_timezones = await UserRepository.get_end_buckets(session)
+        except Exception as e:
+            logger.error(f"Ошибка сверки корзин уведомлений: {e}")
+            return
+
+        buckets = set(self._bucket_timezones)
+
+        for bucket in sorted(buckets - self._bucket_jobs.keys()):
+            job_id = NOTIFICATION_JOB_ID.format(bucket=bucket)
+            self.scheduler.add_job(
+                self._per_user(self._send_daily_notifications),
+                CronTrigger(hour=bucket // 60, minute=bucket % 60, timezone=pytz.utc),
+                args=[bucket],
+                id=job_id,
+                replace_existing=True,
+            )
+            self._bucket_jobs[bucket] = job_id
+            logger.info(f"[buckets] уведомления в {format_minute(bucket)} UTC ({job_id})")
+        for bucket in sorted(self._bucket_jobs.keys() - buckets):
+            job_id = self._bucket_jobs.pop(bucket)
+            if self.scheduler.get_job(job_id):
+                self.scheduler.remove_job(job_id)
+            logger.info(f"[buckets] корзина {format_minute(bucket)} UTC опустела, задача снята")
 
     def _schedule_hourly_reminders(self):
-        """Ежечасные напоминания (интервал)"""
+        """Напоминания: частый тик по индексу reminder_schedule, каждому — раз в интервал"""
         self.scheduler.add_job(
-            self._send_hourly_reminders,
-            IntervalTrigger(minutes=settings.reminder_interval_minutes, timezone=self.timezone),
+            self._per_user(self._send_hourly_reminders),
+            IntervalTrigger(seconds=settings.reminder_tick_seconds, timezone=self.timezone),
             id='hourly_reminders'
         )
-        logger.info(f"Ежечасные напоминания каждые {settings.reminder_interval_minutes} мин.")
+        logger.info(
+            f"Напоминания каждые {settings.reminder_interval_minutes} мин. "
+            f"(проверка очереди каждые {settings.reminder_tick_seconds} с)"
+        )
+
+    def _schedule_outbox_drain(self):
+        """Доставка сообщений из outbox (уведомления и напоминания)"""
+        self.scheduler.add_job(
+            self._per_user(self._drain_outbox),
+            IntervalTrigger(seconds=settings.outbox_drain_seconds, timezone=self.timezone),
+            id='outbox_drain'
+        )
+        logger.info(f"Outbox: доставка каждые {settings.outbox_drain_seconds} с")
 
     def _schedule_daily_admin_report(self):
         """Ежедневный отчёт админу в 23:59"""
         self.scheduler.add_job(
-            self._send_daily_admin_report,
+            self._leader_only(self._send_daily_admin_report),
             CronTrigger(hour=23, minute=59, timezone=self.timezone),
             id='daily_admin_report'
         )
@@ -95,209 +381,271 @@ class SchedulerService:
         """Недельный отчёт (пятница, 00:00 по Баку)"""
         hh, mm = map(int, settings.weekly_report_time.split(':'))
         self.scheduler.add_job(
-            self._send_weekly_report,
+            self._leader_only(self._send_weekly_report),
             CronTrigger(day_of_week=settings.weekly_report_day, hour=hh, minute=mm, timezone=self.timezone),
             id='weekly_report'
         )
         logger.info(f"Недельный отчёт запланирован на день недели={settings.weekly_report_day} {settings.weekly_report_time} (Baku).")
 
+    def _schedule_housekeeping(self):
+        """Обслуживание раз в сутки на лидере — и в выходные, и в праздники"""
+        hh, mm = map(int, settings.housekeeping_time.split(':'))
+        self.scheduler.add_job(
+            self._leader_only(self._housekeeping),
+            CronTrigger(hour=hh, minute=mm, timezone=pytz.utc),
+            id='housekeeping'
+        )
+        logger.info(f"Обслуживание (итоги дней, очистка журналов) запланировано на {settings.housekeeping_time} UTC.")
+
     # ---------- задачи ----------
 
-    async def _send_daily_notifications(self, work_time: str):
-        """Пинг в конце рабочего дня: попросить отчёт"""
+    async def _send_daily_notifications(self, bucket: int, run_date: Optional[date] = None, record: bool = True):
+        """
+        Пинг в конце рабочего дня сотрудникам корзины: попросить отчёт.
+        record=False — ручной запуск (/debug_notify): только сами сообщения, мимо журнала
+        запусков и очереди напоминаний, чтобы плановый запуск за день не пропустился.
+        """
+        job_id = NOTIFICATION_JOB_ID.format(bucket=bucket)
+        run_day = run_date or utcnow().date()
+        fire_at = datetime.combine(run_day, time(bucket // 60, bucket % 60))
+        # Выходной для всех в поясах корзины — не трогаем ни БД, ни Bot API
+        if not self._has_work_at(fire_at, self._bucket_timezones.get(bucket)):
+            logger.debug(f"[calendar] {run_day} нерабочий — пропуск {job_id}")
+            return
         try:
-            async for session in db_manager.get_session():
-                users = await UserRepository.get_users_by_work_time(session, work_time)
-                today = date.today()
+            async with db_manager.session() as session:
+                run_key = self._run_key(job_id, per_user=True)
+                if record and not await self._begin_run(session, run_key, run_day):
+                    return
 
-                for user in users:
-                    if user.is_admin:
+                now = utcnow()
+                users = []
+                # В одной корзине бывают разные пояса, а значит и разные местные даты
+                for tz_name in await UserRepository.get_bucket_timezones(session, bucket):
+                    report_day = local_now(tz_name, fire_at).date()
+                    if not self.calendar.has_work(report_day):
                         continue
-                    # уже есть отчёт за сегодня?
-                    existing = await DailyReportRepository.get_by_date(session, user.telegram_id, today)
-                    if existing:
-                        logger.info(f"[notify] {user.telegram_id} уже отправил отчёт сегодня — пропуск")
+                    # Один запрос: активные сотрудники корзины и пояса без отчёта за их день
+                    group = await UserRepository.get_pending_reporters(
+                        session,
+                        report_day,
+                        end_bucket=bucket,
+                        timezone=tz_name,
+                        shard=self.shards.shard,
+                        working_day=self.calendar.is_working_day(report_day),
+                    )
+                    users.extend((user, report_day) for user in group)
+                    if not record:
                         continue
-
-                    try:
-                        await self.bot.send_message(
-                            chat_id=user.telegram_id,
-                            text=get_text("report_request", user.language),
-                            reply_markup=get_report_type_keyboard(user.language)
+                    # Ставим не сдавших отчёт в очередь напоминаний (время и число — по политике)
+                    plans = await self.policy.plan_for(session, group, report_day) if self.policy else {}
+                    entries = []
+                    for user in group:
+                        plan = plans.get(user.telegram_id)
+                        delay = plan.first_delay_minutes if plan else settings.reminder_interval_minutes
+                        entries.append(
+                            (user.telegram_id, now + timedelta(minutes=delay), plan.max_reminders if plan else None)
+                        )
+                    await ReminderScheduleRepository.seed(
+                        session,
+                        entries,
+                        report_day,
+                        local_to_utc(tz_name, report_day, REMINDER_CUTOFF_HOUR * 60),
+                        spread_seconds=self._reminder_spread_seconds(),
+                    )
+
+                # Доставляет обработчик outbox; повторная постановка (догонка) не дублирует.
+                # Ручной запуск — со своими ключами и без дня отчёта (не попадает в журнал напоминаний)
+                key_prefix = f"{job_id}:{run_day}" if record else f"debug:{job_id}:{now:%Y%m%d%H%M%S}"
+                await self.outbox.enqueue(
+                    session,
+                    job_id,
+                    [
+                        self.outbox.message(
+                            f"{key_prefix}:{user.telegram_id}",
+                            user.telegram_id,
+                            "report_request",
+                            user.language,
+                            keyboard="report_type",
+                            report_day=report_day if record else None,
                         )
-                        logger.info(f"[notify] отправлено уведомление пользователю {user.telegram_id} ({work_time})")
-                    except Exception as tg_err:
-                        logger.error(f"[notify] ошибка Telegram для {user.telegram_id}: {tg_err}")
+                        for user, report_day in users
+                    ],
+                )
+                if record:
+                    await JobLedgerRepository.finish_run(session, run_key, run_day)
 
         except Exception as e:
             logger.error(f"Ошибка в задаче уведомлений: {e}")
 
+    def _reminder_spread_seconds(self) -> int:
+        """Окно, на которое растягивается волна напоминаний (не больше интервала)"""
+        return max(0, min(settings.reminder_spread_seconds, settings.reminder_interval_minutes * 60))
+
+    def _reminder_slot_delay(self) -> float:
+        """
+        Слот шарда внутри тика: реплика i из n начинает тик через i/n тика,
+        чтобы реплики не обращались к БД и Bot API одновременно
+        """
+        shard = self.shards.shard
+        if not self._reminder_spread_seconds() or shard is None:
+            return 0.0
+        index, count = shard
+        return settings.reminder_tick_seconds * index / count
+
     async def _send_hourly_reminders(self):
         """
-        ✅ ИСПРАВЛЕНО: Ежечасные напоминания с проверкой времени и частоты
-        - Отправляются только после конца рабочего дня и до 23:00
-        - Не чаще 1 раза в час одному пользователю
-        - Не отправляются админам
+        Напоминания не сдавшим отчёт:
+        - берём из reminder_schedule только тех, у кого наступило next_reminder_at
+        - следующее напоминание через reminder_interval_minutes, не позже 23:00 по местному времени
+        - очередь хранится в БД, поэтому перезапуск не даёт повторных напоминаний
+        - при reminder_spread_seconds волна растянута смещениями пользователей,
+          а тик каждой реплики сдвинут на слот её шарда
         """
         try:
-            now_baku = datetime.now(self.timezone)
-            current_hour = now_baku.hour
-            
-            # ✅ ИСПРАВЛЕНО: Проверка верхней границы - не отправлять после 23:00
-            if current_hour >= 23:
-                logger.debug(f"[reminder] Время {current_hour}:00 - слишком поздно, пропуск")
+            delay = self._reminder_slot_delay()
+            if delay:
+                await asyncio.sleep(delay)
+            now = utcnow()
+            if not self._has_work_at(now, set().union(*self._bucket_timezones.values())):
                 return
-            
-            async for session in db_manager.get_session():
-                users = await UserRepository.get_all_active(session)
-                today = date.today()
-                
-                for user in users:
-                    # ✅ Не отправлять админам
-                    if user.is_admin:
-                        continue
-                    
-                    # Проверка, есть ли уже отчет
-                    existing_report = await DailyReportRepository.get_by_date(session, user.telegram_id, today)
-                    if existing_report:
-                        logger.debug(f"[reminder] {user.telegram_id} уже отправил отчет, пропуск")
-                        continue
-                    
-                    # ✅ Проверка времени: напоминания только после конца рабочего дня
-                    end_hour = 18 if user.work_time == "9:00-18:00" else 19
-                    if current_hour < end_hour:
-                        logger.debug(
-                            f"[reminder] {user.telegram_id} рабочий день не закончен "
-                            f"(current={current_hour}, end={end_hour}), пропуск"
-                        )
-                        continue
-                    
-                    # ✅ ИСПРАВЛЕНО: Проверка частоты - не чаще раза в час
-                    last_reminder = self.last_reminder_time.get(user.telegram_id)
-                    if last_reminder:
-                        time_since_last = (now_baku - last_reminder).total_seconds()
-                        if time_since_last < 3600:  # Меньше часа
-                            logger.debug(
-                                f"[reminder] {user.telegram_id} недавно получил напоминание "
-                                f"({time_since_last/60:.1f} мин назад), пропуск"
-                            )
-                            continue
-                    
-                    # Отправляем напоминание
-                    try:
-                        await self.bot.send_message(
-                            chat_id=user.telegram_id,
-                            text=get_text("reminder", user.language),
-                            reply_markup=get_report_type_keyboard(user.language)
-                        )
-                        
-                        # ✅ Обновляем время последнего напоминания
-                        self.last_reminder_time[user.telegram_id] = now_baku
-                        
-                        logger.info(
-                            f"[reminder] отправлено {user.telegram_id} "
-                            f"(time={current_hour}:00, work_end={end_hour}:00)"
+            async with db_manager.session() as session:
+                users = await ReminderScheduleRepository.claim_due(
+                    session,
+                    now,
+                    now + timedelta(minutes=settings.reminder_interval_minutes),
+                    shard=self.shards.shard,
+                )
+                if not users:
+                    return
+                if self.policy:
+                    # Ближе к отсечке — чаще: паузу до следующего напоминания задаёт политика
+                    sooner = []
+                    for user, report_day, stop_at in users:
+                        delay = self.policy.next_delay_minutes(now, stop_at)
+                        if delay < self.policy.interval_minutes:
+                            sooner.append((user.telegram_id, report_day, now + timedelta(minutes=delay)))
+                    await ReminderScheduleRepository.reschedule(session, sooner)
+
+                await self.outbox.enqueue(
+                    session,
+                    "reminder",
+                    [
+                        self.outbox.message(
+                            f"reminder:{now:%Y%m%d%H%M%S}:{user.telegram_id}",
+                            user.telegram_id,
+                            "reminder",
+                            user.language,
+                            keyboard="report_type",
+                            report_day=report_day,
                         )
-                    except Exception as tg_err:
-                        logger.error(f"[reminder] ошибка Telegram для {user.telegram_id}: {tg_err}")
+                        for user, report_day, _ in users
+                    ],
+                )
 
         except Exception as e:
             logger.error(f"Ошибка в задаче ежечасных напоминаний: {e}")
 
-    async def _send_daily_admin_report(self):
-        """Ежедневная сводка админу"""
+    async def _housekeeping(self, run_date: Optional[date] = None):
+        """
+        Закрыть итоги закончившихся дней и очистить очередь напоминаний, журналы и outbox.
+        Местные даты отстают от UTC не больше чем на сутки: дни раньше вчерашнего (UTC)
+        закончились у всех — их итоги закрываются до очистки очереди напоминаний.
+        """
+        job_id = "housekeeping"
+        today = run_date or utcnow().date()
         try:
-            async for session in db_manager.get_session():
-                today = date.today()
-                start = datetime.combine(today, datetime.min.time())
-                end = datetime.combine(today, datetime.max.time())
-
-                users = await UserRepository.get_all_active(session)
-                reports = await DailyReportRepository.get_reports_by_date_range(session, start, end)
-
-                total = len(users)
-                submitted = len(reports)
-                no_tasks = sum(1 for r in reports if not r.has_tasks)
-                not_submitted = total - submitted
-
-                details = "👥 Подробности / Təfərrüatlar:\n\n"
-                # с задачами
-                details += "✅ С задачами / Tapşırıqlarla:\n"
-                for r in reports:
-                    if r.has_tasks:
-                        u = next((x for x in users if x.telegram_id == r.telegram_id), None)
-                        if u:
-                            details += f"  • {u.first_name} {u.last_name}\n"
-                # без задач
-                if no_tasks:
-                    details += "\n🚫 Без задач / Tapşırıqsız:\n"
-                    for r in reports:
-                        if not r.has_tasks:
-                            u = next((x for x in users if x.telegram_id == r.telegram_id), None)
-                            if u:
-                                details += f"  • {u.first_name} {u.last_name}\n"
-                # не отправили
-                if not_submitted:
-                    details += "\n❌ Не отправили / Göndərmədi:\n"
-                    submitted_ids = {r.telegram_id for r in reports}
-                    for u in users:
-                        if u.telegram_id not in submitted_ids:
-                            details += f"  • {u.first_name} {u.last_name}\n"
-
-                for admin_id in settings.admin_ids_list:
-                    try:
-                        await self.bot.send_message(
-                            chat_id=admin_id,
-                            text=get_text(
-                                "daily_report_summary",
-                                "ru",
-                                date=today.strftime("%d.%m.%Y"),
-                                total=total,
-                                submitted=submitted,
-                                not_submitted=not_submitted,
-                                no_tasks=no_tasks,
-                                details=details
-                            )
-                        )
-                        logger.info(f"[admin daily] отправлено админу {admin_id}")
-                    except Exception as tg_err:
-                        logger.error(f"[admin daily] ошибка Telegram для {admin_id}: {tg_err}")
+            async with db_manager.session() as session:
+                if not await self._begin_run(session, job_id, today):
+                    return
+                sealed = await DailyStatsRepository.seal_before(session, today - timedelta(days=1))
+                if sealed:
+                    logger.info(f"[stats] закрыты итоги дней: {', '.join(f'{day:%d.%m}' for day in sealed)}")
+                await ReminderScheduleRepository.purge_before(session, today - timedelta(days=1))
+                await JobLedgerRepository.purge_before(
+                    session, today - timedelta(days=settings.job_ledger_retention_days)
+                )
+                await OutboxRepository.purge_before(
+                    session,
+                    datetime.combine(today, time()) - timedelta(days=settings.job_ledger_retention_days),
+                )
+                await ReminderEventRepository.purge_before(
+                    session, today - timedelta(days=settings.reminder_log_retention_days)
+                )
+                await JobLedgerRepository.finish_run(session, job_id, today)
+        except Exception as e:
+            logger.error(f"Ошибка ежедневного обслуживания: {e}")
+
+    async def _drain_outbox(self):
+        """Доставить сообщения outbox; заблокировавших бота — отключить"""
+        try:
+            async with db_manager.session() as session:
+                results = await self.outbox.drain(session, self.broadcaster, shard=self.shards.shard)
+                await self._deactivate_unreachable(session, results)
+        except Exception as e:
+            logger.error(f"Ошибка доставки outbox: {e}")
+
+    async def _send_daily_admin_report(self, run_date: Optional[date] = None, record: bool = True):
+        """Ежедневная сводка админу; record=False — ручной запуск мимо журнала запусков"""
+        job_id = "daily_admin_report"
+        today = run_date or local_now(settings.timezone).date()
+        if not self.calendar.has_work(today):
+            logger.info(f"[calendar] {today} нерабочий — сводка не отправляется")
+            return
+        try:
+            async with db_manager.session() as session:
+                if record and not await self._begin_run(session, job_id, today):
+                    return
+                summary = await summary_service.daily(session, today)
+                # Большая команда не влезает в одно сообщение — части уходят подряд
+                parts = split_html(summary_service.render(summary, "ru"))
+                results = await self._deliver(
+                    session,
+                    job_id,
+                    today,
+                    [
+                        [SendMessage(chat_id=admin_id, text=part) for part in parts]
+                        for admin_id in settings.admin_ids_list
+                    ],
+                    record,
+                )
+                if record:
+                    await self._finish_run(session, job_id, today, results)
 
         except Exception as e:
             logger.error(f"Ошибка в задаче ежедневного отчёта админу: {e}")
 
-    async def _send_weekly_report(self):
-        """Недельный отчёт админу (AI + DOCX/PDF)"""
+    async def _send_weekly_report(self, run_date: Optional[date] = None, record: bool = True):
+        """Недельный отчёт админу (AI + DOCX/PDF); record=False — ручной запуск мимо журнала запусков"""
+        job_id = "weekly_report"
         try:
-            async for session in db_manager.get_session():
-                today = date.today()
+            async with db_manager.session() as session:
+                today = run_date or local_now(settings.timezone).date()
+                # Проверяем журнал до дорогой генерации отчёта
+                if record and not await self._begin_run(session, job_id, today):
+                    return
                 week_start = today - timedelta(days=today.weekday())
                 week_end = today
 
                 start_dt = datetime.combine(week_start, datetime.min.time())
                 end_dt = datetime.combine(week_end, datetime.max.time())
 
-                reports = await DailyReportRepository.get_reports_by_date_range(session, start_dt, end_dt)
-                if not reports:
+                text = await deepseek_service.generate_weekly_report(
+                    DailyReportRepository.stream_with_authors(session, start_dt, end_dt), language="ru"
+                )
+                if text is None:
                     logger.warning("[weekly] нет данных за неделю — пропуск")
                     return
-
-                users = await UserRepository.get_all_active(session)
-                user_map = {u.telegram_id: u for u in users}
-
-                data = []
-                for r in reports:
-                    u = user_map.get(r.telegram_id)
-                    if u:
-                        data.append({
-                            "date": r.report_date,
-                            "first_name": u.first_name,
-                            "last_name": u.last_name,
-                            "report_text": r.report_text,
-                            "has_tasks": r.has_tasks
-                        })
-
-                text = await deepseek_service.generate_weekly_report(data, language="ru")
+                week_stats, _ = await summary_service.period(session, "week", today)
+                stats_line = get_text(
+                    "weekly_stats",
+                    "ru",
+                    submitted=week_stats.submitted,
+                    expected=week_stats.expected,
+                    rate=week_stats.rate,
+                    no_tasks=week_stats.no_tasks,
+                    late=week_stats.late,
+                )
 
                 ws = week_start.strftime("%d.%m.%Y")
                 we = week_end.strftime("%d.%m.%Y")
@@ -305,24 +653,25 @@ class SchedulerService:
                 docx_io = document_service.generate_docx(text, ws, we)
                 pdf_io = document_service.generate_pdf(text, ws, we)
 
-                for admin_id in settings.admin_ids_list:
-                    try:
-                        await self.bot.send_message(chat_id=admin_id, text=f"📊 Еженедельный отчет за {ws} - {we}")
-
-                        docx_io.seek(0)
-                        await self.bot.send_document(
-                            chat_id=admin_id,
-                            document=BufferedInputFile(docx_io.read(), filename=f"weekly_report_{ws}_{we}.docx")
-                        )
-
-                        pdf_io.seek(0)
-                        await self.bot.send_document(
-                            chat_id=admin_id,
-                            document=BufferedInputFile(pdf_io.read(), filename=f"weekly_report_{ws}_{we}.pdf")
-                        )
-                        logger.info(f"[weekly] отправлено админу {admin_id}")
-                    except Exception as tg_err:
-                        logger.error(f"[weekly] ошибка Telegram для {admin_id}: {tg_err}")
+                docx_file = BufferedInputFile(docx_io.getvalue(), filename=f"weekly_report_{ws}_{we}.docx")
+                pdf_file = BufferedInputFile(pdf_io.getvalue(), filename=f"weekly_report_{ws}_{we}.pdf")
+
+                results = await self._deliver(
+                    session,
+                    job_id,
+                    today,
+                    [
+                        [
+                            SendMessage(chat_id=admin_id, text=f"📊 Еженедельный отчет за {ws} - {we}\n{stats_line}"),
+                            SendDocument(chat_id=admin_id, document=docx_file),
+                            SendDocument(chat_id=admin_id, document=pdf_file),
+                        ]
+                        for admin_id in settings.admin_ids_list
+                    ],
+                    record,
+                )
+                if record:
+                    await self._finish_run(session, job_id, today, results)
 
         except Exception as e:
             logger.error(f"Ошибка в задаче недельного отчёта: {e}")
\ No newline at end of file
@@ -0,0 +1,144 @@
+"""
+Распределение пользователей между репликами: реплика обслуживает тех,
+у кого telegram_id % число_реплик == её номер среди живых реплик
+"""
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from config.settings import settings
+from bot.database import db_manager, SchedulerMemberRepository
+
+
+class Membership(ABC):
+    """Реестр живых реплик (интерфейс)"""
+
+    @abstractmethod
+    async def heartbeat(self) -> List[str]:
+        """Отметиться живой и вернуть отсортированный список живых реплик"""
+
+    @abstractmethod
+    async def leave(self) -> None:
+        """Выйти из реестра"""
+
+
+class InProcessMembership(Membership):
+    """Реестр в памяти процесса — замена БД для тестов и симуляции"""
+
+    _members: Dict[str, float] = {}
+
+    def __init__(self, replica_id: str, ttl_seconds: float):
+        self.replica_id = replica_id
+        self.ttl_seconds = ttl_seconds
+
+    async def heartbeat(self) -> List[str]:
+        now = time.monotonic()
+        self._members[self.replica_id] = now
+        for replica_id, seen in list(self._members.items()):
+            if seen < now - self.ttl_seconds:
+                del self._members[replica_id]
+        return sorted(self._members)
+
+    async def leave(self) -> None:
+        self._members.pop(self.replica_id, None)
+
+
+class DatabaseMembership(Membership):
+    """Реестр в таблице scheduler_members (MySQL / SQLite)"""
+
+    def __init__(self, replica_id: str, ttl_seconds: int):
+        self.replica_id = replica_id
+        self.ttl_seconds = ttl_seconds
+
+    async def heartbeat(self) -> List[str]:
+        async with db_manager.session() as session:
+            return await SchedulerMemberRepository.heartbeat(session, self.replica_id, self.ttl_seconds)
+
+    async def leave(self) -> None:
+        async with db_manager.session() as session:
+            await SchedulerMemberRepository.leave(session, self.replica_id)
+
+
+class ShardCoordinator:
+    """
+    Следит за составом реплик и вычисляет свой шард (index, count).
+    При входе/выходе реплики шарды пересчитываются на следующем heartbeat,
+    о новом шарде сообщает on_rebalance (догонка пропущенных задач).
+    Без membership (шардирование выключено) shard = None — все пользователи.
+    """
+
+    def __init__(self, replica_id: str, membership: Optional[Membership], heartbeat_seconds: float):
+        self.replica_id = replica_id
+        self.membership = membership
+        self.heartbeat_seconds = heartbeat_seconds
+        self.shard: Optional[Tuple[int, int]] = None
+        self._task: Optional[asyncio.Task] = None
+        self.on_rebalance: Optional[Callable[[Tuple[int, int]], None]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.membership is not None
+
+    async def heartbeat(self) -> Optional[Tuple[int, int]]:
+        """Одна проверка состава реплик"""
+        if self.membership is None:
+            return None
+        try:
+            members = await self.membership.heartbeat()
+            shard = (members.index(self.replica_id), len(members)) if self.replica_id in members else None
+        except Exception as e:
+            logger.error(f"[shard] ошибка heartbeat: {e}")
+            shard = None
+        changed = shard != self.shard
+        if changed:
+            logger.info(f"[shard] шард реплики {self.replica_id}: {self.shard} -> {shard}")
+        self.shard = shard
+        if changed and shard is not None and self.on_rebalance is not None:
+            try:
+                self.on_rebalance(shard)
+            except Exception as e:
+                logger.error(f"[shard] ошибка обработки нового шарда: {e}")
+        return shard
+
+    async def _run(self):
+        while True:
+            await self.heartbeat()
+            await asyncio.sleep(self.heartbeat_seconds)
+
+    def start(self) -> None:
+        """Запустить heartbeat в фоне (нужен работающий event loop)"""
+        if self.membership is not None and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Остановить heartbeat и выйти из состава реплик"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.membership is not None:
+            try:
+                await self.membership.leave()
+            except Exception as e:
+                logger.error(f"[shard] ошибка выхода из состава: {e}")
+        self.shard = None
+
+
+def create_shard_coordinator(replica_id: str) -> ShardCoordinator:
+    """Шардирование по настройкам: SCHEDULER_SHARDING=off | db | memory"""
+    mode = settings.scheduler_sharding.lower()
+    ttl = settings.shard_member_ttl_seconds
+    if mode == "db":
+        membership: Optional[Membership] = DatabaseMembership(replica_id, ttl)
+    elif mode == "memory":
+        membership = InProcessMembership(replica_id, ttl)
+    else:
+        membership = None
+    logger.info(f"[shard] режим={mode}, реплика={replica_id}")
+    return ShardCoordinator(replica_id, membership, settings.shard_heartbeat_seconds)
@@ -0,0 +1,158 @@
+"""
+Сводки по отчётам: ежедневная (одна сборка для админ-панели и для рассылки планировщика)
+и за период — неделя, месяц, квартал.
+Ежедневная — один LEFT JOIN активных сотрудников с отчётами дня; за период — строки daily_stats.
+"""
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database import DailyReportRepository, DailyStat, DailyStatsRepository
+from bot.utils import get_text
+
+
+# Периоды статистики (/stats week|month|quarter)
+PERIODS = ("week", "month", "quarter")
+
+
+@dataclass
+class DailySummary:
+    """Активные сотрудники за день по группам (имя и фамилия)"""
+    day: date
+    with_tasks: List[str] = field(default_factory=list)
+    no_tasks: List[str] = field(default_factory=list)
+    not_submitted: List[str] = field(default_factory=list)
+
+    @property
+    def submitted(self) -> int:
+        return len(self.with_tasks) + len(self.no_tasks)
+
+    @property
+    def total(self) -> int:
+        return self.submitted + len(self.not_submitted)
+
+
+@dataclass
+class PeriodStats:
+    """Итоги за дни [since, until]; expected — сумма активных по дням (ожидалось отчётов)"""
+    since: date
+    until: date
+    expected: int = 0
+    submitted: int = 0
+    no_tasks: int = 0
+    late: int = 0
+    reminders_sent: int = 0
+
+    @property
+    def rate(self) -> float:
+        return self.submitted / self.expected if self.expected else 0.0
+
+    def add(self, stat: DailyStat) -> None:
+        self.until = max(self.until, stat.day)
+        self.expected += stat.total_active
+        self.submitted += stat.submitted
+        self.no_tasks += stat.no_tasks
+        self.late += stat.late
+        self.reminders_sent += stat.reminders_sent
+
+
+def period_start(period: str, today: date) -> date:
+    """Первый день текущей недели / месяца / квартала"""
+    if period == "week":
+        return today - timedelta(days=today.weekday())
+    if period == "month":
+        return today.replace(day=1)
+    return today.replace(month=(today.month - 1) // 3 * 3 + 1, day=1)
+
+
+class SummaryService:
+    """Сборка и текст сводок"""
+
+    @staticmethod
+    async def daily(session: AsyncSession, day: date) -> DailySummary:
+        summary = DailySummary(day)
+        buckets = {True: summary.with_tasks, False: summary.no_tasks, None: summary.not_submitted}
+        for first_name, last_name, has_tasks in await DailyReportRepository.get_day_status(session, day):
+            buckets[has_tasks].append(f"{first_name} {last_name}")
+        return summary
+
+    @staticmethod
+    def render(summary: DailySummary, language: str) -> str:
+        details = "👥 Подробности / Təfərrüatlar:\n\n"
+        details += "✅ С задачами / Tapşırıqlarla:\n"
+        details += "".join(f"  • {name}\n" for name in summary.with_tasks)
+        if summary.no_tasks:
+            details += "\n🚫 Без задач / Tapşırıqsız:\n"
+            details += "".join(f"  • {name}\n" for name in summary.no_tasks)
+        if summary.not_submitted:
+            details += "\n❌ Не отправили / Göndərmədi:\n"
+            details += "".join(f"  • {name}\n" for name in summary.not_submitted)
+
+        return get_text(
+            "daily_report_summary",
+            language,
+            date=summary.day.strftime("%d.%m.%Y"),
+            total=summary.total,
+            submitted=summary.submitted,
+            not_submitted=len(summary.not_submitted),
+            no_tasks=len(summary.no_tasks),
+            details=details,
+        )
+
+    @staticmethod
+    async def period(session: AsyncSession, period: str, today: date) -> Tuple[PeriodStats, List[PeriodStats]]:
+        """
+        Итоги периода с его начала по today и разбивка: неделя — по дням,
+        месяц — по неделям, квартал — по месяцам
+        """
+        since = period_start(period, today)
+        total = PeriodStats(since, today)
+        parts: Dict[date, PeriodStats] = {}
+        for stat in await DailyStatsRepository.get_range(session, since, today):
+            total.add(stat)
+            if period == "week":
+                key = stat.day
+            elif period == "month":
+                key = max(since, stat.day - timedelta(days=stat.day.weekday()))
+            else:
+                key = stat.day.replace(day=1)
+            parts.setdefault(key, PeriodStats(key, key)).add(stat)
+        return total, list(parts.values())
+
+    @staticmethod
+    def render_period(total: PeriodStats, parts: List[PeriodStats], language: str) -> str:
+        def span(stats: PeriodStats) -> str:
+            if stats.since == stats.until:
+                return f"{stats.since:%d.%m}"
+            return f"{stats.since:%d.%m}–{stats.until:%d.%m}"
+
+        lines = "\n".join(
+            get_text(
+                "period_stats_line",
+                language,
+                span=span(part),
+                submitted=part.submitted,
+                expected=part.expected,
+                rate=part.rate,
+                late=part.late,
+            )
+            for part in parts
+        ) or get_text("period_stats_empty", language)
+        return get_text(
+            "period_stats",
+            language,
+            since=f"{total.since:%d.%m.%Y}",
+            until=f"{total.until:%d.%m.%Y}",
+            expected=total.expected,
+            submitted=total.submitted,
+            rate=total.rate,
+            no_tasks=total.no_tasks,
+            late=total.late,
+            reminders=total.reminders_sent,
+            lines=lines,
+        )
+
+
+summary_service = SummaryService()
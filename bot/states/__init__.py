@@ -1,3 +1,3 @@
-from .states import RegistrationStates, ReportStates, EditProfileStates
+from .states import RegistrationStates, ReportStates, EditProfileStates, AdminStates
 
-__all__ = ['RegistrationStates', 'ReportStates', 'EditProfileStates']
\ No newline at end of file
+__all__ = ['RegistrationStates', 'ReportStates', 'EditProfileStates', 'AdminStates']
\ No newline at end of file
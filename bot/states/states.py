@@ -25,4 +25,9 @@ class EditProfileStates(StatesGroup):
     edit_first_name = State()  # Редактирование имени
     edit_last_name = State()  # Редактирование фамилии
     edit_work_time = State()  # Редактирование рабочего времени
-    edit_language = State()  # Редактирование языка
\ No newline at end of file
+    edit_language = State()  # Редактирование языка
+
+
+class AdminStates(StatesGroup):
+    """Состояния админ-панели"""
+    user_search = State()  # Ввод начала имени для поиска пользователей
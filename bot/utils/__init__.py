@@ -1,3 +1,43 @@
 from .texts import get_text, TEXTS
-from .formatters import format_answer
-__all__ = ['get_text', 'TEXTS','format_answer']
\ No newline at end of file
+from .formatters import MESSAGE_LIMIT, format_answer, split_html
+from .clock import Clock, FakeClock, utcnow, set_clock
+from .pages import PageCache, PagedText, page_cache, text_pages
+from .schedule import (
+    WORK_TIME_PRESETS,
+    DEFAULT_WORK_TIME,
+    REMINDER_CUTOFF_HOUR,
+    format_minute,
+    format_work_time,
+    parse_work_time,
+    is_valid_timezone,
+    local_now,
+    local_to_utc,
+    end_bucket_utc,
+    spread_offset,
+)
+__all__ = [
+    'get_text',
+    'TEXTS',
+    'MESSAGE_LIMIT',
+    'format_answer',
+    'split_html',
+    'Clock',
+    'FakeClock',
+    'utcnow',
+    'set_clock',
+    'PageCache',
+    'PagedText',
+    'page_cache',
+    'text_pages',
+    'WORK_TIME_PRESETS',
+    'DEFAULT_WORK_TIME',
+    'REMINDER_CUTOFF_HOUR',
+    'format_minute',
+    'format_work_time',
+    'parse_work_time',
+    'is_valid_timezone',
+    'local_now',
+    'local_to_utc',
+    'end_bucket_utc',
+    'spread_offset',
+]
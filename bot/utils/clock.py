@@ -0,0 +1,43 @@
+"""
+Источник текущего времени. В работе — системные часы, в симуляции
+подменяется на FakeClock, чтобы прогонять задачи планировщика по «виртуальному» времени.
+"""
+from datetime import datetime, timedelta
+
+
+class Clock:
+    """Системные часы: текущее время в naive UTC"""
+
+    def utcnow(self) -> datetime:
+        return datetime.utcnow()
+
+
+class FakeClock(Clock):
+    """Управляемые часы (naive UTC)"""
+
+    def __init__(self, start: datetime):
+        self.now = start
+
+    def utcnow(self) -> datetime:
+        return self.now
+
+    def set(self, moment: datetime) -> None:
+        self.now = moment
+
+    def advance(self, **delta) -> None:
+        """advance(minutes=5) — сдвинуть часы вперёд"""
+        self.now += timedelta(**delta)
+
+
+_clock: Clock = Clock()
+
+
+def utcnow() -> datetime:
+    """Текущее время (naive UTC) по активным часам"""
+    return _clock.utcnow()
+
+
+def set_clock(clock: Clock) -> None:
+    """Подменить часы (симуляция); set_clock(Clock()) — вернуть системные"""
+    global _clock
+    _clock = clock
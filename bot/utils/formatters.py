@@ -2,9 +2,19 @@
 Форматирование текста для Telegram
 """
 import re
+from typing import List
 from chatgpt_md_converter import telegram_format
 
 
+# Предел длины сообщения Telegram
+MESSAGE_LIMIT = 4096
+
+# Неделимые куски HTML: тег, сущность, перевод строки, пробелы, слово (длинное — частями)
+_ATOMS = re.compile(r"<[^>]*>|&#?\w+;|\n|[^\S\n]+|[^\s<&]{1,64}|.", re.DOTALL)
+_TAG = re.compile(r"<(/?)([a-zA-Z][\w-]*)")
+_MARKUP = re.compile(r"<[^>]*>")
+
+
 def format_answer(text: str) -> str:
     """
     Форматирует текст из DeepSeek для Telegram
@@ -13,4 +23,99 @@ def format_answer(text: str) -> str:
     formatted = telegram_format(text)
     # Удаляем \ только перед неопасными символами
     formatted = re.sub(r'\\([a-zA-Z0-9\s.,!?\'"«»()\-])', r'\1', formatted)
-    return formatted
\ No newline at end of file
+    return formatted
+
+
+def split_html(text: str, limit: int = MESSAGE_LIMIT) -> List[str]:
+    """
+    Разбивает HTML-текст на части не длиннее limit.
+    Режет по последнему переводу строки (если его нет — между словами), не внутри
+    тега или сущности; незакрытые теги закрываются в конце части и открываются в следующей.
+    Переоткрытые теги занимают не больше половины части: не поместившиеся теги (и тег,
+    не влезающий даже в пустую часть) пропускаются вместе с парным закрывающим — текст остаётся.
+    """
+    if len(text) <= limit:
+        return [text]
+
+    parts: List[str] = []
+    stack: List[list] = []                  # открытые теги: [имя, открывающий тег, виден в части]
+    atoms: List[str] = [""]                 # текущая часть; первый элемент — переоткрытые теги
+    size = 0
+    newline = None                          # последний перевод строки: (индекс, стек на нём)
+    piece = max(1, limit // 2)
+
+    def closing(tags: List[list]) -> str:
+        return "".join(f"</{name}>" for name, _, shown in reversed(tags) if shown)
+
+    def opening(tags: List[list]) -> str:
+        return "".join(tag for _, tag, shown in tags if shown)
+
+    def track(tags: List[list], atom: str) -> bool:
+        """Учесть тег в стеке; False — закрывающий тег пропущенного открывающего"""
+        match = _TAG.match(atom)
+        if match is None or atom.endswith("/>"):
+            return True
+        closing_tag, name = match.group(1), match.group(2).lower()
+        if not closing_tag:
+            tags.append([name, atom, True])
+            return True
+        for i in range(len(tags) - 1, -1, -1):
+            if tags[i][0] == name:
+                shown = tags[i][2]
+                del tags[i]
+                return shown
+        return True
+
+    def reopen(tags: List[list]) -> str:
+        """Теги для новой части: снаружи внутрь, пока занимают не больше половины части"""
+        budget = piece
+        for entry in tags:
+            cost = 2 * len(entry[1])
+            entry[2] = cost <= budget
+            if entry[2]:
+                budget -= cost
+        return opening(tags)
+
+    for found in _ATOMS.findall(text):
+        # Длинное слово — кусками, чтобы оно влезало в часть с переоткрытыми тегами
+        pieces = [found] if found[0] in "<&" else [found[i:i + piece] for i in range(0, len(found), piece)]
+        for atom in pieces:
+            while True:
+                after = [list(entry) for entry in stack]
+                shown = track(after, atom)
+                if not shown or size + len(atom) + len(closing(after)) <= limit:
+                    break
+                if len(atoms) == 1:
+                    if atoms[0]:
+                        # Переоткрытые теги не оставляют места — часть без них
+                        for entry in stack:
+                            entry[2] = False
+                        atoms, size = [""], 0
+                        continue
+                    # Тег не влезает даже в пустую часть — пропускаем (и его закрывающий)
+                    match = _TAG.match(atom)
+                    if match and not match.group(1) and not atom.endswith("/>"):
+                        after[-1][2] = False
+                    shown = False
+                    break
+                if newline is not None:
+                    index, tags = newline
+                    head, tail = atoms[:index], atoms[index + 1:]
+                    parts.append("".join(head) + closing(tags))
+                    atoms = [opening(tags)] + tail
+                else:
+                    parts.append("".join(atoms) + closing(stack))
+                    atoms = [reopen(stack)]
+                size = sum(map(len, atoms))
+                newline = None
+            stack = after
+            if not shown:
+                continue
+            if atom == "\n":
+                newline = (len(atoms), [list(entry) for entry in stack])
+            atoms.append(atom)
+            size += len(atom)
+
+    parts.append("".join(atoms))
+    # Части из одних тегов (разрез пришёлся сразу за открывающим) не отправляем
+    return [part.strip() for part in parts if _MARKUP.sub("", part).strip()]
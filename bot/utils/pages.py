@@ -0,0 +1,90 @@
+"""
+Кэш отрисованных страниц листаемых сообщений (текст и клавиатура): повторное
+листание не ходит в БД. Страница живёт page_cache_ttl_seconds — правки с других
+реплик и из других мест видны не позже этого срока; свои правки сбрасывают раздел.
+
+Длинные тексты (сводки, недельный отчёт) листаются в одном сообщении: в text_pages
+лежит исходник, на страницы он режется при первом показе. Кэш в памяти процесса —
+листание на другой реплике или после истечения срока отвечает «страница устарела».
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, List, Optional, Tuple
+
+from config.settings import settings
+from .formatters import MESSAGE_LIMIT, split_html
+
+
+class PageCache:
+    """LRU с TTL; ключ — кортеж, первый элемент которого — раздел ('users', ...)"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Tuple[float, Any]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[Hashable, ...]) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Tuple[Hashable, ...], value: Any) -> Any:
+        if self.max_size <= 0:
+            return value
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self, section: Hashable) -> None:
+        """Сбросить все страницы раздела"""
+        for key in [key for key in self._entries if key[0] == section]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+class PagedText:
+    """Длинный HTML-текст, листаемый страницами; номер страницы дописывается внизу"""
+
+    FOOTER = "\n\n📄 {number}/{total}"
+    # Запас под номер страницы
+    FOOTER_RESERVE = 16
+
+    def __init__(self, source: str, limit: int = MESSAGE_LIMIT):
+        self.source = source
+        self.limit = limit
+        self._pages: Optional[List[str]] = None
+
+    @property
+    def pages(self) -> List[str]:
+        if self._pages is None:
+            self._pages = split_html(self.source, self.limit - self.FOOTER_RESERVE)
+        return self._pages
+
+    def __len__(self) -> int:
+        return len(self.pages)
+
+    def page(self, number: int) -> str:
+        """Страница number (с нуля)"""
+        pages = self.pages
+        if len(pages) == 1:
+            return pages[0]
+        return pages[number] + self.FOOTER.format(number=number + 1, total=len(pages))
+
+
+page_cache = PageCache(settings.page_cache_size, settings.page_cache_ttl_seconds)
+text_pages = PageCache(settings.paged_text_cache_size, settings.paged_text_ttl_seconds)
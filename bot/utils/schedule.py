@@ -0,0 +1,95 @@
+"""
+Рабочие графики: минуты от полуночи, часовые пояса пользователей (IANA)
+и UTC-корзины конца рабочего дня
+"""
+import re
+from datetime import date, datetime, time, tzinfo
+from typing import Optional, Tuple
+
+import pytz
+
+from config.settings import settings
+from bot.utils.clock import utcnow
+
+
+# Готовые графики (кнопки регистрации и профиля): код -> (начало, конец) в минутах от полуночи
+WORK_TIME_PRESETS = {
+    "9-18": (9 * 60, 18 * 60),
+    "10-19": (10 * 60, 19 * 60),
+}
+DEFAULT_WORK_TIME = WORK_TIME_PRESETS["9-18"]
+
+# После этого часа (местного времени пользователя) напоминания о дне не отправляются
+REMINDER_CUTOFF_HOUR = 23
+
+# Множитель хеша Кнута: соседние telegram_id получают далёкие друг от друга смещения
+_SPREAD_HASH = 2654435761
+
+_WORK_TIME_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$")
+
+
+def format_minute(minute: int) -> str:
+    """540 -> '9:00'"""
+    return f"{minute // 60}:{minute % 60:02d}"
+
+
+def format_work_time(start_minute: int, end_minute: int) -> str:
+    """(540, 1080) -> '9:00-18:00'"""
+    return f"{format_minute(start_minute)}-{format_minute(end_minute)}"
+
+
+def parse_work_time(text: str) -> Optional[Tuple[int, int]]:
+    """'9:00-18:00' -> (540, 1080); None, если формат неверный или конец не позже начала"""
+    match = _WORK_TIME_RE.match(text or "")
+    if not match:
+        return None
+    sh, sm, eh, em = map(int, match.groups())
+    if sh > 23 or eh > 23 or sm > 59 or em > 59:
+        return None
+    start, end = sh * 60 + sm, eh * 60 + em
+    if start >= end:
+        return None
+    return start, end
+
+
+def is_valid_timezone(name: str) -> bool:
+    """Известно ли имя часового пояса (например, 'Asia/Baku')"""
+    return name in pytz.all_timezones_set
+
+
+def get_timezone(name: Optional[str]) -> tzinfo:
+    """Часовой пояс по имени; пустое или неизвестное имя — пояс из настроек"""
+    if name and is_valid_timezone(name):
+        return pytz.timezone(name)
+    return pytz.timezone(settings.timezone)
+
+
+def local_now(tz_name: Optional[str], now_utc: Optional[datetime] = None) -> datetime:
+    """Текущее (или заданное, naive UTC) время в поясе пользователя"""
+    now_utc = now_utc or utcnow()
+    return pytz.utc.localize(now_utc).astimezone(get_timezone(tz_name))
+
+
+def local_to_utc(tz_name: Optional[str], day: date, minute: int) -> datetime:
+    """Местные день и минута суток -> naive UTC"""
+    local = get_timezone(tz_name).localize(datetime.combine(day, time(minute // 60, minute % 60)))
+    return local.astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def end_bucket_utc(end_minute: int, tz_name: Optional[str], on_date: Optional[date] = None) -> int:
+    """
+    Корзина конца рабочего дня: минута суток UTC, на которую приходится end_minute
+    по местному времени в on_date (для поясов с летним временем корзина сезонная)
+    """
+    end_utc = local_to_utc(tz_name, on_date or utcnow().date(), end_minute)
+    return end_utc.hour * 60 + end_utc.minute
+
+
+def spread_offset(telegram_id: int, window_seconds: int) -> int:
+    """
+    Детерминированное смещение пользователя внутри окна [0, window_seconds):
+    одно и то же при каждом запуске, равномерное по пользователям
+    """
+    if window_seconds <= 0:
+        return 0
+    return ((telegram_id * _SPREAD_HASH) % 2 ** 32) * window_seconds // 2 ** 32
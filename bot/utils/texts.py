@@ -28,6 +28,16 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "Язык: Русский"
         ),
         "profile_updated": "✅ Профиль успешно обновлен!",
+        "worktime_usage": (
+            "⏰ Ваш график: {work_time}\n\n"
+            "Чтобы изменить, отправьте:\n/worktime 9:00-18:00"
+        ),
+        "worktime_updated": "✅ График работы: {work_time}",
+        "timezone_usage": (
+            "🌍 Ваш часовой пояс: {timezone}\n\n"
+            "Чтобы изменить, отправьте название пояса, например:\n/timezone Europe/Moscow"
+        ),
+        "timezone_updated": "✅ Часовой пояс: {timezone}",
 
         # Отчеты
         "report_request": (
@@ -40,6 +50,7 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "report_submitted": "✅ Отчет успешно отправлен!",
         "report_no_tasks": "✅ Отмечено, что задач не было",
         "report_already_submitted": "ℹ️ Вы уже отправили отчет за сегодня",
+        "report_day_off": "🌴 Сегодня нерабочий день — отчет не нужен.",
         "report_too_early": (
             "⏰ Еще рано!\n\n"
             "Отчет можно отправить после {end_time}\n"
@@ -65,6 +76,58 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "{details}"
         ),
         "user_list": "👥 Список пользователей ({count}):\n\n{users}",
+        "user_list_search": "🔍 Поиск «{query}» ({count}):\n\n{users}",
+        "user_search_prompt": "🔍 Введите начало имени или фамилии (или «Имя Фам»):",
+        "user_search_empty": "Никого не найдено",
+        "page_expired": "⌛ Страница устарела — откройте раздел заново",
+        "calendar_info": (
+            "📅 Календарь\n\n"
+            "Рабочие дни: {weekdays}\n"
+            "Ближайшие праздники:\n{holidays}\n\n"
+            "/holiday ГГГГ-ММ-ДД [название] - добавить праздник\n"
+            "/holiday_del ГГГГ-ММ-ДД - удалить праздник\n"
+            "/user_day TELEGRAM_ID ГГГГ-ММ-ДД work|off|reset - исключение для сотрудника"
+        ),
+        "calendar_no_holidays": "нет",
+        "holiday_usage": "Формат: /holiday ГГГГ-ММ-ДД [название]",
+        "holiday_del_usage": "Формат: /holiday_del ГГГГ-ММ-ДД",
+        "holiday_added": "✅ Праздник {day} добавлен",
+        "holiday_removed": "✅ Праздник {day} удален",
+        "holiday_not_found": "Праздник {day} не найден",
+        "user_day_usage": "Формат: /user_day TELEGRAM_ID ГГГГ-ММ-ДД work|off|reset",
+        "user_day_updated": "✅ {day} для {telegram_id}: {mode}",
+        "outbox_status": (
+            "📬 Очередь сообщений (outbox)\n\n"
+            "Ожидают отправки: {pending}\n"
+            "Отправляются: {sending}\n"
+            "Доставлено за сутки: {sent}\n"
+            "Не доставлено за сутки: {failed}\n"
+            "Самое старое ожидает с: {oldest}\n\n"
+            "Обработчик (с запуска): доставлено {total_sent}, повторов {total_retried}, "
+            "ошибок {total_failed}, {rate:.1f} сообщ./с"
+        ),
+        "outbox_empty": "нет",
+        "reminder_stats": (
+            "🔔 Напоминания за {days} дн.\n\n"
+            "По дням (доставлено / получили / сдали после напоминания):\n{by_day}\n\n"
+            "Больше всего напоминаний (напоминаний / дней / дней со сдачей):\n{by_user}"
+        ),
+        "reminder_stats_day": "• {day}: {reminders} / {users} / {converted} ({rate:.0%})",
+        "reminder_stats_user": "• {name}: {reminders} / {days} / {converted} ({rate:.0%})",
+        "reminder_stats_empty": "нет данных",
+        "period_stats": (
+            "📈 Отчёты за {since} - {until}\n\n"
+            "Ожидалось: {expected}\n"
+            "✅ Сдано: {submitted} ({rate:.0%})\n"
+            "🚫 Без задач: {no_tasks}\n"
+            "⏰ После напоминания: {late}\n"
+            "🔔 Напоминаний: {reminders}\n\n"
+            "Сдано / ожидалось (после напоминания):\n{lines}"
+        ),
+        "period_stats_line": "• {span}: {submitted} / {expected} ({rate:.0%}), {late}",
+        "period_stats_empty": "нет данных",
+        "period_stats_usage": "Формат: /stats week|month|quarter",
+        "weekly_stats": "📈 Сдано {submitted} из {expected} ({rate:.0%}), без задач {no_tasks}, после напоминания {late}",
         "stats": (
             "📊 Статистика:\n\n"
             "Всего пользователей: {total_users}\n"
@@ -154,6 +217,8 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "Основные команды:\n"
             "/profile - Просмотр профиля\n"
             "/report - Отправить отчет\n"
+            "/worktime - График работы\n"
+            "/timezone - Часовой пояс\n"
             "/help - Показать это сообщение"
         ),
     },
@@ -179,6 +244,16 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "Dil: Azərbaycan"
         ),
         "profile_updated": "✅ Profil uğurla yeniləndi!",
+        "worktime_usage": (
+            "⏰ İş qrafikiniz: {work_time}\n\n"
+            "Dəyişmək üçün göndərin:\n/worktime 9:00-18:00"
+        ),
+        "worktime_updated": "✅ İş qrafiki: {work_time}",
+        "timezone_usage": (
+            "🌍 Saat qurşağınız: {timezone}\n\n"
+            "Dəyişmək üçün qurşağın adını göndərin, məsələn:\n/timezone Asia/Baku"
+        ),
+        "timezone_updated": "✅ Saat qurşağı: {timezone}",
 
         "report_request": (
             "⏰ İş günü bitdi!\n\n"
@@ -190,6 +265,7 @@ TEXTS: Dict[str, Dict[str, str]] = {
         "report_submitted": "✅ Hesabat uğurla göndərildi!",
         "report_no_tasks": "✅ Tapşırıq olmadığı qeyd edildi",
         "report_already_submitted": "ℹ️ Siz bu gün artıq hesabat göndərmisiniz",
+        "report_day_off": "🌴 Bu gün iş günü deyil — hesabat lazım deyil.",
         "report_too_early": (
             "⏰ Hələ tezdir!\n\n"
             "Hesabatı {end_time}-dən sonra göndərə bilərsiniz\n"
@@ -213,6 +289,58 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "{details}"
         ),
         "user_list": "👥 İstifadəçilər siyahısı ({count}):\n\n{users}",
+        "user_list_search": "🔍 «{query}» axtarışı ({count}):\n\n{users}",
+        "user_search_prompt": "🔍 Ad və ya soyadın əvvəlini daxil edin (və ya «Ad Soy»):",
+        "user_search_empty": "Heç kim tapılmadı",
+        "page_expired": "⌛ Səhifə köhnəlib — bölməni yenidən açın",
+        "calendar_info": (
+            "📅 Təqvim\n\n"
+            "İş günləri: {weekdays}\n"
+            "Yaxın bayramlar:\n{holidays}\n\n"
+            "/holiday İİİİ-AA-GG [ad] - bayram əlavə et\n"
+            "/holiday_del İİİİ-AA-GG - bayramı sil\n"
+            "/user_day TELEGRAM_ID İİİİ-AA-GG work|off|reset - işçi üçün istisna"
+        ),
+        "calendar_no_holidays": "yoxdur",
+        "holiday_usage": "Format: /holiday İİİİ-AA-GG [ad]",
+        "holiday_del_usage": "Format: /holiday_del İİİİ-AA-GG",
+        "holiday_added": "✅ Bayram {day} əlavə edildi",
+        "holiday_removed": "✅ Bayram {day} silindi",
+        "holiday_not_found": "Bayram {day} tapılmadı",
+        "user_day_usage": "Format: /user_day TELEGRAM_ID İİİİ-AA-GG work|off|reset",
+        "user_day_updated": "✅ {day} — {telegram_id}: {mode}",
+        "outbox_status": (
+            "📬 Mesaj növbəsi (outbox)\n\n"
+            "Göndərilməyi gözləyir: {pending}\n"
+            "Göndərilir: {sending}\n"
+            "Son sutkada çatdırılıb: {sent}\n"
+            "Son sutkada çatdırılmayıb: {failed}\n"
+            "Ən köhnə gözləyən: {oldest}\n\n"
+            "İşləyici (başlanğıcdan): çatdırılıb {total_sent}, təkrar {total_retried}, "
+            "xəta {total_failed}, {rate:.1f} mesaj/san"
+        ),
+        "outbox_empty": "yoxdur",
+        "reminder_stats": (
+            "🔔 Son {days} gündə xatırlatmalar\n\n"
+            "Günlər üzrə (çatdırılıb / alıb / xatırlatmadan sonra göndərib):\n{by_day}\n\n"
+            "Ən çox xatırlatma (xatırlatma / gün / göndərilən gün):\n{by_user}"
+        ),
+        "reminder_stats_day": "• {day}: {reminders} / {users} / {converted} ({rate:.0%})",
+        "reminder_stats_user": "• {name}: {reminders} / {days} / {converted} ({rate:.0%})",
+        "reminder_stats_empty": "məlumat yoxdur",
+        "period_stats": (
+            "📈 {since} - {until} hesabatları\n\n"
+            "Gözlənilirdi: {expected}\n"
+            "✅ Göndərilib: {submitted} ({rate:.0%})\n"
+            "🚫 Tapşırıqsız: {no_tasks}\n"
+            "⏰ Xatırlatmadan sonra: {late}\n"
+            "🔔 Xatırlatmalar: {reminders}\n\n"
+            "Göndərilib / gözlənilirdi (xatırlatmadan sonra):\n{lines}"
+        ),
+        "period_stats_line": "• {span}: {submitted} / {expected} ({rate:.0%}), {late}",
+        "period_stats_empty": "məlumat yoxdur",
+        "period_stats_usage": "Format: /stats week|month|quarter",
+        "weekly_stats": "📈 {expected} hesabatdan {submitted} göndərilib ({rate:.0%}), tapşırıqsız {no_tasks}, xatırlatmadan sonra {late}",
         "stats": (
             "📊 Statistika:\n\n"
             "Cəmi istifadəçi: {total_users}\n"
@@ -302,6 +430,8 @@ TEXTS: Dict[str, Dict[str, str]] = {
             "/start - Botla işə başla\n"
             "/profile - Profilə bax\n"
             "/report - Hesabat göndər\n"
+            "/worktime - İş qrafiki\n"
+            "/timezone - Saat qurşağı\n"
             "/help - Bu mesajı göstər"
         ),
     }
@@ -1,7 +1,8 @@
 """
 Application configuration using pydantic-settings
 """
-from typing import List
+from datetime import date
+from typing import List, Optional
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import Field
 
@@ -25,6 +26,12 @@ class Settings(BaseSettings):
     db_user: str = Field(..., alias='DB_USER')
     db_password: str = Field(..., alias='DB_PASSWORD')
     db_name: str = Field(..., alias='DB_NAME')
+    # Пул соединений для хендлеров только на чтение (AUTOCOMMIT)
+    db_read_pool_size: int = Field(default=5, alias='DB_READ_POOL_SIZE')
+    # Применять миграции Alembic при запуске (иначе бот не стартует на устаревшей схеме)
+    db_auto_migrate: bool = Field(default=False, alias='DB_AUTO_MIGRATE')
+    # Потоковое чтение больших выборок (отчёты за период, списки): строк в пачке
+    db_stream_batch_size: int = Field(default=500, alias='DB_STREAM_BATCH_SIZE')
     
     # DeepSeek API Configuration
     deepseek_api_key: str = Field(..., alias='DEEPSEEK_API_KEY')
@@ -34,17 +41,86 @@ class Settings(BaseSettings):
     )
     scheduler_start_kick_seconds: int = Field(default=0, alias="SCHEDULER_START_KICK_SECONDS")
     scheduler_misfire_grace: int = Field(default=300, alias="SCHEDULER_MISFIRE_GRACE")
+    scheduler_catch_up_hours: int = Field(default=3, alias="SCHEDULER_CATCH_UP_HOURS")
+    job_ledger_retention_days: int = Field(default=14, alias="JOB_LEDGER_RETENTION_DAYS")
+    # Ежедневное обслуживание (закрытие итогов дней, очистка журналов), время UTC
+    housekeeping_time: str = Field(default='00:05', alias="HOUSEKEEPING_TIME")
 
     # Timezone
     timezone: str = Field(default='Asia/Baku', alias='TIMEZONE')
     
     # Scheduler Configuration
-    notification_time_1: str = Field(default='18:00', alias='NOTIFICATION_TIME_1')
-    notification_time_2: str = Field(default='19:00', alias='NOTIFICATION_TIME_2')
+    # Устарели: время уведомлений теперь из графика сотрудника (конец рабочего дня).
+    # Оставлены, чтобы старые .env с NOTIFICATION_TIME_1/2 не ломали запуск; значения не используются
+    notification_time_1: Optional[str] = Field(default=None, alias='NOTIFICATION_TIME_1')
+    notification_time_2: Optional[str] = Field(default=None, alias='NOTIFICATION_TIME_2')
+    notification_bucket_sync_seconds: int = Field(default=300, alias='NOTIFICATION_BUCKET_SYNC_SECONDS')
     reminder_interval_minutes: int = Field(default=60, alias='REMINDER_INTERVAL_MINUTES')
+    reminder_tick_seconds: int = Field(default=60, alias='REMINDER_TICK_SECONDS')
+    # График напоминаний: fixed — каждые reminder_interval_minutes; adaptive — по истории сдачи отчётов
+    reminder_policy: str = Field(default='adaptive', alias='REMINDER_POLICY')
+    reminder_policy_days: int = Field(default=28, alias='REMINDER_POLICY_DAYS')
+    reminder_policy_min_samples: int = Field(default=5, alias='REMINDER_POLICY_MIN_SAMPLES')
+    reminder_policy_lead_minutes: int = Field(default=15, alias='REMINDER_POLICY_LEAD_MINUTES')
+    reminder_policy_max_reminders: int = Field(default=3, alias='REMINDER_POLICY_MAX_REMINDERS')
+    # Ближе к отсечке напоминания чаще, но не чаще этого (минут)
+    reminder_policy_min_interval_minutes: int = Field(default=15, alias='REMINDER_POLICY_MIN_INTERVAL_MINUTES')
+    # Растянуть волну напоминаний на окно (секунд, не больше интервала); 0 — все сразу
+    reminder_spread_seconds: int = Field(default=0, alias='REMINDER_SPREAD_SECONDS')
     weekly_report_day: int = Field(default=4, alias='WEEKLY_REPORT_DAY')
     weekly_report_time: str = Field(default='00:00', alias='WEEKLY_REPORT_TIME')
-    
+
+    # Производственный календарь: рабочие дни недели (0 - понедельник) и праздники (YYYY-MM-DD)
+    working_days: str = Field(default='0,1,2,3,4', alias='WORKING_DAYS')
+    holidays: str = Field(default='', alias='HOLIDAYS')
+    calendar_refresh_seconds: int = Field(default=600, alias='CALENDAR_REFRESH_SECONDS')
+
+    # Общий лимит всех запросов к Bot API (ответы пользователям + рассылки); рассылки — в пределах broadcast_rate_per_second
+    outbound_rate_per_second: float = Field(default=30.0, alias='OUTBOUND_RATE_PER_SECOND')
+
+    # Broadcast (лимиты Telegram: ~30 сообщений/сек всего, ~1/сек в один чат)
+    broadcast_concurrency: int = Field(default=10, alias='BROADCAST_CONCURRENCY')
+    broadcast_rate_per_second: float = Field(default=25.0, alias='BROADCAST_RATE_PER_SECOND')
+    broadcast_per_chat_interval: float = Field(default=1.0, alias='BROADCAST_PER_CHAT_INTERVAL')
+    broadcast_max_retries: int = Field(default=3, alias='BROADCAST_MAX_RETRIES')
+    broadcast_ledger_chunk: int = Field(default=200, alias='BROADCAST_LEDGER_CHUNK')
+
+    # Outbox исходящих сообщений планировщика
+    outbox_drain_seconds: int = Field(default=5, alias='OUTBOX_DRAIN_SECONDS')
+    outbox_batch_size: int = Field(default=200, alias='OUTBOX_BATCH_SIZE')
+    outbox_max_attempts: int = Field(default=5, alias='OUTBOX_MAX_ATTEMPTS')
+    outbox_retry_seconds: int = Field(default=30, alias='OUTBOX_RETRY_SECONDS')
+    outbox_lease_seconds: int = Field(default=300, alias='OUTBOX_LEASE_SECONDS')
+
+    # Журнал напоминаний: пакетная запись и срок хранения
+    reminder_log_batch_size: int = Field(default=500, alias='REMINDER_LOG_BATCH_SIZE')
+    reminder_log_flush_seconds: float = Field(default=10.0, alias='REMINDER_LOG_FLUSH_SECONDS')
+    reminder_log_retention_days: int = Field(default=90, alias='REMINDER_LOG_RETENTION_DAYS')
+
+    # Кэш пользователей в памяти (UserCheckMiddleware); 0 — выключен
+    user_cache_size: int = Field(default=10000, alias='USER_CACHE_SIZE')
+    user_cache_ttl_seconds: float = Field(default=300.0, alias='USER_CACHE_TTL_SECONDS')
+
+    # Листаемые списки в админ-панели: размер страницы и кэш отрисованных страниц
+    admin_users_page_size: int = Field(default=20, alias='ADMIN_USERS_PAGE_SIZE')
+    page_cache_size: int = Field(default=256, alias='PAGE_CACHE_SIZE')
+    page_cache_ttl_seconds: float = Field(default=60.0, alias='PAGE_CACHE_TTL_SECONDS')
+
+    # Длинные тексты (сводки, недельный отчёт), листаемые в одном сообщении: сколько и как долго хранить
+    paged_text_cache_size: int = Field(default=64, alias='PAGED_TEXT_CACHE_SIZE')
+    paged_text_ttl_seconds: float = Field(default=21600.0, alias='PAGED_TEXT_TTL_SECONDS')
+
+    # Leader election (несколько реплик): off | db | memory
+    leader_election: str = Field(default='off', alias='LEADER_ELECTION')
+    leader_lease_name: str = Field(default='scheduler', alias='LEADER_LEASE_NAME')
+    leader_lease_ttl_seconds: int = Field(default=15, alias='LEADER_LEASE_TTL_SECONDS')
+    leader_heartbeat_seconds: float = Field(default=5.0, alias='LEADER_HEARTBEAT_SECONDS')
+
+    # Шардирование пользователей между репликами: off | db | memory
+    scheduler_sharding: str = Field(default='off', alias='SCHEDULER_SHARDING')
+    shard_member_ttl_seconds: int = Field(default=15, alias='SHARD_MEMBER_TTL_SECONDS')
+    shard_heartbeat_seconds: float = Field(default=5.0, alias='SHARD_HEARTBEAT_SECONDS')
+
     # Logging
     log_level: str = Field(default='INFO', alias='LOG_LEVEL')
     log_file: str = Field(default='logs/bot.log', alias='LOG_FILE')
@@ -54,6 +130,16 @@ class Settings(BaseSettings):
         """Convert admin IDs string to list of integers"""
         return [int(id_.strip()) for id_ in self.admin_ids.split(',') if id_.strip()]
     
+    @property
+    def working_days_list(self) -> List[int]:
+        """Convert working days string to list of weekday numbers"""
+        return [int(day.strip()) for day in self.working_days.split(',') if day.strip()]
+
+    @property
+    def holidays_list(self) -> List[date]:
+        """Convert holidays string to list of dates"""
+        return [date.fromisoformat(day.strip()) for day in self.holidays.split(',') if day.strip()]
+
     @property
     def database_url(self) -> str:
         """Generate database URL for SQLAlchemy"""
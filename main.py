@@ -9,17 +9,19 @@ from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import SendMessage
 
 from config.settings import settings
-from bot.database import db_manager
+from bot.database import db_manager, UserRepository, user_cache
 from bot.middlewares import (
     LoggingMiddleware,
     DatabaseMiddleware,
+    DatabaseModeMiddleware,
     UserCheckMiddleware,
     AdminCheckMiddleware,
 )
 from bot.handlers import start, reports, profile, admin, common
-from bot.services import SchedulerService
+from bot.services import SchedulerService, outbound_scheduler
 
 
 # Configure logging
@@ -66,24 +68,32 @@ class RetryMiddleware:
 async def on_startup(bot: Bot, scheduler: SchedulerService):
     """Actions on bot startup"""
     try:
-        # Create database tables
-        await db_manager.create_tables()
-        logger.info("Database initialized")
+        # Schema is managed by Alembic: only compare the revision (one query)
+        await db_manager.check_schema()
+        
+        # Warm user cache: most updates resolve the user without a DB query
+        async with db_manager.session() as session:
+            warmed = await UserRepository.warm_cache(session)
+        logger.info(f"User cache warmed: {warmed} users")
         
         # Start scheduler
-        scheduler.start()
+        await scheduler.start()
         logger.info("Scheduler started")
         
         # Notify admins
-        for admin_id in settings.admin_ids_list:
-            try:
-                await bot.send_message(
-                    admin_id,
+        results = await scheduler.broadcaster.broadcast(
+            SendMessage(
+                chat_id=admin_id,
+                text=(
                     "🤖 Бот запущен и готов к работе!\n"
                     "Bot started and ready to work!"
                 )
-            except Exception as e:
-                logger.warning(f"Could not notify admin {admin_id}: {e}")
+            )
+            for admin_id in settings.admin_ids_list
+        )
+        for r in results:
+            if not r.ok:
+                logger.warning(f"Could not notify admin {r.chat_id}: {r.error}")
         
         logger.info("Bot started successfully")
     
@@ -96,19 +106,27 @@ async def on_shutdown(bot: Bot, scheduler: SchedulerService):
     """Actions on bot shutdown"""
     try:
         # Stop scheduler
-        scheduler.shutdown()
+        await scheduler.shutdown()
         logger.info("Scheduler stopped")
+        logger.info(
+            f"User cache: hits={user_cache.hits}, misses={user_cache.misses}, "
+            f"hit rate={user_cache.hit_rate:.0%}, size={len(user_cache)}"
+        )
         
         # Notify admins
-        for admin_id in settings.admin_ids_list:
-            try:
-                await bot.send_message(
-                    admin_id,
+        results = await scheduler.broadcaster.broadcast(
+            SendMessage(
+                chat_id=admin_id,
+                text=(
                     "🤖 Бот остановлен\n"
                     "Bot stopped"
                 )
-            except Exception as e:
-                logger.warning(f"Could not notify admin {admin_id}: {e}")
+            )
+            for admin_id in settings.admin_ids_list
+        )
+        for r in results:
+            if not r.ok:
+                logger.warning(f"Could not notify admin {r.chat_id}: {r.error}")
         
         logger.info("Bot shut down successfully")
     
@@ -125,6 +143,8 @@ async def main():
             timeout=60,
             default=DefaultBotProperties(parse_mode=ParseMode.HTML)
         )
+        # Общий лимит Bot API: ответы пользователям вперёд рассылок
+        bot.session.middleware(outbound_scheduler)
         
         storage = MemoryStorage()
         dp = Dispatcher(storage=storage)
@@ -142,6 +162,10 @@ async def main():
         dp.callback_query.outer_middleware(UserCheckMiddleware())
         dp.callback_query.outer_middleware(AdminCheckMiddleware())
         
+        # Флаг db="read" у хендлера: чтение через пул AUTOCOMMIT
+        dp.message.middleware(DatabaseModeMiddleware())
+        dp.callback_query.middleware(DatabaseModeMiddleware())
+        
         # Retry middleware для обработки временных ошибок
         dp.message.middleware(RetryMiddleware())
         dp.callback_query.middleware(RetryMiddleware())
@@ -0,0 +1,135 @@
+"""Исходная схема: users, daily_reports, weekly_reports (SQL-скрипт из README)
+
+База, созданная этим скриптом без Alembic, уже на этой ревизии: создаются только
+недостающие таблицы, поэтому для неё достаточно alembic upgrade head.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 20:32:26.974566
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Как в README: InnoDB и utf8mb4 (на других СУБД параметры игнорируются)
+MYSQL_TABLE = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def _existing_tables() -> set:
+    """Таблицы, которые уже есть в БД (в режиме --sql считаем базу пустой)"""
+    if context.is_offline_mode():
+        return set()
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade() -> None:
+    mysql = op.get_context().dialect.name == 'mysql'
+    on_update = " ON UPDATE CURRENT_TIMESTAMP" if mysql else ""
+    existing = _existing_tables()
+
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='Уникальный ID пользователя'),
+            sa.Column('telegram_id', sa.BigInteger(), nullable=False, comment='Telegram ID пользователя'),
+            sa.Column('first_name', sa.String(length=255), nullable=False, comment='Имя пользователя'),
+            sa.Column('last_name', sa.String(length=255), nullable=False, comment='Фамилия пользователя'),
+            sa.Column('language', sa.String(length=2), nullable=False, comment='Язык интерфейса (ru/az)'),
+            sa.Column(
+                'work_time', sa.String(length=20), nullable=False,
+                comment='Рабочее время (9:00-18:00 или 10:00-19:00)',
+            ),
+            sa.Column(
+                'is_active', sa.Boolean(), server_default=sa.text('1'), nullable=False,
+                comment='Активен ли пользователь',
+            ),
+            sa.Column(
+                'is_admin', sa.Boolean(), server_default=sa.text('0'), nullable=False,
+                comment='Является ли администратором',
+            ),
+            sa.Column(
+                'created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False,
+                comment='Дата создания',
+            ),
+            sa.Column(
+                'updated_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP' + on_update), nullable=False,
+                comment='Дата обновления',
+            ),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('telegram_id', name='telegram_id'),
+            comment='Таблица пользователей бота',
+            **MYSQL_TABLE,
+        )
+        op.create_index('idx_telegram_id', 'users', ['telegram_id'])
+        op.create_index('idx_is_active', 'users', ['is_active'])
+        op.create_index('idx_work_time', 'users', ['work_time'])
+
+    if 'daily_reports' not in existing:
+        op.create_table(
+            'daily_reports',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='Уникальный ID отчета'),
+            sa.Column('user_id', sa.Integer(), nullable=False, comment='ID пользователя (внешний ключ)'),
+            sa.Column(
+                'telegram_id', sa.BigInteger(), nullable=False,
+                comment='Telegram ID пользователя (для быстрого поиска)',
+            ),
+            sa.Column('report_date', sa.DateTime(), nullable=False, comment='Дата отчета'),
+            sa.Column('report_text', sa.Text(), nullable=True, comment='Текст отчета (NULL если задач не было)'),
+            sa.Column('has_tasks', sa.Boolean(), nullable=False, comment='Были ли задачи (1-да, 0-нет)'),
+            sa.Column(
+                'submitted_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False,
+                comment='Дата отправки отчета',
+            ),
+            sa.Column(
+                'reminder_count', sa.Integer(), server_default=sa.text('0'), nullable=False,
+                comment='Количество отправленных напоминаний',
+            ),
+            sa.PrimaryKeyConstraint('id'),
+            comment='Таблица ежедневных отчетов',
+            **MYSQL_TABLE,
+        )
+        op.create_index('idx_user_id', 'daily_reports', ['user_id'])
+        # В SQLite имена индексов общие для всей базы, а idx_telegram_id уже есть у users
+        op.create_index(
+            'idx_telegram_id' if mysql else 'idx_daily_reports_telegram_id', 'daily_reports', ['telegram_id']
+        )
+        op.create_index('idx_report_date', 'daily_reports', ['report_date'])
+        op.create_index('idx_submitted_at', 'daily_reports', ['submitted_at'])
+
+    if 'weekly_reports' not in existing:
+        op.create_table(
+            'weekly_reports',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False, comment='Уникальный ID отчета'),
+            sa.Column('week_start', sa.DateTime(), nullable=False, comment='Дата начала недели'),
+            sa.Column('week_end', sa.DateTime(), nullable=False, comment='Дата окончания недели'),
+            sa.Column('report_text', sa.Text(), nullable=False, comment='Текст отчета (сгенерирован AI)'),
+            sa.Column(
+                'created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False,
+                comment='Дата создания',
+            ),
+            sa.PrimaryKeyConstraint('id'),
+            comment='Таблица недельных отчетов',
+            **MYSQL_TABLE,
+        )
+        op.create_index('idx_week_start', 'weekly_reports', ['week_start'])
+        op.create_index('idx_created_at', 'weekly_reports', ['created_at'])
+
+
+def downgrade() -> None:
+    # Индексы удаляются вместе с таблицами
+    op.drop_table('weekly_reports')
+    op.drop_table('daily_reports')
+    op.drop_table('users')
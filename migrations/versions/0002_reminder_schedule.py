@@ -0,0 +1,48 @@
+"""Очередь напоминаний reminder_schedule
+
+Очередь заполняет задача уведомлений в конце дня, поэтому данных переносить не нужно.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19 10:05:41.307215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Как в README: InnoDB и utf8mb4 (на других СУБД параметры игнорируются)
+MYSQL_TABLE = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'reminder_schedule',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('telegram_id', sa.BigInteger(), nullable=False),
+        sa.Column('report_day', sa.Date(), nullable=False),
+        sa.Column('next_reminder_at', sa.DateTime(), nullable=True),
+        sa.Column('reminders_sent', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('telegram_id', 'report_day', name='uq_reminder_user_day'),
+        **MYSQL_TABLE,
+    )
+    op.create_index('ix_reminder_schedule_next_reminder_at', 'reminder_schedule', ['next_reminder_at'])
+    op.create_index('ix_reminder_schedule_report_day', 'reminder_schedule', ['report_day'])
+
+
+def downgrade() -> None:
+    op.drop_table('reminder_schedule')
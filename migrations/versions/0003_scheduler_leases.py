@@ -0,0 +1,40 @@
+"""Аренда лидерства планировщика scheduler_leases
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19 10:18:09.552104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Как в README: InnoDB и utf8mb4 (на других СУБД параметры игнорируются)
+MYSQL_TABLE = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scheduler_leases',
+        sa.Column('name', sa.String(length=64), nullable=False),
+        sa.Column('holder', sa.String(length=128), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+        **MYSQL_TABLE,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('scheduler_leases')
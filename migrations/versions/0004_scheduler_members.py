@@ -0,0 +1,48 @@
+"""Живые реплики scheduler_members и токен захвата в reminder_schedule
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-19 10:31:52.840617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Как в README: InnoDB и utf8mb4 (на других СУБД параметры игнорируются)
+MYSQL_TABLE = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'scheduler_members',
+        sa.Column('replica_id', sa.String(length=128), nullable=False),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('replica_id'),
+        **MYSQL_TABLE,
+    )
+    op.create_index('ix_scheduler_members_heartbeat_at', 'scheduler_members', ['heartbeat_at'])
+
+    with op.batch_alter_table('reminder_schedule') as batch_op:
+        batch_op.add_column(sa.Column('claim_token', sa.String(length=32), nullable=True))
+        batch_op.create_index('ix_reminder_schedule_claim_token', ['claim_token'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('reminder_schedule') as batch_op:
+        batch_op.drop_index('ix_reminder_schedule_claim_token')
+        batch_op.drop_column('claim_token')
+
+    op.drop_table('scheduler_members')
@@ -0,0 +1,57 @@
+"""Журнал запусков job_runs и доставок job_deliveries
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19 10:47:26.119374
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Как в README: InnoDB и utf8mb4 (на других СУБД параметры игнорируются)
+MYSQL_TABLE = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'job_runs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('job_key', sa.String(length=96), nullable=False),
+        sa.Column('run_date', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_key', 'run_date', name='uq_job_run'),
+        **MYSQL_TABLE,
+    )
+
+    op.create_table(
+        'job_deliveries',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('job_id', sa.String(length=64), nullable=False),
+        sa.Column('run_date', sa.Date(), nullable=False),
+        sa.Column('recipient_id', sa.BigInteger(), nullable=False),
+        sa.Column('delivered_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_id', 'run_date', 'recipient_id', name='uq_job_delivery'),
+        **MYSQL_TABLE,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job_deliveries')
+    op.drop_table('job_runs')
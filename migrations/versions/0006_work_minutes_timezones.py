@@ -0,0 +1,133 @@
+"""Графики в минутах, часовые пояса и корзины конца рабочего дня в UTC
+
+users.work_time ('9:00-18:00') переносится в work_start_minute / work_end_minute,
+пояс — из настроек (TIMEZONE), корзина считается на сегодня (дальше её раз в сутки
+пересчитывает планировщик). Время в reminder_schedule теперь UTC: очередь со старым
+местным временем очищается, её заново заполнит задача уведомлений.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19 11:12:48.603951
+
+"""
+import re
+from datetime import date, datetime, time
+from typing import Sequence, Union
+
+import pytz
+from alembic import context, op
+import sqlalchemy as sa
+
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Графики исходной схемы; неразобранный график считается 9:00-18:00
+BASELINE_WORK_TIMES = ('9:00-18:00', '10:00-19:00')
+DEFAULT_WORK_MINUTES = (9 * 60, 18 * 60)
+_WORK_TIME_RE = re.compile(r"^\s*(\d{1,2}):(\d{2})\s*-\s*(\d{1,2}):(\d{2})\s*$")
+
+users = sa.table(
+    'users',
+    sa.column('work_time', sa.String),
+    sa.column('work_start_minute', sa.Integer),
+    sa.column('work_end_minute', sa.Integer),
+    sa.column('timezone', sa.String),
+    sa.column('end_bucket_utc', sa.Integer),
+)
+
+
+def _parse(work_time: str):
+    """'9:00-18:00' -> (540, 1080); неверный формат — график по умолчанию"""
+    match = _WORK_TIME_RE.match(work_time or "")
+    if not match:
+        return DEFAULT_WORK_MINUTES
+    sh, sm, eh, em = map(int, match.groups())
+    start, end = sh * 60 + sm, eh * 60 + em
+    if sh > 23 or eh > 23 or sm > 59 or em > 59 or start >= end:
+        return DEFAULT_WORK_MINUTES
+    return start, end
+
+
+def _end_bucket(end_minute: int, tz_name: str, on_date: date) -> int:
+    """Минута суток UTC, на которую приходится конец работы по местному времени"""
+    local = pytz.timezone(tz_name).localize(datetime.combine(on_date, time(end_minute // 60, end_minute % 60)))
+    end_utc = local.astimezone(pytz.utc)
+    return end_utc.hour * 60 + end_utc.minute
+
+
+def _work_times() -> list:
+    """Графики в БД (в режиме --sql — графики исходной схемы)"""
+    if context.is_offline_mode():
+        return list(BASELINE_WORK_TIMES)
+    return [row[0] for row in op.get_bind().execute(sa.text("SELECT DISTINCT work_time FROM users"))]
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('work_start_minute', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('work_end_minute', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('timezone', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('end_bucket_utc', sa.Integer(), nullable=True))
+
+    tz_name = settings.timezone
+    today = datetime.utcnow().date()
+    for work_time in _work_times():
+        start, end = _parse(work_time)
+        op.execute(
+            users.update()
+            .where(users.c.work_time == work_time)
+            .values(
+                work_start_minute=start,
+                work_end_minute=end,
+                timezone=tz_name,
+                end_bucket_utc=_end_bucket(end, tz_name, today),
+            )
+        )
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('work_start_minute', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('work_end_minute', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('timezone', existing_type=sa.String(length=64), nullable=False)
+        batch_op.alter_column('end_bucket_utc', existing_type=sa.Integer(), nullable=False)
+        batch_op.drop_index('idx_work_time')
+        batch_op.drop_column('work_time')
+        batch_op.create_index('ix_users_end_bucket_utc', ['end_bucket_utc'])
+
+    op.execute("DELETE FROM reminder_schedule")
+    with op.batch_alter_table('reminder_schedule') as batch_op:
+        batch_op.add_column(sa.Column('stop_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('reminder_schedule') as batch_op:
+        batch_op.drop_column('stop_at')
+    op.execute("DELETE FROM reminder_schedule")
+
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.add_column(sa.Column('work_time', sa.String(length=20), nullable=True))
+    # 540 -> '9:00' (часы без ведущего нуля, как в исходной схеме)
+    start = users.c.work_start_minute
+    end = users.c.work_end_minute
+    op.execute(
+        users.update().values(
+            work_time=(
+                sa.cast(start // 60, sa.String) + ':' + sa.func.substr(sa.cast(100 + start % 60, sa.String), 2, 2)
+                + '-'
+                + sa.cast(end // 60, sa.String) + ':' + sa.func.substr(sa.cast(100 + end % 60, sa.String), 2, 2)
+            )
+        )
+    )
+    with op.batch_alter_table('users') as batch_op:
+        batch_op.alter_column('work_time', existing_type=sa.String(length=20), nullable=False)
+        batch_op.drop_index('ix_users_end_bucket_utc')
+        batch_op.drop_column('end_bucket_utc')
+        batch_op.drop_column('timezone')
+        batch_op.drop_column('work_end_minute')
+        batch_op.drop_column('work_start_minute')
+        batch_op.create_index('idx_work_time', ['work_time'])
@@ -0,0 +1,52 @@
+"""Рабочий календарь: праздники holidays и исключения сотрудников calendar_exceptions
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19 11:40:15.274830
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Как в README: InnoDB и utf8mb4 (на других СУБД параметры игнорируются)
+MYSQL_TABLE = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'holidays',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.PrimaryKeyConstraint('day'),
+        **MYSQL_TABLE,
+    )
+
+    op.create_table(
+        'calendar_exceptions',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('telegram_id', sa.BigInteger(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('is_working', sa.Boolean(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('telegram_id', 'day', name='uq_calendar_exception'),
+        **MYSQL_TABLE,
+    )
+    op.create_index('ix_calendar_exceptions_day', 'calendar_exceptions', ['day'])
+
+
+def downgrade() -> None:
+    op.drop_table('calendar_exceptions')
+    op.drop_table('holidays')
@@ -0,0 +1,54 @@
+"""Очередь исходящих сообщений планировщика outbox
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19 12:20:57.418236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Как в README: InnoDB и utf8mb4 (на других СУБД параметры игнорируются)
+MYSQL_TABLE = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'outbox',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('dedupe_key', sa.String(length=128), nullable=False),
+        sa.Column('job_id', sa.String(length=64), nullable=False),
+        sa.Column('chat_id', sa.BigInteger(), nullable=False),
+        sa.Column('text_key', sa.String(length=64), nullable=False),
+        sa.Column('language', sa.String(length=2), nullable=False),
+        sa.Column('keyboard', sa.String(length=32), nullable=True),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+        sa.Column('claim_token', sa.String(length=32), nullable=True),
+        sa.Column('last_error', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('dedupe_key'),
+        **MYSQL_TABLE,
+    )
+    op.create_index('ix_outbox_claim_token', 'outbox', ['claim_token'])
+    op.create_index('ix_outbox_due', 'outbox', ['status', 'next_attempt_at'])
+
+
+def downgrade() -> None:
+    op.drop_table('outbox')
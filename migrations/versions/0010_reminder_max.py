@@ -0,0 +1,30 @@
+"""Предел числа напоминаний reminder_schedule.max_reminders
+
+NULL у существующих записей — напоминать до stop_at, как раньше.
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-19 12:41:06.772590
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('reminder_schedule') as batch_op:
+        batch_op.add_column(sa.Column('max_reminders', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('reminder_schedule') as batch_op:
+        batch_op.drop_column('max_reminders')
@@ -0,0 +1,51 @@
+"""Журнал напоминаний reminder_events и день отчёта в outbox
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-19 13:04:22.185743
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Как в README: InnoDB и utf8mb4 (на других СУБД параметры игнорируются)
+MYSQL_TABLE = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('outbox') as batch_op:
+        batch_op.add_column(sa.Column('report_day', sa.Date(), nullable=True))
+
+    op.create_table(
+        'reminder_events',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('telegram_id', sa.BigInteger(), nullable=False),
+        sa.Column('report_day', sa.Date(), nullable=False),
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('outcome', sa.String(length=16), nullable=False),
+        sa.Column('sent_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        **MYSQL_TABLE,
+    )
+    op.create_index('ix_reminder_events_day_user', 'reminder_events', ['report_day', 'telegram_id'])
+    op.create_index('ix_reminder_events_telegram_id', 'reminder_events', ['telegram_id'])
+
+
+def downgrade() -> None:
+    op.drop_table('reminder_events')
+
+    with op.batch_alter_table('outbox') as batch_op:
+        batch_op.drop_column('report_day')
@@ -0,0 +1,54 @@
+"""День отчёта daily_reports.report_day и один отчёт на сотрудника за день
+
+report_day заполняется датой report_date (местное время сотрудника). Повторные
+отчёты за один день удаляются — остаётся первый (меньший id), как и при сдаче
+через бота. Отдельный индекс telegram_id больше не нужен: его заменяет начало
+уникального ключа (telegram_id, report_day).
+Удалённые дубли при откате не восстанавливаются.
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-19 13:37:50.046128
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _telegram_index() -> str:
+    """Индекс daily_reports.telegram_id из ревизии 0001 (в SQLite имена индексов общие для всей базы)"""
+    return 'idx_telegram_id' if op.get_context().dialect.name == 'mysql' else 'idx_daily_reports_telegram_id'
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('daily_reports') as batch_op:
+        batch_op.add_column(sa.Column('report_day', sa.Date(), nullable=True))
+
+    op.execute("UPDATE daily_reports SET report_day = DATE(report_date)")
+    # MySQL не даёт читать изменяемую таблицу в подзапросе DELETE — отсюда производная таблица
+    op.execute(
+        "DELETE FROM daily_reports WHERE id NOT IN ("
+        "SELECT id FROM (SELECT MIN(id) AS id FROM daily_reports GROUP BY telegram_id, report_day) AS keep_rows"
+        ")"
+    )
+
+    with op.batch_alter_table('daily_reports') as batch_op:
+        batch_op.alter_column('report_day', existing_type=sa.Date(), nullable=False)
+        batch_op.create_unique_constraint('uq_daily_reports_user_day', ['telegram_id', 'report_day'])
+        batch_op.drop_index(_telegram_index())
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('daily_reports') as batch_op:
+        batch_op.create_index(_telegram_index(), ['telegram_id'])
+        batch_op.drop_constraint('uq_daily_reports_user_day', type_='unique')
+        batch_op.drop_column('report_day')
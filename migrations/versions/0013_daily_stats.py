@@ -0,0 +1,101 @@
+"""Итоги дней daily_stats
+
+Итоги дней с отчётами заполняются из daily_reports так же, как в backfill_stats.py:
+total_active истории неизвестен — берётся текущее число сотрудников. Дни до позавчера
+закрываются; вчера и сегодня остаются открытыми, их закроет планировщик.
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 21:05:12.418903
+
+"""
+from datetime import datetime, timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from config.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Как в README: InnoDB и utf8mb4 (на других СУБД параметры игнорируются)
+MYSQL_TABLE = {
+    "mysql_engine": "InnoDB",
+    "mysql_charset": "utf8mb4",
+    "mysql_collate": "utf8mb4_unicode_ci",
+}
+
+
+def upgrade() -> None:
+    op.create_table(
+        'daily_stats',
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('total_active', sa.Integer(), nullable=False),
+        sa.Column('submitted', sa.Integer(), nullable=False),
+        sa.Column('no_tasks', sa.Integer(), nullable=False),
+        sa.Column('late', sa.Integer(), nullable=False),
+        sa.Column('reminders_sent', sa.Integer(), nullable=False),
+        sa.Column('sealed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('day'),
+        **MYSQL_TABLE,
+    )
+
+    users = sa.table(
+        'users', sa.column('telegram_id', sa.BigInteger), sa.column('is_active', sa.Boolean),
+        sa.column('is_admin', sa.Boolean),
+    )
+    reports = sa.table(
+        'daily_reports', sa.column('id', sa.Integer), sa.column('report_day', sa.Date),
+        sa.column('has_tasks', sa.Boolean), sa.column('reminder_count', sa.Integer),
+    )
+    schedule = sa.table('reminder_schedule', sa.column('report_day', sa.Date), sa.column('reminders_sent', sa.Integer))
+    daily_stats = sa.table(
+        'daily_stats', sa.column('day'), sa.column('total_active'), sa.column('submitted'), sa.column('no_tasks'),
+        sa.column('late'), sa.column('reminders_sent'), sa.column('sealed_at'),
+    )
+
+    # Сотрудники — активные и не администраторы (ни в БД, ни в ADMIN_IDS)
+    total_active = (
+        sa.select(sa.func.count())
+        .select_from(users)
+        .where(
+            sa.and_(
+                users.c.is_active == sa.true(),
+                users.c.is_admin == sa.false(),
+                users.c.telegram_id.notin_(settings.admin_ids_list),
+            )
+        )
+        .scalar_subquery()
+    )
+    # Напоминания не сдавшим — из очереди напоминаний
+    not_reported = (
+        sa.select(sa.func.coalesce(sa.func.sum(schedule.c.reminders_sent), 0))
+        .where(schedule.c.report_day == reports.c.report_day)
+        .scalar_subquery()
+    )
+    now = datetime.utcnow()
+    until = now.date() - timedelta(days=2)
+    op.execute(
+        daily_stats.insert().from_select(
+            ['day', 'total_active', 'submitted', 'no_tasks', 'late', 'reminders_sent', 'sealed_at'],
+            sa.select(
+                reports.c.report_day,
+                total_active,
+                sa.func.count(reports.c.id),
+                sa.func.count(sa.case((reports.c.has_tasks == sa.false(), reports.c.id))),
+                sa.func.count(sa.case((reports.c.reminder_count > 0, reports.c.id))),
+                sa.func.coalesce(sa.func.sum(reports.c.reminder_count), 0) + not_reported,
+                sa.case((reports.c.report_day <= until, now), else_=sa.null()),
+            ).group_by(reports.c.report_day),
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('daily_stats')
@@ -0,0 +1,27 @@
+"""Индексы имён пользователей для списка в админ-панели
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18 21:40:37.215604
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014'
+down_revision: Union[str, None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_users_name', 'users', ['first_name', 'last_name', 'telegram_id'], unique=False)
+    op.create_index('ix_users_last_name', 'users', ['last_name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_last_name', table_name='users')
+    op.drop_index('ix_users_name', table_name='users')
@@ -0,0 +1,398 @@
+"""
+Симуляция дня планировщика (для CI и замеров производительности)
+
+Задачи SchedulerService прогоняются по фиктивным часам на SQLite с синтетическими
+сотрудниками и отчётами; вместо Telegram — бот, который только считает вызовы.
+По каждой задаче выводятся: время, число SQL-запросов, отправленные сообщения
+и пик памяти.
+
+    python simulate.py --users 10000 --date 2026-01-15 --json sim.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, asdict
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+# Настройки обязательны при импорте бота; для симуляции подойдут заглушки
+for _name, _value in {
+    "BOT_TOKEN": "0:simulation",
+    "ADMIN_IDS": "1",
+    "DB_USER": "simulation",
+    "DB_PASSWORD": "simulation",
+    "DB_NAME": "simulation",
+    "DEEPSEEK_API_KEY": "simulation",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+from loguru import logger
+from sqlalchemy import event, insert, select
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.methods import TelegramMethod
+
+from config.settings import settings
+from bot.database import db_manager
+from bot.database.models import Base, User, DailyReport, ReminderSchedule
+from bot.utils import FakeClock, set_clock, local_to_utc, end_bucket_utc, WORK_TIME_PRESETS
+from bot.services import SchedulerService, WorkCalendar
+from bot.services.broadcast_service import Broadcaster
+from bot.services.deepseek_service import deepseek_service
+from bot.services.leader_service import LeaderElector, AlwaysLeaderLease
+from bot.services.shard_service import ShardCoordinator
+
+
+DEFAULT_TIMEZONES = "Asia/Baku,Europe/Moscow,Asia/Tbilisi,Europe/Istanbul,Asia/Almaty"
+
+FIRST_USER_ID = 10_000_000
+
+# Привычные задержки сдачи отчёта после конца рабочего дня, минут
+HABIT_DELAYS = (5, 30, 120, 240)
+
+
+class RecordingBot:
+    """Бот без сети: считает вызовы Bot API, заблокированным пользователям отвечает Forbidden"""
+
+    def __init__(self, blocked: Set[int], latency: float = 0.0):
+        self.blocked = blocked
+        self.latency = latency
+        self.calls: Counter = Counter()
+        self.messages = 0
+
+    async def __call__(self, method: TelegramMethod, request_timeout: Optional[int] = None):
+        self.messages += 1
+        self.calls[type(method).__name__] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if getattr(method, "chat_id", None) in self.blocked:
+            raise TelegramForbiddenError(method=method, message="Forbidden: bot was blocked by the user")
+        return True
+
+
+@dataclass
+class JobStats:
+    """Замеры одной задачи за всю симуляцию"""
+    runs: int = 0
+    wall_seconds: float = 0.0
+    queries: int = 0
+    messages: int = 0
+    max_messages_per_run: int = 0
+    peak_memory_kb: float = 0.0
+
+
+class Simulation:
+    """День D (UTC) поминутно: корзины уведомлений, тики напоминаний, сводка и недельный отчёт"""
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.day: date = args.date
+        self.rng = random.Random(args.seed)
+        self.timezones = [tz.strip() for tz in args.timezones.split(",") if tz.strip()]
+        self.clock = FakeClock(datetime.combine(self.day, datetime.min.time()))
+        self.queries = 0
+        self.stats: Dict[str, JobStats] = {}
+        self.users: Dict[int, Tuple[int, str, int]] = {}  # telegram_id -> (id, timezone, конец работы)
+        self.habits: Dict[int, int] = {}  # telegram_id -> обычная задержка сдачи после конца работы, минут
+        self.submitted: Set[Tuple[int, date]] = set()
+        self.blocked: Set[int] = set()
+        self.bot: Optional[RecordingBot] = None
+        self.scheduler: Optional[SchedulerService] = None
+
+    # ---------- подготовка ----------
+
+    async def setup(self, db_path: str):
+        set_clock(self.clock)
+        db_manager.configure(f"sqlite+aiosqlite:///{db_path}")
+        event.listen(db_manager.engine.sync_engine, "before_cursor_execute", self._count_query)
+        async with db_manager.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+        await self._seed()
+
+        self.bot = RecordingBot(self.blocked, self.args.latency_ms / 1000)
+        calendar = WorkCalendar(settings.working_days_list, settings.holidays_list)
+        self.scheduler = SchedulerService(
+            self.bot,
+            leader=LeaderElector(AlwaysLeaderLease(), settings.leader_heartbeat_seconds),
+            shards=ShardCoordinator("simulation", None, settings.shard_heartbeat_seconds),
+            calendar=calendar,
+        )
+        # Лимиты Telegram в симуляции не нужны: время отправки при реальном лимите оценивается отдельно
+        self.scheduler.broadcaster = Broadcaster(self.bot, rate_per_second=self.args.rate, per_chat_interval=0)
+        await calendar.refresh()
+        await self.scheduler.leader.heartbeat()
+        await self.scheduler._sync_notification_buckets()
+
+    def _count_query(self, *args):
+        self.queries += 1
+
+    async def _seed(self):
+        """Сотрудники (графики, пояса и привычки вперемешку) и история отчётов до дня D"""
+        presets = list(WORK_TIME_PRESETS.values())
+        now = self.clock.utcnow()
+        rows = []
+        for admin_id in settings.admin_ids_list:
+            rows.append(self._user_row(admin_id, "Admin", presets[0], settings.timezone, now, is_admin=True))
+        for i in range(self.args.users):
+            telegram_id = FIRST_USER_ID + i
+            tz_name = self.rng.choice(self.timezones)
+            rows.append(self._user_row(telegram_id, f"User{i}", self.rng.choice(presets), tz_name, now))
+            self.habits[telegram_id] = self.rng.choice(HABIT_DELAYS)
+            if self.rng.random() < self.args.blocked_rate:
+                self.blocked.add(telegram_id)
+
+        async with db_manager.session() as session:
+            await session.execute(insert(User), rows)
+            await session.commit()
+            result = await session.execute(
+                select(User.id, User.telegram_id, User.timezone, User.work_end_minute).where(User.is_admin.is_(False))
+            )
+            self.users = {telegram_id: (user_id, tz_name, end) for user_id, telegram_id, tz_name, end in result.all()}
+
+            # История за history-days, прошлые дни недели и часть дня D — отчёты сданы заранее
+            week_start = self.day - timedelta(days=self.day.weekday())
+            first_day = min(week_start, self.day - timedelta(days=self.args.history_days))
+            reports = []
+            for offset in range((self.day - first_day).days + 1):
+                report_day = first_day + timedelta(days=offset)
+                if report_day.weekday() not in settings.working_days_list:
+                    continue
+                for telegram_id in self.users:
+                    if self.rng.random() < self.args.report_rate:
+                        reports.append(self._report_row(telegram_id, report_day))
+            for chunk_start in range(0, len(reports), 5000):
+                await session.execute(insert(DailyReport), reports[chunk_start:chunk_start + 5000])
+            await session.commit()
+        logger.info(f"[sim] сотрудников: {len(self.users)}, отчётов: {len(reports)}, заблокировали бота: {len(self.blocked)}")
+
+    @staticmethod
+    def _user_row(telegram_id, name, work_time, tz_name, now, is_admin=False) -> dict:
+        start, end = work_time
+        return {
+            "telegram_id": telegram_id,
+            "first_name": name,
+            "last_name": "Sim",
+            "language": "ru",
+            "work_start_minute": start,
+            "work_end_minute": end,
+            "timezone": tz_name,
+            "end_bucket_utc": end_bucket_utc(end, tz_name, now.date()),
+            "is_active": True,
+            "is_admin": is_admin,
+            "created_at": now,
+            "updated_at": now,
+        }
+
+    def _habit_time(self, telegram_id: int, report_day: date) -> datetime:
+        """Когда сотрудник сдаёт отчёт сам, без напоминаний (UTC)"""
+        _, tz_name, end = self.users[telegram_id]
+        return local_to_utc(tz_name, report_day, end) + timedelta(minutes=self.habits[telegram_id])
+
+    def _report_row(self, telegram_id: int, report_day: date, submitted_at: Optional[datetime] = None) -> dict:
+        user_id, tz_name, end = self.users[telegram_id]
+        self.submitted.add((telegram_id, report_day))
+        has_tasks = self.rng.random() < 0.8
+        if submitted_at is None:
+            jitter = timedelta(minutes=self.rng.randint(-10, 10))
+            submitted_at = min(self._habit_time(telegram_id, report_day) + jitter, self.clock.utcnow())
+        return {
+            "user_id": user_id,
+            "telegram_id": telegram_id,
+            "report_date": datetime.combine(report_day, datetime.min.time()) + timedelta(hours=18),
+            "report_day": report_day,
+            "report_text": f"Задачи сотрудника {telegram_id} за {report_day}" if has_tasks else None,
+            "has_tasks": has_tasks,
+            "submitted_at": submitted_at,
+            "reminder_count": 0,
+        }
+
+    # ---------- прогон ----------
+
+    def _timeline(self) -> Dict[datetime, List[str]]:
+        """Запуски задач за сутки D по UTC, как их поставил бы APScheduler"""
+        start = datetime.combine(self.day, datetime.min.time())
+        end = start + timedelta(days=1)
+        timeline: Dict[datetime, List[str]] = {}
+
+        def add(at: datetime, job: str):
+            if start <= at < end:
+                timeline.setdefault(at, []).append(job)
+
+        for bucket in sorted(self.scheduler._bucket_timezones):
+            add(start + timedelta(minutes=bucket), f"notification:{bucket}")
+        for minute in range(0, 24 * 60, self.args.tick_minutes):
+            add(start + timedelta(minutes=minute), "reminders")
+            add(start + timedelta(minutes=minute), "outbox")
+            add(start + timedelta(minutes=minute), "reminder_log")
+        hh, mm = map(int, settings.housekeeping_time.split(":"))
+        add(start + timedelta(hours=hh, minutes=mm), "housekeeping")
+        hh, mm = map(int, settings.weekly_report_time.split(":"))
+        for shift in (-1, 0, 1):
+            local_day = self.day + timedelta(days=shift)
+            add(local_to_utc(settings.timezone, local_day, 23 * 60 + 59), "daily_admin_report")
+            if local_day.weekday() == settings.weekly_report_day:
+                add(local_to_utc(settings.timezone, local_day, hh * 60 + mm), "weekly_report")
+        return timeline
+
+    async def run(self):
+        for at, jobs in sorted(self._timeline().items()):
+            self.clock.set(at)
+            await self._simulate_submissions()
+            for job in jobs:
+                await self._run_job(job)
+
+    async def _run_job(self, job: str):
+        name, _, arg = job.partition(":")
+        if name == "notification":
+            coro = self.scheduler._send_daily_notifications(int(arg))
+        elif name == "reminders":
+            coro = self.scheduler._send_hourly_reminders()
+        elif name == "outbox":
+            coro = self.scheduler._drain_outbox()
+        elif name == "reminder_log":
+            coro = self.scheduler.outbox.events.flush()
+        elif name == "housekeeping":
+            coro = self.scheduler._housekeeping()
+        elif name == "daily_admin_report":
+            coro = self.scheduler._send_daily_admin_report()
+        else:
+            coro = self.scheduler._send_weekly_report()
+
+        stats = self.stats.setdefault("notifications" if name == "notification" else name, JobStats())
+        queries, messages = self.queries, self.bot.messages
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        await coro
+        stats.wall_seconds += time.perf_counter() - started
+        stats.runs += 1
+        stats.queries += self.queries - queries
+        stats.messages += self.bot.messages - messages
+        stats.max_messages_per_run = max(stats.max_messages_per_run, self.bot.messages - messages)
+        if tracemalloc.is_tracing():
+            stats.peak_memory_kb = max(stats.peak_memory_kb, tracemalloc.get_traced_memory()[1] / 1024)
+
+    async def _simulate_submissions(self):
+        """
+        Ожидающие напоминаний сдают отчёт в своё привычное время,
+        а часть — раньше (к очередному тику, после напоминания)
+        """
+        if not self.args.submit_per_tick:
+            return
+        async with db_manager.session() as session:
+            result = await session.execute(
+                select(ReminderSchedule.telegram_id, ReminderSchedule.report_day)
+                .where(ReminderSchedule.next_reminder_at.is_not(None))
+            )
+            pending = [
+                (telegram_id, report_day)
+                for telegram_id, report_day in result.all()
+                if (telegram_id, report_day) not in self.submitted and telegram_id not in self.blocked
+            ]
+            reports = [
+                self._report_row(telegram_id, report_day, self.clock.utcnow())
+                for telegram_id, report_day in pending
+                if self.clock.utcnow() >= self._habit_time(telegram_id, report_day)
+                or self.rng.random() < self.args.submit_per_tick
+            ]
+            if reports:
+                await session.execute(insert(DailyReport), reports)
+                await session.commit()
+
+    # ---------- итоги ----------
+
+    def summary(self) -> dict:
+        messages = sum(s.messages for s in self.stats.values())
+        return {
+            "date": self.day.isoformat(),
+            "users": self.args.users,
+            "seed": self.args.seed,
+            "jobs": {name: asdict(stats) for name, stats in self.stats.items()},
+            "bot_calls": dict(self.bot.calls),
+            "messages": messages,
+            "blocked": len(self.blocked),
+            # Доля сотрудников, сдавших отчёт за день D
+            "compliance": round(sum(1 for _, day in self.submitted if day == self.day) / max(1, len(self.users)), 3),
+            # Сколько заняла бы отправка при реальном лимите скорости Telegram
+            "projected_send_seconds": round(messages / settings.broadcast_rate_per_second, 1),
+        }
+
+    def print_summary(self, summary: dict):
+        header = f"{'job':<22}{'runs':>6}{'wall, s':>10}{'queries':>10}{'messages':>10}{'max/run':>9}{'peak, KB':>11}"
+        print(f"Симуляция {summary['date']}: сотрудников {summary['users']}, seed {summary['seed']}")
+        print(header)
+        print("-" * len(header))
+        for name, stats in summary["jobs"].items():
+            print(
+                f"{name:<22}{stats['runs']:>6}{stats['wall_seconds']:>10.3f}{stats['queries']:>10}"
+                f"{stats['messages']:>10}{stats['max_messages_per_run']:>9}{stats['peak_memory_kb']:>11.0f}"
+            )
+        print("-" * len(header))
+        print(f"Вызовы Bot API: {summary['bot_calls']}, сдали отчёт за день: {summary['compliance']:.1%}")
+        print(
+            f"Сообщений: {summary['messages']}, при {settings.broadcast_rate_per_second:g}/с — "
+            f"{summary['projected_send_seconds']} с отправки"
+        )
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Симуляция дня планировщика на фиктивных часах")
+    parser.add_argument("--users", type=int, default=10000, help="число синтетических сотрудников")
+    parser.add_argument("--date", type=date.fromisoformat, default=date(2026, 1, 15), help="день симуляции (UTC), YYYY-MM-DD")
+    parser.add_argument("--seed", type=int, default=1, help="seed генератора (прогон детерминирован)")
+    parser.add_argument("--timezones", default=DEFAULT_TIMEZONES, help="пояса сотрудников через запятую")
+    parser.add_argument("--report-rate", type=float, default=0.6, help="доля отчётов, сданных до уведомления")
+    parser.add_argument("--submit-per-tick", type=float, default=0.02, help="доля ожидающих, сдающих отчёт к тику")
+    parser.add_argument("--blocked-rate", type=float, default=0.01, help="доля заблокировавших бота")
+    parser.add_argument("--tick-minutes", type=int, default=5, help="шаг тика напоминаний, минут")
+    parser.add_argument("--history-days", type=int, default=28, help="дней истории отчётов до дня D")
+    parser.add_argument("--policy", choices=("fixed", "adaptive"), help="REMINDER_POLICY для прогона")
+    parser.add_argument("--spread", type=int, help="REMINDER_SPREAD_SECONDS для прогона")
+    parser.add_argument("--rate", type=float, default=1_000_000, help="лимит рассылки в симуляции, сообщений/с")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="задержка одного вызова Bot API, мс")
+    parser.add_argument("--json", dest="json_path", help="записать итоги в JSON-файл")
+    parser.add_argument("--no-memory", action="store_true", help="не замерять память (tracemalloc замедляет прогон)")
+    parser.add_argument("--log-level", default="ERROR", help="уровень логов бота")
+    return parser.parse_args(argv)
+
+
+async def simulate(args: argparse.Namespace) -> dict:
+    # Недельный отчёт без обращения к AI: сразу резервная генерация
+    async def offline_weekly_report(reports_data, language="ru"):
+        return deepseek_service._generate_fallback_report(reports_data, language)
+    deepseek_service.generate_weekly_report = offline_weekly_report
+
+    if args.policy is not None:
+        settings.reminder_policy = args.policy
+    if args.spread is not None:
+        settings.reminder_spread_seconds = args.spread
+    simulation = Simulation(args)
+    with tempfile.TemporaryDirectory() as tmp:
+        await simulation.setup(os.path.join(tmp, "simulation.db"))
+        if not args.no_memory:
+            tracemalloc.start()
+        try:
+            await simulation.run()
+        finally:
+            tracemalloc.stop()
+            await db_manager.dispose()
+    summary = simulation.summary()
+    simulation.print_summary(summary)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    return summary
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    logger.remove()
+    logger.add(sys.stderr, level=args.log_level)
+    asyncio.run(simulate(args))
@@ -0,0 +1,123 @@
+"""
+Общие фикстуры тестов: настройки из окружения, чистая база SQLite на тест,
+управляемые часы и планировщик с ботом без сети
+"""
+import asyncio
+import os
+from datetime import datetime
+from typing import List, Optional
+
+# Обязательные настройки — до первого импорта config
+os.environ.update(
+    BOT_TOKEN="1:test",
+    ADMIN_IDS="1",
+    DB_USER="test",
+    DB_PASSWORD="test",
+    DB_NAME="test",
+    DEEPSEEK_API_KEY="test",
+    LEADER_ELECTION="off",
+    SCHEDULER_SHARDING="off",
+)
+
+import pytest
+from sqlalchemy import insert
+
+from config.settings import settings
+from bot.database import db_manager
+from bot.database.models import Base, User
+from bot.utils import Clock, FakeClock, set_clock, end_bucket_utc
+from bot.services import SchedulerService, WorkCalendar
+from bot.services.broadcast_service import Broadcaster
+from bot.services.leader_service import LeaderElector, AlwaysLeaderLease
+from bot.services.shard_service import ShardCoordinator
+
+
+# Среда, рабочий день по умолчанию; 15:00 UTC = 19:00 по Баку
+NOW = datetime(2026, 10, 14, 15, 0)
+
+
+class RecordingBot:
+    """Бот без сети: запоминает вызовы Bot API"""
+
+    def __init__(self):
+        self.calls: List = []
+
+    async def __call__(self, method, request_timeout: Optional[int] = None):
+        self.calls.append(method)
+        return True
+
+    def sent_to(self, chat_id: int) -> List:
+        return [method for method in self.calls if getattr(method, "chat_id", None) == chat_id]
+
+
+@pytest.fixture
+def run(tmp_path):
+    """Чистая база на тест; run(coro) выполняет корутину в цикле теста"""
+    loop = asyncio.new_event_loop()
+    db_manager.configure(f"sqlite+aiosqlite:///{tmp_path / 'bot.db'}")
+
+    async def create_schema():
+        async with db_manager.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    loop.run_until_complete(create_schema())
+    yield loop.run_until_complete
+    loop.run_until_complete(db_manager.dispose())
+    loop.close()
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock(NOW)
+    set_clock(fake)
+    yield fake
+    set_clock(Clock())
+
+
+@pytest.fixture
+def add_users(run):
+    """add_users(telegram_id, ..., **поля) — сотрудники с графиком 09:00–18:00 по Баку"""
+
+    def add(*telegram_ids: int, **fields):
+        rows = [
+            {
+                "telegram_id": telegram_id,
+                "first_name": f"User{telegram_id}",
+                "last_name": "Test",
+                "language": "ru",
+                "work_start_minute": 9 * 60,
+                "work_end_minute": 18 * 60,
+                "timezone": settings.timezone,
+                "end_bucket_utc": end_bucket_utc(18 * 60, settings.timezone, NOW.date()),
+                "is_active": True,
+                "is_admin": False,
+                **fields,
+            }
+            for telegram_id in telegram_ids
+        ]
+
+        async def insert_rows():
+            async with db_manager.session() as session:
+                await session.execute(insert(User), rows)
+                await session.commit()
+
+        run(insert_rows())
+
+    return add
+
+
+@pytest.fixture
+def scheduler(run, clock):
+    """Планировщик-лидер без шардов; вызовы Bot API копятся в scheduler.bot.calls"""
+    bot = RecordingBot()
+    calendar = WorkCalendar(settings.working_days_list, settings.holidays_list)
+    service = SchedulerService(
+        bot,
+        leader=LeaderElector(AlwaysLeaderLease(), settings.leader_heartbeat_seconds),
+        shards=ShardCoordinator("test", None, settings.shard_heartbeat_seconds),
+        calendar=calendar,
+    )
+    service.broadcaster = Broadcaster(bot, per_chat_interval=0)
+    run(calendar.refresh())
+    run(service.leader.heartbeat())
+    return service
@@ -0,0 +1,79 @@
+"""
+Итоги дней (daily_stats): отчёты учитываются в открытом дне сразу,
+закрытие дня дописывает напоминания не сдавшим и фиксирует число активных сотрудников
+"""
+from datetime import date, datetime, timedelta
+
+from bot.database import (
+    db_manager,
+    DailyReportRepository,
+    DailyStatsRepository,
+    ReminderScheduleRepository,
+    UserRepository,
+)
+
+DAY = date(2026, 10, 14)
+DUE = datetime(2026, 10, 14, 14, 0)
+
+
+def _stat(run):
+    async def query():
+        async with db_manager.session() as session:
+            stats = await DailyStatsRepository.get_range(session, DAY, DAY)
+            return [
+                (stat.total_active, stat.submitted, stat.no_tasks, stat.late, stat.reminders_sent, stat.sealed_at is not None)
+                for stat in stats
+            ]
+    return run(query())
+
+
+def _day_with_reports(run, add_users):
+    add_users(501, 502, 503, 504)
+    # Администраторы отчёт не сдают и в total_active не входят
+    add_users(505, is_admin=True)
+    add_users(1)
+
+    async def prepare():
+        async with db_manager.session() as session:
+            await ReminderScheduleRepository.seed(session, [(501, DUE, None), (503, DUE, None)], DAY)
+            await ReminderScheduleRepository.claim_due(session, DUE, DUE + timedelta(hours=1))
+            for telegram_id, has_tasks in [(501, True), (502, False)]:
+                user = await UserRepository.get_by_telegram_id(session, telegram_id)
+                await DailyReportRepository.create(
+                    session, user.id, telegram_id, datetime(2026, 10, 14, 18, 30), "отчёт", has_tasks
+                )
+    run(prepare())
+
+
+def test_open_day_counts_reports_as_they_come(run, add_users):
+    _day_with_reports(run, add_users)
+    # 501 сдал после напоминания, 502 — без задач; 503 напомнили, но он не сдал
+    assert _stat(run) == [(4, 2, 1, 1, 1, False)]
+
+
+def test_sealed_day_adds_reminders_of_non_reporters(run, add_users):
+    _day_with_reports(run, add_users)
+
+    async def seal():
+        async with db_manager.session() as session:
+            return await DailyStatsRepository.seal_before(session, DAY + timedelta(days=1))
+    assert run(seal()) == [DAY]
+    assert _stat(run) == [(4, 2, 1, 1, 2, True)]
+
+    # Закрытый день не зависит от последующих отключений
+    async def deactivate():
+        async with db_manager.session() as session:
+            await UserRepository.deactivate_unreachable(session, [504])
+    run(deactivate())
+    assert _stat(run) == [(4, 2, 1, 1, 2, True)]
+
+
+def test_backfill_matches_sealed_rollup(run, add_users):
+    _day_with_reports(run, add_users)
+
+    async def backfill():
+        async with db_manager.session() as session:
+            return await DailyStatsRepository.backfill(session, DAY, DAY)
+    assert run(backfill()) == 1
+    total_active, submitted, no_tasks, late, _, sealed = _stat(run)[0]
+    assert (total_active, submitted, no_tasks, late, sealed) == (4, 2, 1, 1, True)
@@ -0,0 +1,94 @@
+"""
+split_html: части не длиннее предела, теги в каждой части сбалансированы,
+текст не теряется — в том числе при глубокой вложенности и незакрытых тегах
+"""
+import random
+import re
+
+import pytest
+
+from bot.utils import split_html
+
+TAG = re.compile(r"<(/?)([a-zA-Z][\w-]*)[^>]*>")
+MARKUP = re.compile(r"<[^>]*>")
+
+
+def _balanced(part: str) -> bool:
+    stack = []
+    for closing, name in TAG.findall(part):
+        if not closing:
+            stack.append(name)
+        elif not stack or stack.pop() != name:
+            return False
+    return not stack
+
+
+def _words(html: str) -> str:
+    return re.sub(r"\s+", "", MARKUP.sub("", html))
+
+
+def _random_html(rng: random.Random, balanced: bool) -> str:
+    chunks, stack = [], []
+    for _ in range(rng.randint(50, 400)):
+        roll = rng.random()
+        if roll < 0.15:
+            name = rng.choice(["b", "i", "u", "code"])
+            chunks.append(f"<{name}>")
+            stack.append(name)
+        elif roll < 0.2:
+            chunks.append(f'<a href="https://example.com/{"x" * rng.randint(1, 120)}">')
+            stack.append("a")
+        elif roll < 0.32 and stack:
+            chunks.append(f"</{stack.pop()}>")
+        elif roll < 0.4:
+            chunks.append("\n")
+        else:
+            chunks.append(rng.choice(["слово", "word", "&amp;", "x" * rng.randint(1, 150)]) + " ")
+    if balanced:
+        chunks.extend(f"</{name}>" for name in reversed(stack))
+    return "".join(chunks)
+
+
+def _check(text: str, limit: int):
+    parts = split_html(text, limit)
+    assert all(len(part) <= limit for part in parts), [len(part) for part in parts]
+    assert _words("".join(parts)) == _words(text)
+    return parts
+
+
+def test_short_text_is_one_part():
+    assert split_html("<b>коротко</b>", 100) == ["<b>коротко</b>"]
+
+
+def test_cuts_on_newline_and_rebalances_tags():
+    text = "<b>" + "\n".join(f"строка {i}" for i in range(20)) + "</b>"
+    parts = _check(text, 100)
+    assert len(parts) > 1
+    assert all(_balanced(part) and part.startswith("<b>") for part in parts)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("limit", [60, 200, 1000])
+def test_random_balanced_html(seed, limit):
+    parts = _check(_random_html(random.Random(seed), balanced=True), limit)
+    assert all(_balanced(part) for part in parts)
+
+
+@pytest.mark.parametrize("seed", range(20))
+@pytest.mark.parametrize("limit", [60, 200])
+def test_random_unbalanced_html_respects_limit(seed, limit):
+    # Незакрытые в исходнике теги остаются незакрытыми только в последней части
+    parts = _check(_random_html(random.Random(seed), balanced=False), limit)
+    assert all(_balanced(part) for part in parts[:-1])
+
+
+def test_deep_nesting_does_not_overflow():
+    text = "".join(f'<a href="https://example.com/{i:04}">' for i in range(30)) + "слово " * 200
+    parts = _check(text, 120)
+    assert all(_balanced(part) for part in parts[:-1])
+
+
+def test_tag_longer_than_limit_is_dropped_with_its_pair():
+    text = f'<a href="https://example.com/{"x" * 300}">ссылка</a> ' + "текст " * 50
+    parts = _check(text, 100)
+    assert all(_balanced(part) and "<a" not in part for part in parts)
@@ -0,0 +1,47 @@
+"""
+Ежедневное обслуживание: отдельная задача, не зависит от рабочих дней
+"""
+from datetime import datetime
+
+import pytz
+
+from sqlalchemy import select
+
+from bot.database import db_manager, DailyReportRepository, UserRepository
+from bot.database.models import DailyStat, JobRun
+
+
+def test_housekeeping_runs_on_saturday(run, clock, scheduler, add_users):
+    add_users(100)
+
+    async def submit_thursday():
+        async with db_manager.session() as session:
+            user = await UserRepository.get_by_telegram_id(session, 100)
+            await DailyReportRepository.create(session, user.id, 100, datetime(2026, 10, 15, 18, 30), "done", True)
+    run(submit_thursday())
+
+    # Суббота — нерабочий день, обслуживание всё равно выполняется
+    # и закрывает дни раньше вчерашнего (UTC), то есть четверг
+    clock.set(datetime(2026, 10, 17, 0, 5))
+    run(scheduler._housekeeping())
+    run(scheduler._housekeeping())
+
+    async def state():
+        async with db_manager.session() as session:
+            stat = await session.get(DailyStat, datetime(2026, 10, 15).date())
+            runs = (await session.execute(select(JobRun.job_key, JobRun.status))).all()
+            return stat, runs
+
+    stat, runs = run(state())
+    assert stat.sealed_at is not None
+    assert stat.submitted == 1
+    assert runs == [("housekeeping", "done")]
+
+
+def test_housekeeping_is_scheduled_on_the_leader_only(scheduler):
+    scheduler._schedule_housekeeping()
+
+    job = scheduler.scheduler.get_job("housekeeping")
+    assert job.func.__wrapped__ == scheduler._housekeeping
+    saturday = job.trigger.get_next_fire_time(None, pytz.utc.localize(datetime(2026, 10, 16, 23, 0)))
+    assert saturday.replace(tzinfo=None) == datetime(2026, 10, 17, 0, 5)
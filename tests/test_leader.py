@@ -0,0 +1,55 @@
+"""
+Выбор лидера между репликами: аренда в памяти процесса и в БД ведёт себя одинаково
+"""
+import pytest
+
+from bot.services.leader_service import DatabaseLease, InProcessLease, Lease, LeaderElector
+
+LEASES = {"memory": InProcessLease, "db": DatabaseLease}
+
+
+@pytest.fixture(params=["memory", "db"])
+def backend(request, run):
+    InProcessLease._leases.clear()
+    return request.param
+
+
+def test_lease_has_one_holder(run, backend):
+    first = LEASES[backend]("scheduler", "a", 60)
+    second = LEASES[backend]("scheduler", "b", 60)
+
+    assert run(first.try_acquire()) is True
+    assert run(second.try_acquire()) is False
+    # Продление своей аренды
+    assert run(first.try_acquire()) is True
+
+    run(first.release())
+    assert run(second.try_acquire()) is True
+    assert run(first.try_acquire()) is False
+
+
+def test_expired_lease_is_taken_over(run, backend):
+    # Отрицательный ttl — аренда истекла сразу после продления
+    assert run(LEASES[backend]("scheduler", "a", -1).try_acquire()) is True
+    assert run(LEASES[backend]("scheduler", "b", 60).try_acquire()) is True
+    assert run(LEASES[backend]("scheduler", "a", 60).try_acquire()) is False
+
+
+def test_elector_follows_lease(run, backend):
+    first = LeaderElector(LEASES[backend]("scheduler", "a", 60), 1)
+    second = LeaderElector(LEASES[backend]("scheduler", "b", 60), 1)
+
+    assert run(first.heartbeat()) is True
+    assert run(second.heartbeat()) is False
+    run(first.stop())
+    assert first.is_leader is False
+    assert run(second.heartbeat()) is True
+
+
+def test_lease_interface_is_abstract():
+    class Incomplete(Lease):
+        async def try_acquire(self) -> bool:
+            return True
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,78 @@
+"""
+Middleware: промах кэша пользователей не создаёт сессию update,
+хендлер с db="read" по-прежнему переходит на пул чтения
+"""
+from datetime import datetime
+
+from aiogram.types import Chat, Message, User as TgUser
+
+from bot.database import db_manager, user_cache
+from bot.middlewares.middlewares import UserCheckMiddleware
+
+
+def _message(telegram_id: int) -> Message:
+    return Message(
+        message_id=1,
+        date=datetime(2026, 10, 14, 15, 0),
+        chat=Chat(id=telegram_id, type="private"),
+        from_user=TgUser(id=telegram_id, is_bot=False, first_name="Test"),
+        text="/start",
+    )
+
+
+def _check(run, telegram_id: int):
+    seen = {}
+
+    async def handler(event, data):
+        seen.update(data)
+        seen["started"] = data["session"].started
+
+    async def call():
+        session = db_manager.lazy_session()
+        try:
+            await UserCheckMiddleware()(handler, _message(telegram_id), {"session": session})
+        finally:
+            await session.close()
+        return session
+
+    session = run(call())
+    return seen, session
+
+
+def test_cache_miss_leaves_update_session_unstarted(run, add_users):
+    add_users(100)
+    user_cache.clear()
+
+    seen, session = _check(run, 100)
+
+    assert seen["is_registered"] is True
+    assert seen["user"].telegram_id == 100
+    assert seen["started"] is False
+    # Пользователь попал в кэш — следующий update обходится без запроса
+    assert user_cache.get(100) is not None
+
+
+def test_read_mode_still_applies_after_cache_miss(run, add_users):
+    add_users(101)
+    user_cache.clear()
+    modes = []
+
+    async def handler(event, data):
+        modes.append(data["session"].use_read_only())
+
+    async def call():
+        session = db_manager.lazy_session()
+        try:
+            await UserCheckMiddleware()(handler, _message(101), {"session": session})
+        finally:
+            await session.close()
+
+    run(call())
+    assert modes == [True]
+
+
+def test_unknown_user_is_not_registered(run):
+    user_cache.clear()
+    seen, _ = _check(run, 999)
+    assert seen["is_registered"] is False
+    assert seen["started"] is False
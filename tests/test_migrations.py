@@ -0,0 +1,81 @@
+"""
+Миграции: база, созданная SQL-скриптом из README (без alembic_version), доводится
+до head одним upgrade — с переносом данных — и совпадает с моделями
+"""
+import asyncio
+from datetime import date
+
+import pytest
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import text
+
+from bot.database import db_manager
+from bot.database.connection import head_revision
+from bot.database.models import Base
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    """База на ревизии 0001 без таблицы alembic_version — как после SQL-скрипта; run(coro) выполняет корутину"""
+    loop = asyncio.new_event_loop()
+    db_manager.configure(f"sqlite+aiosqlite:///{tmp_path / 'bot.db'}")
+
+    async def create():
+        await db_manager.migrate("0001")
+        async with db_manager.engine.begin() as conn:
+            await conn.execute(text("DROP TABLE alembic_version"))
+
+    loop.run_until_complete(create())
+    yield loop.run_until_complete
+    loop.run_until_complete(db_manager.dispose())
+    loop.close()
+
+
+def _execute(run, *statements):
+    async def execute():
+        async with db_manager.engine.begin() as conn:
+            return [(await conn.execute(text(statement))).all() for statement in statements]
+    return run(execute())
+
+
+def test_startup_refuses_baseline_schema(baseline):
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        baseline(db_manager.check_schema(auto_migrate=False))
+
+
+def test_upgrade_baseline_database(baseline):
+    async def fill():
+        async with db_manager.engine.begin() as conn:
+            await conn.execute(text(
+                "INSERT INTO users (telegram_id, first_name, last_name, language, work_time) VALUES "
+                "(10, 'Анна', 'Иванова', 'ru', '9:00-18:00'), (11, 'Борис', 'Петров', 'az', '10:00-19:00')"
+            ))
+            await conn.execute(text(
+                "INSERT INTO daily_reports (user_id, telegram_id, report_date, report_text, has_tasks) VALUES "
+                "(1, 10, '2026-10-12 18:05:00.000000', 'первый', 1), "
+                "(1, 10, '2026-10-12 18:40:00.000000', 'повтор', 1), "
+                "(2, 11, '2026-10-12 19:10:00.000000', NULL, 0)"
+            ))
+    baseline(fill())
+
+    assert baseline(db_manager.check_schema(auto_migrate=True)) == head_revision()
+
+    users, reports, stats = _execute(
+        baseline,
+        "SELECT telegram_id, work_start_minute, work_end_minute, timezone, end_bucket_utc FROM users "
+        "ORDER BY telegram_id",
+        "SELECT report_text, report_day FROM daily_reports ORDER BY id",
+        "SELECT day, submitted, no_tasks FROM daily_stats",
+    )
+    assert users == [(10, 540, 1080, "Asia/Baku", 14 * 60), (11, 600, 1140, "Asia/Baku", 15 * 60)]
+    # Повторный отчёт за день удалён, остался первый
+    assert reports == [("первый", "2026-10-12"), (None, "2026-10-12")]
+    assert [(date.fromisoformat(day), submitted, no_tasks) for day, submitted, no_tasks in stats] == [
+        (date(2026, 10, 12), 2, 1)
+    ]
+
+    async def diff():
+        async with db_manager.engine.connect() as conn:
+            return await conn.run_sync(lambda sync: compare_metadata(MigrationContext.configure(sync), Base.metadata))
+    assert baseline(diff()) == []
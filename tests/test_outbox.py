@@ -0,0 +1,113 @@
+"""
+Outbox: перед отправкой сообщения о дне отчёта сверяются с БД,
+удаление пользователя убирает его очередь
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select, update
+
+from bot.database import db_manager, DailyReportRepository, UserRepository
+from bot.database.models import OutboxMessage, ReminderSchedule, User
+from bot.services.outbox_service import OutboxService
+
+
+def _enqueue(run, outbox, clock, *chat_ids, report_day=None):
+    async def enqueue():
+        async with db_manager.session() as session:
+            await outbox.enqueue(
+                session,
+                "reminder",
+                [
+                    outbox.message(f"test:{chat_id}", chat_id, "reminder", "ru", report_day=report_day)
+                    for chat_id in chat_ids
+                ],
+            )
+    run(enqueue())
+
+
+def _drain(run, outbox, scheduler):
+    async def drain():
+        async with db_manager.session() as session:
+            return await outbox.drain(session, scheduler.broadcaster)
+    return run(drain())
+
+
+def _statuses(run):
+    async def query():
+        async with db_manager.session() as session:
+            result = await session.execute(select(OutboxMessage.chat_id, OutboxMessage.status))
+            return dict(result.all())
+    return run(query())
+
+
+def test_reminder_dropped_after_report_submitted(run, clock, scheduler, add_users):
+    add_users(100, 101)
+    outbox = OutboxService()
+    _enqueue(run, outbox, clock, 100, 101, report_day=clock.now.date())
+
+    async def submit():
+        async with db_manager.session() as session:
+            user = await UserRepository.get_by_telegram_id(session, 100)
+            await DailyReportRepository.create(session, user.id, 100, datetime(2026, 10, 14, 19, 0), "done", True)
+    run(submit())
+    _drain(run, outbox, scheduler)
+
+    assert scheduler.bot.sent_to(100) == []
+    assert len(scheduler.bot.sent_to(101)) == 1
+    assert _statuses(run) == {100: "cancelled", 101: "sent"}
+    assert outbox.stats.cancelled == 1
+
+
+def test_reminder_dropped_after_cutoff(run, clock, scheduler, add_users):
+    add_users(100)
+    outbox = OutboxService()
+    _enqueue(run, outbox, clock, 100, report_day=clock.now.date())
+
+    # 23:00 по Баку = 19:00 UTC: повтор, дошедший до очереди позже, не отправляется
+    clock.set(datetime(2026, 10, 14, 19, 0))
+    _drain(run, outbox, scheduler)
+
+    assert scheduler.bot.calls == []
+    assert _statuses(run) == {100: "cancelled"}
+
+
+def test_message_to_inactive_or_missing_user_dropped(run, clock, scheduler, add_users):
+    add_users(100, 101)
+    outbox = OutboxService()
+    _enqueue(run, outbox, clock, 100, 101, 102)
+
+    async def deactivate():
+        async with db_manager.session() as session:
+            await session.execute(update(User).where(User.telegram_id == 100).values(is_active=False))
+            await session.commit()
+    run(deactivate())
+    _drain(run, outbox, scheduler)
+
+    assert [method.chat_id for method in scheduler.bot.calls] == [101]
+    assert _statuses(run) == {100: "cancelled", 101: "sent", 102: "cancelled"}
+
+
+def test_delete_user_removes_queued_messages_and_reminders(run, clock, scheduler, add_users):
+    add_users(100, 101)
+    outbox = OutboxService()
+    _enqueue(run, outbox, clock, 100, 101, report_day=clock.now.date())
+
+    async def seed_and_delete():
+        async with db_manager.session() as session:
+            await session.execute(
+                insert(ReminderSchedule),
+                [
+                    {
+                        "telegram_id": telegram_id,
+                        "report_day": clock.now.date(),
+                        "next_reminder_at": clock.now + timedelta(hours=1),
+                    }
+                    for telegram_id in (100, 101)
+                ],
+            )
+            await session.commit()
+            assert await UserRepository.delete_user(session, 100)
+            return list(await session.scalars(select(ReminderSchedule.telegram_id)))
+
+    assert run(seed_and_delete()) == [101]
+    assert _statuses(run) == {101: "pending"}
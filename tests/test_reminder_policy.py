@@ -0,0 +1,70 @@
+"""
+Адаптивная политика напоминаний: первое напоминание, предел числа и учащение к отсечке
+"""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from bot.database import db_manager, ReminderScheduleRepository
+from bot.database.models import ReminderSchedule
+from bot.services.reminder_policy import ReminderPlan, ReminderPolicy
+
+
+def _policy() -> ReminderPolicy:
+    return ReminderPolicy(
+        interval_minutes=60,
+        min_samples=5,
+        lead_minutes=15,
+        max_reminders=3,
+        min_interval_minutes=15,
+    )
+
+
+def test_short_history_keeps_fixed_interval():
+    assert _policy().plan([120, 130]) == ReminderPlan(first_delay_minutes=60)
+
+
+def test_first_reminder_shortly_before_usual_submission():
+    plan = _policy().plan([100, 110, 120, 125, 130, 240], [0, 0, 0, 0, 0, 0])
+
+    # 80-й перцентиль: единичное опоздание на 240 минут не сдвигает время
+    assert plan.first_delay_minutes == 130 - 15
+
+
+def test_first_reminder_not_earlier_than_interval():
+    assert _policy().plan([0, 5, 10, 10, 20]).first_delay_minutes == 60
+
+
+def test_self_starter_gets_a_single_reminder():
+    assert _policy().plan([120] * 6, [0] * 6).max_reminders == 1
+
+
+def test_cap_follows_usual_reminder_count():
+    policy = _policy()
+
+    assert policy.plan([120] * 6, [1, 1, 1, 1, 1, 0]).max_reminders == 2
+    assert policy.plan([120] * 6, [5] * 6).max_reminders == 3
+
+
+def test_reminders_escalate_near_cutoff():
+    policy = _policy()
+    cutoff = datetime(2026, 10, 14, 19, 0)
+
+    assert policy.next_delay_minutes(cutoff - timedelta(hours=3), cutoff) == 60
+    assert policy.next_delay_minutes(cutoff - timedelta(minutes=80), cutoff) == 40
+    assert policy.next_delay_minutes(cutoff - timedelta(minutes=20), cutoff) == 15
+    assert policy.next_delay_minutes(cutoff, None) == 60
+
+
+def test_scheduler_brings_next_reminder_closer_to_cutoff(run, clock, scheduler, add_users):
+    add_users(100)
+    stop_at = clock.now + timedelta(minutes=40)
+
+    async def seed_and_tick():
+        async with db_manager.session() as session:
+            await ReminderScheduleRepository.seed(session, [(100, clock.now, None)], clock.now.date(), stop_at)
+        await scheduler._send_hourly_reminders()
+        async with db_manager.session() as session:
+            return await session.scalar(select(ReminderSchedule.next_reminder_at))
+
+    assert run(seed_and_tick()) == clock.now + timedelta(minutes=20)
@@ -0,0 +1,108 @@
+"""
+Очередь напоминаний: claim_due забирает каждую запись один раз (токен захвата)
+и закрывает записи, по которым напоминать больше не нужно
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from bot.database import db_manager, DailyReportRepository, ReminderScheduleRepository, UserRepository
+from bot.database.models import ReminderSchedule
+
+DAY = datetime(2026, 10, 14)
+DUE = datetime(2026, 10, 14, 14, 0)
+
+
+def _seed(run, *entries, stop_at=None):
+    async def seed():
+        async with db_manager.session() as session:
+            await ReminderScheduleRepository.seed(session, list(entries), DAY.date(), stop_at=stop_at)
+    run(seed())
+
+
+def _claim(session, now, next_at=None):
+    return ReminderScheduleRepository.claim_due(session, now, next_at)
+
+
+def _rows(run):
+    async def query():
+        async with db_manager.session() as session:
+            result = await session.execute(
+                select(ReminderSchedule.telegram_id, ReminderSchedule.next_reminder_at, ReminderSchedule.reminders_sent)
+            )
+            return {telegram_id: (next_at, sent) for telegram_id, next_at, sent in result.all()}
+    return run(query())
+
+
+def test_claim_moves_next_reminder_and_counts(run, add_users):
+    add_users(401, 402)
+    _seed(run, (401, DUE, None), (402, DUE + timedelta(hours=2), None))
+    next_at = DUE + timedelta(hours=1)
+
+    async def claim():
+        async with db_manager.session() as session:
+            return await _claim(session, DUE + timedelta(minutes=1), next_at)
+    claimed = run(claim())
+
+    assert [(user.telegram_id, day) for user, day, _ in claimed] == [(401, DAY.date())]
+    rows = _rows(run)
+    assert rows[401] == (next_at, 1)
+    assert rows[402] == (DUE + timedelta(hours=2), 0)
+
+
+def test_concurrent_claims_take_each_row_once(run, add_users):
+    ids = list(range(410, 430))
+    add_users(*ids)
+    _seed(run, *[(telegram_id, DUE, None) for telegram_id in ids])
+
+    async def claim():
+        async with db_manager.session() as session:
+            return await _claim(session, DUE, DUE + timedelta(hours=1))
+
+    async def both():
+        return await asyncio.gather(claim(), claim())
+
+    first, second = run(both())
+    claimed = [user.telegram_id for user, _, _ in first + second]
+    assert sorted(claimed) == ids
+
+    async def again():
+        async with db_manager.session() as session:
+            return await _claim(session, DUE)
+    assert run(again()) == []
+
+
+def test_claim_closes_finished_rows(run, add_users):
+    add_users(441, 442, 443, 444)
+    add_users(445, is_admin=True)
+    add_users(446, is_active=False)
+    add_users(1)  # ADMIN_IDS в тестах
+    _seed(run, (441, DUE, None), (442, DUE, 0), (443, DUE, None), (445, DUE, None), (446, DUE, None), (1, DUE, None))
+    _seed(run, (444, DUE, None), stop_at=DUE)
+
+    async def report_and_claim():
+        async with db_manager.session() as session:
+            user = await UserRepository.get_by_telegram_id(session, 443)
+            await DailyReportRepository.create(session, user.id, 443, DAY.replace(hour=17), "готово", True)
+            return await _claim(session, DUE, DUE + timedelta(hours=1))
+    claimed = run(report_and_claim())
+
+    # Осталась только запись 441; у остальных напоминаний больше нет
+    assert [user.telegram_id for user, _, _ in claimed] == [441]
+    rows = _rows(run)
+    assert 443 not in rows  # сданный отчёт убирает день из очереди
+    assert {telegram_id: next_at for telegram_id, (next_at, _) in rows.items() if telegram_id != 441} == {
+        442: None, 444: None, 445: None, 446: None, 1: None,
+    }
+
+
+def test_pending_reporters_skip_admins(run, add_users):
+    add_users(451, 452)
+    add_users(453, is_admin=True)
+    add_users(1)
+
+    async def pending():
+        async with db_manager.session() as session:
+            return await UserRepository.get_pending_reporters(session, DAY.date())
+    assert sorted(user.telegram_id for user in run(pending())) == [451, 452]
@@ -0,0 +1,55 @@
+"""
+Журнал запусков: плановая задача выполняется за день один раз,
+ручной запуск (/debug_*) журнал не трогает и плановый не блокирует
+"""
+from sqlalchemy import select
+
+from bot.database import db_manager
+from bot.database.models import JobRun, OutboxMessage, ReminderSchedule
+
+
+def _job_runs(run):
+    async def query():
+        async with db_manager.session() as session:
+            return (await session.execute(select(JobRun.job_key, JobRun.status))).all()
+    return run(query())
+
+
+def test_daily_admin_report_runs_once_per_day(run, clock, scheduler):
+    run(scheduler._send_daily_admin_report(clock.now.date()))
+    run(scheduler._send_daily_admin_report(clock.now.date()))
+
+    assert len(scheduler.bot.sent_to(1)) == 1
+    assert _job_runs(run) == [("daily_admin_report", "done")]
+
+
+def test_debug_admin_report_does_not_block_scheduled_run(run, clock, scheduler):
+    run(scheduler._send_daily_admin_report(clock.now.date(), record=False))
+    assert _job_runs(run) == []
+
+    run(scheduler._send_daily_admin_report(clock.now.date()))
+
+    assert len(scheduler.bot.sent_to(1)) == 2
+    assert _job_runs(run) == [("daily_admin_report", "done")]
+
+
+def test_debug_notifications_do_not_block_scheduled_run(run, clock, scheduler, add_users):
+    add_users(100, 101)
+    run(scheduler._sync_notification_buckets())
+    (bucket,) = scheduler._bucket_timezones
+
+    run(scheduler._send_daily_notifications(bucket, clock.now.date(), record=False))
+    run(scheduler._send_daily_notifications(bucket, clock.now.date()))
+
+    async def state():
+        async with db_manager.session() as session:
+            keys = list(await session.scalars(select(OutboxMessage.dedupe_key).order_by(OutboxMessage.id)))
+            queued = list(await session.scalars(select(ReminderSchedule.telegram_id)))
+            return keys, queued
+
+    keys, queued = run(state())
+    # Ручной запуск — свои ключи и без очереди напоминаний; плановый поставил всё заново
+    assert len(keys) == 4
+    assert sum(key.startswith("debug:") for key in keys) == 2
+    assert sorted(queued) == [100, 101]
+    assert [key for key, _ in _job_runs(run)] == [f"notification_b{bucket}"]
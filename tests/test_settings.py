@@ -0,0 +1,13 @@
+"""
+Настройки: старые .env продолжают загружаться
+"""
+from config.settings import Settings
+
+
+def test_legacy_notification_times_are_accepted(tmp_path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("NOTIFICATION_TIME_1=18:00\nNOTIFICATION_TIME_2=19:00\n", encoding="utf-8")
+
+    settings = Settings(_env_file=env_file)
+
+    assert settings.notification_time_1 == "18:00"
@@ -0,0 +1,90 @@
+"""
+Шардирование по репликам: состав реплик в памяти процесса и в БД ведёт себя одинаково,
+шарды пересчитываются при входе и выходе реплики
+"""
+import pytest
+from sqlalchemy import select
+
+from config.settings import settings
+from bot.database import db_manager
+from bot.database.models import OutboxMessage
+from bot.services import SchedulerService
+from bot.services.leader_service import AlwaysLeaderLease, LeaderElector
+from bot.services.shard_service import DatabaseMembership, InProcessMembership, Membership, ShardCoordinator
+
+MEMBERSHIPS = {"memory": InProcessMembership, "db": DatabaseMembership}
+
+
+@pytest.fixture(params=["memory", "db"])
+def backend(request, run):
+    InProcessMembership._members.clear()
+    return request.param
+
+
+def test_shards_follow_membership(run, backend):
+    coordinators = {
+        replica_id: ShardCoordinator(replica_id, MEMBERSHIPS[backend](replica_id, 60), 1)
+        for replica_id in ("a", "b", "c")
+    }
+    for coordinator in coordinators.values():
+        run(coordinator.heartbeat())
+    shards = {replica_id: run(coordinator.heartbeat()) for replica_id, coordinator in coordinators.items()}
+    assert shards == {"a": (0, 3), "b": (1, 3), "c": (2, 3)}
+
+    run(coordinators["b"].stop())
+    assert coordinators["b"].shard is None
+    assert run(coordinators["a"].heartbeat()) == (0, 2)
+    assert run(coordinators["c"].heartbeat()) == (1, 2)
+
+
+def test_silent_replica_drops_out(run, backend):
+    silent = MEMBERSHIPS[backend]("a", 60)
+    run(silent.heartbeat())
+    # Реплика b считает всех, кто молчит дольше ttl, выбывшими
+    assert run(MEMBERSHIPS[backend]("b", 0).heartbeat()) == ["b"]
+
+
+def test_sharding_off_serves_everyone():
+    assert ShardCoordinator("a", None, 1).enabled is False
+
+
+def test_membership_interface_is_abstract():
+    class Incomplete(Membership):
+        async def heartbeat(self):
+            return []
+
+    with pytest.raises(TypeError):
+        Incomplete()
+
+
+def test_rebalance_catches_up_dead_replica_buckets(run, clock, add_users, scheduler):
+    InProcessMembership._members.clear()
+    membership = InProcessMembership("a", 60)
+    sharded = SchedulerService(
+        scheduler.bot,
+        leader=LeaderElector(AlwaysLeaderLease(), settings.leader_heartbeat_seconds),
+        shards=ShardCoordinator("a", membership, 1),
+        calendar=scheduler.calendar,
+    )
+    run(InProcessMembership("b", 60).heartbeat())
+    assert run(sharded.shards.heartbeat()) == (0, 2)
+    add_users(*range(700, 710))
+    run(sharded._sync_notification_buckets())
+    (bucket,) = sharded._bucket_jobs
+    job_id = sharded._bucket_jobs[bucket]
+
+    # Корзина сработала час назад: a разослала свой шард, b упала, не успев
+    run(sharded._send_daily_notifications(bucket, clock.now.date()))
+    assert sharded.scheduler.get_job(f"{job_id}_catch_up") is None
+
+    # b молчит дольше ttl — a забирает всех и догоняет корзину для нового шарда
+    membership.ttl_seconds = 0
+    assert run(sharded.shards.heartbeat()) == (0, 1)
+    job = sharded.scheduler.get_job(f"{job_id}_catch_up")
+    run(job.func(*job.args, **job.kwargs))
+
+    async def queued():
+        async with db_manager.session() as session:
+            return list(await session.scalars(select(OutboxMessage.chat_id)))
+    recipients = run(queued())
+    assert sorted(recipients) == list(range(700, 710))
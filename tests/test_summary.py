@@ -0,0 +1,72 @@
+"""
+Сводки: ждут отчёт только от сотрудников — администраторы (is_admin и ADMIN_IDS)
+не попадают ни в число активных, ни в список не сдавших
+"""
+from datetime import date, datetime
+
+from bot.database import db_manager, DailyReportRepository, UserRepository
+from bot.database.models import DailyReport
+from bot.services import SummaryService
+
+DAY = date(2026, 10, 14)
+
+
+def _report(run, telegram_id: int, has_tasks: bool = True):
+    async def create():
+        async with db_manager.session() as session:
+            user = await UserRepository.get_by_telegram_id(session, telegram_id)
+            await DailyReportRepository.create(
+                session, user.id, telegram_id, datetime(2026, 10, 14, 18, 30), "отчёт", has_tasks
+            )
+    run(create())
+
+
+def test_daily_summary_skips_admins(run, add_users):
+    add_users(601, 602, 603)
+    add_users(604, is_admin=True)
+    add_users(1)  # ADMIN_IDS в тестах
+    add_users(605, is_active=False)
+    _report(run, 601)
+    _report(run, 602, has_tasks=False)
+
+    async def summary():
+        async with db_manager.session() as session:
+            return await SummaryService.daily(session, DAY)
+    result = run(summary())
+
+    assert result.with_tasks == ["User601 Test"]
+    assert result.no_tasks == ["User602 Test"]
+    assert result.not_submitted == ["User603 Test"]
+    assert result.total == 3
+
+
+def test_counts_skip_admins(run, add_users):
+    add_users(611, 612)
+    add_users(613, is_admin=True)
+    add_users(1)
+    _report(run, 611)
+
+    async def counts():
+        async with db_manager.session() as session:
+            return await DailyReportRepository.get_counts(session, DAY, date(2026, 10, 12))
+    assert run(counts()) == {"active_users": 2, "today_reports": 1, "week_reports": 1}
+
+
+def test_counts_use_report_day(run, add_users):
+    add_users(621, 622)
+
+    async def counts():
+        async with db_manager.session() as session:
+            # Сдан после полуночи, но засчитан за предыдущий день
+            session.add(DailyReport(
+                user_id=1, telegram_id=621, report_date=datetime(2026, 10, 15, 0, 20),
+                report_day=DAY, report_text="отчёт", has_tasks=True, submitted_at=datetime(2026, 10, 14, 21, 20),
+            ))
+            session.add(DailyReport(
+                user_id=2, telegram_id=622, report_date=datetime(2026, 10, 12, 0, 10),
+                report_day=date(2026, 10, 11), report_text="отчёт", has_tasks=True,
+                submitted_at=datetime(2026, 10, 11, 21, 10),
+            ))
+            await session.commit()
+            return await DailyReportRepository.get_counts(session, DAY, date(2026, 10, 12))
+    assert run(counts()) == {"active_users": 2, "today_reports": 1, "week_reports": 1}
@@ -0,0 +1,126 @@
+"""
+Список пользователей админ-панели: keyset-пагинация, сброс кэша страниц при правках
+пользователей, команда во время ожидания поиска сбрасывает состояние
+"""
+from datetime import datetime
+
+import pytest
+from aiogram.dispatcher.event.bases import SkipHandler
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Chat, Message, User as TgUser
+
+from bot.database import db_manager, UserRepository
+from bot.handlers.admin import admin_users_search_leave
+from bot.states import AdminStates
+from bot.utils import page_cache
+
+KEY = ("users", "ru", 1, None, None, False)
+
+
+def _cached() -> bool:
+    return page_cache.get(KEY) is not None
+
+
+def _write(run, action):
+    page_cache.put(KEY, ("text", None))
+
+    async def call():
+        async with db_manager.session() as session:
+            return await action(session)
+    return run(call())
+
+
+def test_registration_drops_user_pages(run):
+    _write(run, lambda session: UserRepository.create(session, 200, "Anna", "Test", "ru", 540, 1080))
+    assert not _cached()
+
+
+def test_listed_field_update_drops_user_pages(run, add_users):
+    add_users(201)
+    _write(run, lambda session: UserRepository.update(session, 201, work_start_minute=600))
+    assert not _cached()
+
+
+def test_reactivation_drops_user_pages(run, add_users):
+    add_users(202, is_active=False, blocked_at=datetime(2026, 10, 1))
+    _write(run, lambda session: UserRepository.update(session, 202, is_active=True, blocked_at=None))
+    assert not _cached()
+
+
+def test_timezone_update_drops_user_pages(run, add_users):
+    add_users(203)
+    _write(run, lambda session: UserRepository.update(session, 203, timezone="Europe/Moscow"))
+    assert not _cached()
+
+
+def test_lookup_keeps_user_pages(run, add_users):
+    add_users(206)
+    _write(run, lambda session: UserRepository.get_by_telegram_id(session, 206))
+    assert _cached()
+
+
+def test_deactivation_and_delete_drop_user_pages(run, add_users):
+    add_users(204, 205)
+    _write(run, lambda session: UserRepository.deactivate_unreachable(session, [204]))
+    assert not _cached()
+    _write(run, lambda session: UserRepository.delete_user(session, 205))
+    assert not _cached()
+
+
+def test_command_leaves_user_search(run):
+    storage = MemoryStorage()
+    state = FSMContext(storage, StorageKey(bot_id=1, chat_id=1, user_id=1))
+    message = Message(
+        message_id=1,
+        date=datetime(2026, 10, 14, 15, 0),
+        chat=Chat(id=1, type="private"),
+        from_user=TgUser(id=1, is_bot=False, first_name="Admin"),
+        text="/stats",
+    )
+
+    async def call():
+        await state.set_state(AdminStates.user_search)
+        with pytest.raises(SkipHandler):
+            await admin_users_search_leave(message, state)
+        return await state.get_state()
+
+    assert run(call()) is None
+
+
+def _page(run, limit, cursor=None, backward=False, prefix=None):
+    async def call():
+        async with db_manager.session() as session:
+            return await UserRepository.get_page(session, limit, cursor=cursor, backward=backward, prefix=prefix)
+    records, has_more = run(call())
+    return [record.telegram_id for record in records], has_more
+
+
+def test_keyset_pages_walk_forward_and_back(run, add_users):
+    # Порядок — имя, фамилия, telegram_id: одинаковые имена не теряются на границе страниц
+    for telegram_id, first_name in [(301, "Anna"), (302, "Anna"), (303, "Boris"), (304, "Anna"), (305, "Vera")]:
+        add_users(telegram_id, first_name=first_name)
+    add_users(306, first_name="Anna", is_active=False)
+
+    first, more = _page(run, 2)
+    assert (first, more) == ([301, 302], True)
+    second, more = _page(run, 2, cursor=first[-1])
+    assert (second, more) == ([304, 303], True)
+    third, more = _page(run, 2, cursor=second[-1])
+    assert (third, more) == ([305], False)
+
+    back, more = _page(run, 2, cursor=third[0], backward=True)
+    assert (back, more) == ([304, 303], True)
+    back, more = _page(run, 2, cursor=back[0], backward=True)
+    assert (back, more) == ([301, 302], False)
+
+
+def test_keyset_page_with_prefix_and_missing_cursor(run, add_users):
+    add_users(311, first_name="Anna", last_name="Ivanova")
+    add_users(312, first_name="Boris", last_name="Anisimov")
+    add_users(313, first_name="Vera", last_name="Petrova")
+
+    assert _page(run, 10, prefix="An") == ([311, 312], False)
+    assert _page(run, 10, prefix="Anna Iv") == ([311], False)
+    assert _page(run, 10, cursor=999) == ([], False)
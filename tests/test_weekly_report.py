@@ -0,0 +1,73 @@
+"""
+Недельный отчёт строится за один проход по потоку отчётов — без списка в памяти
+"""
+from datetime import datetime
+
+import pytest
+
+from bot.database import ReportRecord
+from bot.services.deepseek_service import DeepSeekService
+
+
+RECORDS = [
+    ReportRecord(datetime(2026, 10, 12, 18, 0), "Анна", "Иванова", "Сверка счетов", True),
+    ReportRecord(datetime(2026, 10, 12, 18, 30), "Борис", "Петров", None, False),
+    ReportRecord(datetime(2026, 10, 14, 17, 45), "Анна", "Иванова", "Закрытие месяца", True),
+]
+
+
+class _Consumed:
+    """Асинхронный поток, который можно прочитать лишь однажды"""
+
+    def __init__(self, records):
+        self._records = iter(records)
+        self.started = False
+
+    def __aiter__(self):
+        assert not self.started, "поток прочитан повторно"
+        self.started = True
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._records)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = DeepSeekService()
+    prompts = []
+
+    async def offline(prompt):
+        prompts.append(prompt)
+        raise RuntimeError("нет сети")
+    monkeypatch.setattr(service, "_call_deepseek_api", offline)
+    service.prompts = prompts
+    return service
+
+
+def test_fallback_built_from_stream(run, service):
+    text = run(service.generate_weekly_report(_Consumed(RECORDS), language="ru"))
+
+    assert "📅 Период: 12.10.2026 - 14.10.2026\n" in text
+    assert (
+        "*12.10.2026:*\n"
+        "• **Анна Иванова**: Сверка счетов\n"
+        "• **Борис Петров**: Задач не было\n"
+        "\n"
+        "*14.10.2026:*\n"
+        "• **Анна Иванова**: Закрытие месяца\n"
+        "\n"
+    ) in text
+    assert "• Всего отчетов: 3\n• С задачами: 2\n• Без задач: 1\n" in text
+
+    prompt, = service.prompts
+    assert "\n2026-10-12 - Борис Петров:\nЗадач не было\n" in prompt
+    assert "\n2026-10-14 - Анна Иванова:\nЗакрытие месяца\n" in prompt
+
+
+def test_empty_stream_gives_none(run, service):
+    assert run(service.generate_weekly_report(_Consumed([]), language="az")) is None
+    assert service.prompts == []